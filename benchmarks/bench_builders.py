@@ -0,0 +1,98 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------
+# Compare generating the dicts of many case variants serially and in worker
+# processes. The builders do not need blender, so this runs in any python
+# with reynolds installed, from the repo root:
+#
+#   python -m benchmarks.bench_builders [variants] [geometries] [workers]
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import sys
+import time
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.builders.case import render_case_dicts
+from reynolds_blender.builders.settings import Settings, default_settings
+
+EXTENT = ([-1.0, -1.0, -1.0], [1.0, 1.0, 1.0])
+
+def variants(n_variants, n_geometries):
+    settings = default_settings()
+    settings.block_cells_pg = Settings(n_cells=(20, 20, 20),
+                                       n_grading=(1, 1, 1),
+                                       convert_to_meters=1.0)
+    settings.regions = {'walls': ['walls', 'wall',
+                                  ['Front', 'Back', 'Top', 'Bottom'], {}]}
+    settings.location_in_mesh = (0.5, 0.5, 0.5)
+    for i in range(n_geometries):
+        settings.geometries['part%d' % i] = {
+            'file_path': '/geometry/part%d.stl' % i,
+            'type': 'triSurfaceMesh',
+            'has_features': True,
+            'feature_level': 1,
+            'included_angle': 150,
+            'refinement_type': 'Surface',
+            'refinementSurface': {'min': 1, 'max': 2}}
+    for i in range(n_variants):
+        variant = copy.deepcopy(settings)
+        variant.cd_end_time = 0.1 * (i + 1)
+        yield variant
+
+def bench(n_variants, n_geometries, workers):
+    snapshots = list(variants(n_variants, n_geometries))
+    print('{:10} {:>10} {:>12}'.format('builders', 'time(s)', 'variants/s'))
+
+    start = time.time()
+    for snapshot in snapshots:
+        render_case_dicts(snapshot, EXTENT)
+    elapsed = time.time() - start
+    print('{:10} {:10.2f} {:12.1f}'.format('serial', elapsed,
+                                           n_variants / elapsed))
+
+    start = time.time()
+    with ProcessPoolExecutor(workers) as pool:
+        list(pool.map(render_case_dicts, snapshots,
+                      [EXTENT] * n_variants))
+    elapsed = time.time() - start
+    print('{:10} {:10.2f} {:12.1f}'.format('%s workers' % (workers or 'all'),
+                                           elapsed, n_variants / elapsed))
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    bench(args[0] if args else 64,
+          args[1] if len(args) > 1 else 10,
+          args[2] if len(args) > 2 else None)
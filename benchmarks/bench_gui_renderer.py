@@ -0,0 +1,109 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# Compare the interpreted and compiled YAML GUI renderers over every panel spec
+#
+#   blender -b --addons reynolds_blender --python benchmarks/bench_gui_renderer.py
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import glob
+import os
+import timeit
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.gui.spec_cache import gui_spec_path, load_gui_spec
+
+class NullLayout(object):
+    """ Accepts every layout call and does nothing, so that only the
+    renderer's own work is measured. """
+    enabled = True
+    action = None
+
+    def box(self):
+        return self
+
+    def row(self):
+        return self
+
+    def column(self):
+        return self
+
+    def label(self, **kwargs):
+        pass
+
+    def prop(self, *args, **kwargs):
+        pass
+
+    def operator(self, *args, **kwargs):
+        return self
+
+    def separator(self):
+        pass
+
+    def template_list(self, *args, **kwargs):
+        pass
+
+class NullScene(object):
+    pass
+
+def bench(number=2000):
+    spec_dir = os.path.dirname(gui_spec_path('models.yaml'))
+    layout = NullLayout()
+    scene = NullScene()
+    total_interpreted = total_compiled = 0.0
+    print('{:32} {:>14} {:>14} {:>8}'.format('spec', 'interpreted(us)',
+                                              'compiled(us)', 'speedup'))
+    for spec_file in sorted(glob.glob(os.path.join(spec_dir, '*.yaml'))):
+        gui_filename = os.path.basename(spec_file)
+        if 'gui' not in load_gui_spec(gui_filename):
+            continue
+        renderer = ReynoldsGUIRenderer(scene, layout, gui_filename)
+        renderer.render() # compile once, outside the timed loop
+        interpreted = timeit.timeit(renderer.render_interpreted,
+                                    number=number) / number
+        compiled = timeit.timeit(renderer.render, number=number) / number
+        total_interpreted += interpreted
+        total_compiled += compiled
+        print('{:32} {:14.2f} {:14.2f} {:7.1f}x'.format(gui_filename,
+                                                       interpreted * 1e6,
+                                                       compiled * 1e6,
+                                                       interpreted / compiled))
+    print('{:32} {:14.2f} {:14.2f} {:7.1f}x'.format('TOTAL',
+                                                   total_interpreted * 1e6,
+                                                   total_compiled * 1e6,
+                                                   total_interpreted /
+                                                   total_compiled))
+
+if __name__ == '__main__':
+    bench()
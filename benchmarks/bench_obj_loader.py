@@ -0,0 +1,69 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# Compare the stock OBJ importer with the chunked reader used to show
+# writeMeshObj output
+#
+#   blender -b --addons reynolds_blender \
+#           --python benchmarks/bench_obj_loader.py -- <file.obj>
+# ----------------------------------------------------------------------------
+
+# -----------
+# bpy imports
+# -----------
+import bpy
+
+# --------------
+# python imports
+# --------------
+import sys
+import time
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.mesh_objs import load_obj_mesh
+
+def stock_import(scene, obj_file):
+    bpy.ops.import_scene.obj(filepath=obj_file)
+    return scene.objects.active
+
+def bench(obj_file):
+    scene = bpy.context.scene
+    print('{:10} {:>10} {:>12} {:>12}'.format('loader', 'time(s)', 'vertices',
+                                              'faces'))
+    for name, load in [('stock', stock_import), ('chunked', load_obj_mesh)]:
+        start = time.time()
+        obj = load(scene, obj_file)
+        elapsed = time.time() - start
+        print('{:10} {:10.2f} {:12} {:12}'.format(name, elapsed,
+                                                  len(obj.data.vertices),
+                                                  len(obj.data.polygons)))
+
+if __name__ == '__main__':
+    bench(sys.argv[sys.argv.index('--') + 1])
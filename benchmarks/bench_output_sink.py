@@ -0,0 +1,93 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# Compare reporting every line of command output with the output sink
+#
+#   blender -b --addons reynolds_blender \
+#           --python benchmarks/bench_output_sink.py -- [lines]
+# ----------------------------------------------------------------------------
+
+# -----------
+# bpy imports
+# -----------
+import bpy
+
+# --------------
+# python imports
+# --------------
+import sys
+import tempfile
+import time
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.cmd_job import report_output
+from reynolds_blender.log_sink import OutputSink
+
+def snappy_like_output(n_lines):
+    for i in range(n_lines):
+        if i % 5000 == 0:
+            yield '--> FOAM Warning : faces with zero area %d' % i
+        else:
+            yield 'Refinement phase: cell %d marked for refinement' % i
+
+class BenchOutputOperator(bpy.types.Operator):
+    bl_idname = "reynolds.bench_output"
+    bl_label = "Bench output"
+
+    lines = bpy.props.IntProperty(default=100000)
+    sink = bpy.props.BoolProperty(default=False)
+
+    def execute(self, context):
+        if not self.sink:
+            for info in snappy_like_output(self.lines):
+                report_output(self, [('WARNING', info)])
+            return {'FINISHED'}
+        sink = OutputSink(tempfile.mkdtemp(), 'snappyHexMesh')
+        for info in snappy_like_output(self.lines):
+            sink.write(info)
+            report_output(self, sink.take_reports())
+        sink.close()
+        report_output(self, sink.take_reports())
+        return {'FINISHED'}
+
+def bench(n_lines):
+    bpy.utils.register_class(BenchOutputOperator)
+    print('{:10} {:>10} {:>12}'.format('output', 'time(s)', 'lines/s'))
+    for name, sink in [('per line', False), ('sink', True)]:
+        start = time.time()
+        bpy.ops.reynolds.bench_output(lines=n_lines, sink=sink)
+        elapsed = time.time() - start
+        print('{:10} {:10.2f} {:12.0f}'.format(name, elapsed,
+                                               n_lines / elapsed))
+    bpy.utils.unregister_class(BenchOutputOperator)
+
+if __name__ == '__main__':
+    args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    bench(int(args[0]) if args else 100000)
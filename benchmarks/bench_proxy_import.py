@@ -0,0 +1,95 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# Compare full, proxy and bounding box imports of an STL file. Each mode runs
+# in its own blender process so that peak memory is not shared between them.
+#
+#   blender -b --addons reynolds_blender \
+#           --python benchmarks/bench_proxy_import.py -- <file.stl> [budget]
+# ----------------------------------------------------------------------------
+
+# -----------
+# bpy imports
+# -----------
+import bpy
+
+# --------------
+# python imports
+# --------------
+import json
+import resource
+import subprocess
+import sys
+import time
+
+MODES = ['Full', 'Proxy', 'BoundingBox']
+
+def script_args():
+    return sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def run_mode(stl_file, budget, mode):
+    scene = bpy.context.scene
+    scene.stl_file_path = stl_file
+    scene.import_mode = mode
+    scene.proxy_triangle_budget = budget
+    rss_before = peak_rss_mb()
+    start = time.time()
+    bpy.ops.reynolds.import_stl()
+    elapsed = time.time() - start
+    obj = scene.objects.active
+    print(json.dumps({'mode': mode, 'time': elapsed,
+                      'rss': peak_rss_mb() - rss_before,
+                      'triangles': len(obj.data.polygons)}))
+
+def bench(stl_file, budget):
+    print('{:12} {:>10} {:>14} {:>12}'.format('mode', 'time(s)',
+                                              'peak rss(MB)', 'triangles'))
+    for mode in MODES:
+        output = subprocess.check_output([bpy.app.binary_path, '-b',
+                                          '--addons', 'reynolds_blender',
+                                          '--python', __file__, '--',
+                                          stl_file, str(budget), mode],
+                                         universal_newlines=True)
+        result = [json.loads(line) for line in output.splitlines()
+                  if line.startswith('{"mode"')][0]
+        print('{:12} {:10.2f} {:14.1f} {:12}'.format(result['mode'],
+                                                     result['time'],
+                                                     result['rss'],
+                                                     result['triangles']))
+
+if __name__ == '__main__':
+    args = script_args()
+    budget = int(args[1]) if len(args) > 1 else 100000
+    if len(args) > 2:
+        run_mode(args[0], budget, args[2])
+    else:
+        bench(args[0], budget)
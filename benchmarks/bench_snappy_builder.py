@@ -0,0 +1,83 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------
+# Time the snappyHexMeshDict builder as the number of geometries grows. Like
+# bench_builders.py this runs in a plain python with reynolds installed:
+#
+#   python -m benchmarks.bench_snappy_builder [geometries ...]
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import sys
+import time
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.builders.mesh_dicts import build_snappyhexmeshdict
+from reynolds_blender.builders.settings import default_settings
+
+def snappy_settings(n_geometries):
+    settings = default_settings()
+    settings.location_in_mesh = (0.5, 0.5, 0.5)
+    for i in range(n_geometries):
+        name = 'part%d' % i
+        settings.geometries[name] = {
+            'file_path': '/geometry/%s.stl' % name,
+            'type': 'triSurfaceMesh',
+            'has_features': True,
+            'feature_level': 1,
+            'included_angle': 150,
+            'refinement_type': 'Surface',
+            'refinementSurface': {'min': 1, 'max': 2}}
+        settings.add_layers[name] = 3
+    return settings
+
+def bench(geometry_counts, repeat=5):
+    print('{:>10} {:>10} {:>10} {:>14}'.format('geometries', 'build(ms)',
+                                               'render(ms)', 'us/geometry'))
+    for n_geometries in geometry_counts:
+        settings = snappy_settings(n_geometries)
+        build = render = float('inf')
+        for _ in range(repeat):
+            start = time.time()
+            snappy_dict = build_snappyhexmeshdict(settings)
+            built = time.time()
+            str(snappy_dict)
+            build = min(build, built - start)
+            render = min(render, time.time() - built)
+        print('{:10} {:10.2f} {:10.2f} {:14.1f}'.format(
+            n_geometries, build * 1e3, render * 1e3,
+            build * 1e6 / n_geometries))
+
+if __name__ == '__main__':
+    counts = [int(a) for a in sys.argv[1:]]
+    bench(counts or [10, 100, 1000])
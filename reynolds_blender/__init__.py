@@ -38,7 +38,17 @@ bl_info = {
     "category": "Development"
 }
 
-if "bpy" in locals():
+# outside blender only the modules that do not use bpy, like the mesh
+# readers and the headless runner, can be imported
+try:
+    import bpy as _bpy
+    IN_BLENDER = True
+except ImportError:
+    IN_BLENDER = False
+
+if not IN_BLENDER:
+    pass
+elif "bpy" in locals():
     import importlib
     importlib.reload(foam)
     importlib.reload(models)
@@ -61,28 +71,37 @@ if "bpy" in locals():
     importlib.reload(transportproperties)
     importlib.reload(geo_patch_time_props)
     importlib.reload(parallel_solver)
+    importlib.reload(pipeline)
+    importlib.reload(lod)
+    importlib.reload(sweep)
 else:
     from . import (console, foam, models, sphere, add_block, block_cells,
                    block_regions, block_mesh, mesh_objs, solver, geometry,
                    snappy_steps, feature_extraction, castellated_mesh,
                    snapping, layers, mesh_quality, snappy_hexmesh, fvschemes,
                    fvsolution, controldict, transportproperties, geo_patch_time_props,
-                   parallel_solver)
-
+                   parallel_solver, pipeline, lod, sweep)
 
-from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
+if IN_BLENDER:
+    from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
+    from reynolds_blender.gui.spec_cache import clear_spec_cache, spec_cache_stats
+    from reynolds_blender.gui.renderer import clear_compiled_gui_specs
 
-import bpy
+    import bpy
 
-from bpy.props import (StringProperty,
-                       PointerProperty)
+    from bpy.props import (StringProperty,
+                           PointerProperty)
 
 def register():
     bpy.app.debug = True # will show indices
+    # specs parsed by a previous load of the add-on may be stale
+    clear_spec_cache()
+    clear_compiled_gui_specs()
     set_scene_attrs("common_attrs.yaml")
     set_scene_attrs("fvSchemes.yaml")
     set_scene_attrs("fvSolution.yaml")
     console.register()
+    lod.register()
     foam.register()
     models.register()
     sphere.register()
@@ -106,12 +125,15 @@ def register():
     transportproperties.register()
     geo_patch_time_props.register()
     parallel_solver.register()
+    pipeline.register()
+    sweep.register()
 
 def unregister():
     del_scene_attrs("common_attrs.yaml")
     del_scene_attrs("fvSchemes.yaml")
     del_scene_attrs("fvSolution.yaml")
     console.unregister()
+    lod.unregister()
     foam.unregister()
     models.unregister()
     sphere.unregister()
@@ -135,6 +157,11 @@ def unregister():
     transportproperties.unregister()
     geo_patch_time_props.unregister()
     parallel_solver.unregister()
+    pipeline.unregister()
+    sweep.unregister()
+    print('GUI spec cache: ', spec_cache_stats)
+    clear_spec_cache()
+    clear_compiled_gui_specs()
 
 if __name__ == '__main__':
     register()
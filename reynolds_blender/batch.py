@@ -0,0 +1,248 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import copy
+import csv
+import functools
+import itertools
+import os
+import shutil
+
+import yaml
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+from reynolds_blender.cmd_job import FoamCmdSequence
+from reynolds_blender.log_sink import OutputSink
+from reynolds_blender.residuals import ResidualMonitor
+from reynolds_blender.decompose_planner import mesh_cell_count
+
+# ------------------------------------------------------------------------
+#    sweep definition
+# ------------------------------------------------------------------------
+
+class SweepError(Exception):
+    pass
+
+def load_sweep(file_path):
+    """ A sweep definition from a YAML file:
+
+        mode: product            # or zip
+        stages: [blockMesh, solver]      # optional, else all enabled
+        parameters:
+          cd_delta_time: [0.005, 0.0025]
+          block_cells_pg.n_cells: [[10, 10, 1], [20, 20, 1]]
+          geo_patches.sphere_inlet.U.value: [uniform (1 0 0)]
+
+    Parameters are dotted paths from the scene, through attributes, dict
+    keys and list indices, each with the list of values to sweep.
+    """
+    with open(file_path) as f:
+        sweep = yaml.safe_load(f) or {}
+    parameters = sweep.get('parameters', None)
+    if not parameters:
+        raise SweepError('Sweep has no parameters: ' + file_path)
+    for path, values in parameters.items():
+        if not isinstance(values, list) or not values:
+            raise SweepError('Parameter ' + path + ' needs a list of values')
+    mode = sweep.get('mode', 'product')
+    if mode not in ('product', 'zip'):
+        raise SweepError('Sweep mode must be product or zip, not ' + mode)
+    if mode == 'zip' and len(set(len(v) for v in parameters.values())) > 1:
+        raise SweepError('zip sweep parameters need as many values each')
+    stages = sweep.get('stages', None)
+    if stages is not None and not isinstance(stages, list):
+        raise SweepError('Sweep stages must be a list of stage names')
+    return {'mode': mode, 'parameters': parameters, 'stages': stages}
+
+def sweep_variants(sweep):
+    """ One {path: value} dict per variant, in a stable order. """
+    paths = sorted(sweep['parameters'])
+    values = [sweep['parameters'][path] for path in paths]
+    if sweep['mode'] == 'zip':
+        combinations = zip(*values)
+    else:
+        combinations = itertools.product(*values)
+    return [dict(zip(paths, combination)) for combination in combinations]
+
+def sweep_stages(sweep, stages, enabled):
+    """ The stages the sweep runs, out of the pipeline stages for which
+    enabled is true, and whether the case clones keep the case's mesh,
+    which they do when none of those stages meshes. """
+    names = sweep['stages'] or [stage['name'] for stage in stages]
+    unknown = set(names) - set(stage['name'] for stage in stages)
+    if unknown:
+        raise SweepError('Unknown sweep stages: ' + ', '.join(sorted(unknown)))
+    selected = [stage for stage in stages
+                if stage['name'] in names and enabled(stage)]
+    meshing = dict((stage.get('mesh', None), stage['name'])
+                   for stage in selected)
+    # a refining stage needs the background mesh, which a clone only has
+    # when the stage that writes it runs as well
+    if 'restore' in meshing and 'save' not in meshing:
+        background = [stage['name'] for stage in stages
+                      if stage.get('mesh', None) == 'save']
+        raise SweepError(meshing['restore'] + ' needs ' +
+                         ' and '.join(background) + ' in the sweep stages')
+    keep_mesh = 'save' not in meshing
+    return selected, keep_mesh
+
+# ------------------------------------------------------------------------
+#    dotted attribute paths
+# ------------------------------------------------------------------------
+
+def _step(obj, part):
+    if isinstance(obj, dict):
+        return obj[part]
+    if part.isdigit():
+        return obj[int(part)]
+    return getattr(obj, part)
+
+def get_path(root, path):
+    return functools.reduce(_step, path.split('.'), root)
+
+def set_path(root, path, value):
+    """ Set the value at path and return the one it replaces. """
+    parts = path.split('.')
+    last = parts[-1]
+    try:
+        obj = functools.reduce(_step, parts[:-1], root)
+        old = _step(obj, last)
+    except (KeyError, IndexError, AttributeError, TypeError):
+        raise SweepError('No scene attribute ' + path)
+    # keep a copy, property arrays are views of the scene's data
+    if hasattr(old, '__len__') and not isinstance(old, (str, dict)):
+        old = list(old)
+    else:
+        old = copy.deepcopy(old)
+    if isinstance(obj, dict):
+        obj[last] = value
+    elif last.isdigit():
+        obj[int(last)] = value
+    else:
+        setattr(obj, last, value)
+    return old
+
+# ------------------------------------------------------------------------
+#    case clones
+# ------------------------------------------------------------------------
+
+def _is_result(name):
+    """ Files and dirs of a run that a fresh clone must not carry over. """
+    if name.startswith('processor') or name.startswith('log.'):
+        return True
+    if name in ('postProcessing', '.reynolds'):
+        return True
+    try:
+        return float(name) != 0
+    except ValueError:
+        return False
+
+def clone_case(case_dir, clone_dir, keep_mesh=False):
+    """ Copy the case without results into clone_dir, replacing an earlier
+    clone; without its mesh too unless keep_mesh is set. Geometry files
+    are hard linked where possible, they are only ever read. """
+    if os.path.exists(clone_dir):
+        shutil.rmtree(clone_dir)
+
+    def ignore(src, names):
+        ignored = [name for name in names if _is_result(name)]
+        if os.path.basename(src) == 'polyMesh' and not keep_mesh:
+            ignored += [name for name in names if name != 'blockMeshDict']
+        return ignored
+
+    def copy_file(src, dst):
+        if os.path.basename(os.path.dirname(src)) == 'triSurface':
+            try:
+                os.link(src, dst)
+                return dst
+            except OSError:
+                pass
+        return shutil.copy2(src, dst)
+
+    shutil.copytree(case_dir, clone_dir, ignore=ignore,
+                    copy_function=copy_file)
+    return clone_dir
+
+# ------------------------------------------------------------------------
+#    variant runs
+# ------------------------------------------------------------------------
+
+class VariantRunner(FoamCmdSequence):
+    """ The commands of one variant, in its clone of the case. Its output
+    also goes to log.sweep in the clone, and its residuals into a monitor
+    of its own, for the summary. """
+
+    def __init__(self, name, case_dir, runners, values):
+        FoamCmdSequence.__init__(self, name, case_dir, runners)
+        self.values = values
+        self.monitor = ResidualMonitor(history=1)
+
+    def run(self):
+        sink = OutputSink(self.case_dir, 'sweep', tail_lines=0)
+        # a local, so stop_output finds the commands it runs
+        output = FoamCmdSequence.run(self)
+        try:
+            for info in output:
+                sink.write(info)
+                self.monitor.feed(info)
+                yield info
+        finally:
+            sink.close()
+
+    def summary(self, elapsed):
+        state = self.monitor.snapshot()
+        if self.run_status:
+            status = 'done'
+        elif self.failed is not None:
+            status = 'failed: ' + self.failed.cmd_name
+        else:
+            status = 'cancelled'
+        row = {'variant': self.cmd_name, 'status': status,
+               'time_s': '' if elapsed is None else '%.1f' % elapsed,
+               'cells': mesh_cell_count(self.case_dir) or '',
+               'end_time': '' if state['time'] is None else state['time']}
+        for field, series in sorted(state['residuals'].items()):
+            row['residual_' + field] = series[-1][1]
+        for path, value in sorted(self.values.items()):
+            row[path] = value
+        return row
+
+def write_summary(file_path, rows):
+    """ The rows as CSV, columns in order of first appearance. """
+    columns = []
+    for row in rows:
+        columns += [column for column in row if column not in columns]
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval='')
+        writer.writeheader()
+        writer.writerows(rows)
+    return columns
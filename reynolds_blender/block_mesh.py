@@ -65,6 +65,12 @@ from reynolds_blender.block_cells import BlockMeshCellsOperator
 from reynolds_blender.block_regions import BlockMeshRegionsOperator
 from reynolds_blender.add_block import BlockMeshAddOperator
 from reynolds_blender.mesh_objs import ShowMeshObjOperator
+from reynolds_blender.cmd_job import run_foam_cmd
+from reynolds_blender.case_writer import write_case_dict
+from reynolds_blender.extents import foam_extent
+from reynolds_blender.builders.mesh_dicts import build_blockmeshdict
+from reynolds_blender.builders.solver_dicts import build_time_props
+from reynolds_blender.builders.snapshot import scene_settings
 
 # ----------------
 # reynolds imports
@@ -102,87 +108,18 @@ def generate_blockmeshdict(self, context):
         self.report({'ERROR'}, 'Please select a block object')
         return {'FINISHED'}
 
-    bbox = obj.bound_box
-    x = [v[0] for v in obj.bound_box]
-    x.sort()
-    y = [v[2] for v in obj.bound_box]
-    y.sort()
-    z = [v[1] for v in obj.bound_box]
-    z.sort()
-
-    block_mesh_dict = ReynoldsFoamDict('blockMeshDict.foam')
-
-    # generate bmd vertices
-    bmd_vertices = []
-    bmd_vertices.append([x[0], y[0], z[0]])
-    bmd_vertices.append([x[7], y[0], z[0]])
-    bmd_vertices.append([x[7], y[7], z[0]])
-    bmd_vertices.append([x[0], y[7], z[0]])
-    bmd_vertices.append([x[0], y[0], z[7]])
-    bmd_vertices.append([x[7], y[0], z[7]])
-    bmd_vertices.append([x[7], y[7], z[7]])
-    bmd_vertices.append([x[0], y[7], z[7]])
-    block_mesh_dict['vertices'] = bmd_vertices
-
-    # generate bmd blocks
-    bmd_blocks = []
-    bmd_blocks.append('hex')
-    bmd_blocks.append([0, 1, 2, 3, 4, 5, 6, 7])
-    bmd_blocks.append([scene.block_cells_pg.n_cells[0], scene.block_cells_pg.n_cells[1],
-                        scene.block_cells_pg.n_cells[2]])
-    bmd_blocks.append('simpleGrading')
-    grading_x = [[1, 1, scene.block_cells_pg.n_grading[0]]]
-    grading_y = [[1, 1, scene.block_cells_pg.n_grading[1]]]
-    grading_z = [[1, 1, scene.block_cells_pg.n_grading[2]]]
-    grading = [grading_x, grading_y, grading_z]
-    bmd_blocks.append(grading)
-    print(bmd_blocks)
-    block_mesh_dict['blocks'] = bmd_blocks
-
-    # generate bmd regions
-    bmd_boundary = []
-    for name, r in scene.regions.items():
-        name, patch_type, face_labels, _ = r
-        bmd_boundary.append(name)
-        br = {}
-        br['type'] = patch_type
-        faces = []
-        for f in face_labels:
-            if f == 'Front':
-                faces.append([0, 3, 2, 1])
-            if f == 'Back':
-                faces.append([4, 5, 6, 7])
-            if f == 'Top':
-                faces.append([3, 7, 6, 2])
-            if f == 'Bottom':
-                faces.append([0, 1, 5, 4])
-            if f == 'Left':
-                faces.append([0, 4, 7, 3])
-            if f == 'Right':
-                faces.append([1, 2, 6, 5])
-        br['faces'] = faces
-        bmd_boundary.append(br)
-    print(bmd_boundary)
-
-    if len(bmd_boundary) == 0:
+    if len(scene.regions) == 0:
         self.report({'ERROR'}, 'Please select regions/boundary conditions')
         return {'FINISHED'}
 
-    block_mesh_dict['boundary'] = bmd_boundary
-
-    # set convert to meters
-    block_mesh_dict['convertToMeters'] = scene.block_cells_pg.convert_to_meters
+    block_mesh_dict = build_blockmeshdict(scene_settings(scene),
+                                          foam_extent(obj))
 
     print("BLOCK MESH DICT")
     print(block_mesh_dict)
 
-    system_dir = os.path.join(abs_case_dir_path, "system")
-    if not os.path.exists(system_dir):
-        os.makedirs(system_dir)
-
-    bmd_file_path = os.path.join(system_dir, "blockMeshDict")
-    with open(bmd_file_path, "w") as f:
-        f.write(str(block_mesh_dict))
+    write_case_dict(self, abs_case_dir_path, "system", "blockMeshDict",
+                    block_mesh_dict)
 
     return {'FINISHED'}
 
@@ -194,49 +131,14 @@ def generate_time_props(self, context):
     print(scene.time_props_internal_field)
 
     abs_case_dir_path = bpy.path.abspath(scene.case_dir_path)
-    # Now loop through regions and generate distinct time properties in 0 dir
-    for prop in scene.time_props:
-        time_prop_dict = ReynoldsFoamDict(prop + '.foam')
-        time_prop_dict['dimensions'] = scene.time_props_dimensions[prop]
-        time_prop_dict['internalField'] = scene.time_props_internal_field[prop]
-        patches = {}
-        # these are block mesh patches
-        print('------- Block mesh patches -------')
-        for _, r in scene.regions.items():
-            name, patch_type, face_labels, time_prop_info = r
-            print(' name: ' + name + ' time prop info: ')
-            print(time_prop_info)
-            patches[name] = {}
-            if prop in time_prop_info:
-                patches[name]['type'] = time_prop_info[prop]['type']
-                v = time_prop_info[prop]['value']
-                if v != "":
-                    patches[name]['value'] = v
-        # these are geometry patches
-        print('------- geometry patches -------')
-        for name, time_prop_info in scene.geo_patches.items():
-            print(' name: ' + name + ' time prop info: ')
-            print(time_prop_info)
-            patches[name] = {}
-            if prop in time_prop_info:
-                patches[name]['type'] = time_prop_info[prop]['type']
-                v = time_prop_info[prop]['value']
-                if v != "":
-                    patches[name]['value'] = v
-        print('Patches for time props : ')
-        print(patches)
-        time_prop_dict['boundaryField'] = patches
-        zero_dir = os.path.join(abs_case_dir_path, "0")
-        if not os.path.exists(zero_dir):
-            os.makedirs(zero_dir)
-        prop_file_path = os.path.join(zero_dir, prop)
-        print('Write time property file for prop: ' + prop + ' to file ' + prop_file_path)
-        with open(prop_file_path, "w+") as f:
-            f.write(str(time_prop_dict))
+    # distinct time properties in 0 dir, patched for every region
+    for prop, time_prop_dict in build_time_props(scene_settings(scene)).items():
+        print('Write time property file for prop: ' + prop)
+        write_case_dict(self, abs_case_dir_path, "0", prop, time_prop_dict)
 
     return {'FINISHED'}
 
-def run_blockmesh(self, context):
+def start_blockmesh(self, context):
     scene = context.scene
     obj = context.active_object
 
@@ -251,30 +153,30 @@ def run_blockmesh(self, context):
 
     if case_dir is None or case_dir == '':
         self.report({'ERROR'}, 'Please select a case directory')
-        return {'FINISHED'}
+        return None
 
     if not scene.foam_started:
         self.report({'ERROR'}, 'Please start open foam')
-        return {'FINISHED'}
+        return None
 
     block_file = os.path.join(case_dir, 'system', 'blockMeshDict')
     if not os.path.exists(block_file):
         self.report({'ERROR'}, 'Please generate blockMeshDict')
-        return {'FINISHED'}
+        return None
 
     scene.blockmesh_executed = False
-    mr = FoamCmdRunner(cmd_name='blockMesh', case_dir=case_dir)
-
-    for info in mr.run():
-        self.report({'WARNING'}, info)
+    return FoamCmdRunner(cmd_name='blockMesh', case_dir=case_dir)
 
-    if mr.run_status:
+def finish_blockmesh(self, context, run_status):
+    scene = context.scene
+    if run_status:
         self.report({'INFO'}, 'Blockmesh : SUCCESS')
         scene.blockmesh_executed = True
     else:
         self.report({'ERROR'}, 'Blockmesh : FAILED')
 
-    return{'FINISHED'}
+def run_blockmesh(self, context):
+    return run_foam_cmd(self, context, start_blockmesh, finish_blockmesh)
 
 # ------------------------------------------------------------------------
 #    Panel
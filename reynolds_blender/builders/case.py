@@ -0,0 +1,90 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+from reynolds_blender.case_writer import write_if_changed
+from reynolds_blender.builders.mesh_dicts import (build_blockmeshdict,
+                                                  build_surface_feature_dict,
+                                                  build_snappyhexmeshdict,
+                                                  build_decompose_par_dict)
+from reynolds_blender.builders.solver_dicts import (build_controldict,
+                                                    build_fvschemes,
+                                                    build_fvsolution,
+                                                    build_transport_properties,
+                                                    build_time_props)
+
+# ------------------------------------------------------------------------
+#    whole case generation, picklable so it runs in worker processes:
+#
+#    with ProcessPoolExecutor() as pool:
+#        for files in pool.map(render_case_dicts, snapshots):
+#            ...
+# ------------------------------------------------------------------------
+
+def build_case_dicts(settings, extent=None, datafile_path=None):
+    """ case file path, relative to the case dir -> dict, for every dict
+    the settings call for. The blockMeshDict needs the block extent. """
+    case_dicts = {}
+    if extent is not None and len(settings.regions) > 0:
+        case_dicts[os.path.join('system', 'blockMeshDict')] = \
+            build_blockmeshdict(settings, extent)
+    if len(settings.geometries) > 0:
+        case_dicts[os.path.join('system', 'surfaceFeatureExtractDict')] = \
+            build_surface_feature_dict(settings)
+        case_dicts[os.path.join('system', 'snappyHexMeshDict')] = \
+            build_snappyhexmeshdict(settings)
+    case_dicts[os.path.join('system', 'fvSchemes')] = build_fvschemes(settings)
+    case_dicts[os.path.join('system', 'fvSolution')] = build_fvsolution(settings)
+    case_dicts[os.path.join('system', 'controlDict')] = build_controldict(settings)
+    case_dicts[os.path.join('constant', 'transportProperties')] = \
+        build_transport_properties(settings)
+    for prop, time_prop_dict in build_time_props(settings).items():
+        case_dicts[os.path.join('0', prop)] = time_prop_dict
+    if getattr(settings, 'solve_in_parallel', False):
+        case_dicts[os.path.join('system', 'decomposeParDict')] = \
+            build_decompose_par_dict(settings, datafile_path)
+    return case_dicts
+
+def render_case_dicts(settings, extent=None, datafile_path=None):
+    """ case file path -> file content, plain strings that pickle back
+    from worker processes. """
+    return dict((case_file, str(case_dict)) for case_file, case_dict in
+                build_case_dicts(settings, extent, datafile_path).items())
+
+def write_case_files(case_dir, case_files):
+    """ Write the rendered case files under case_dir, returns the case
+    files that changed on disk. """
+    return sorted(case_file for case_file, content in case_files.items()
+                  if write_if_changed(os.path.join(case_dir, case_file),
+                                      content))
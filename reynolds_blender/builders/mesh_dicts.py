@@ -0,0 +1,260 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+from reynolds_blender.extents import foam_point
+
+# ----------------
+# reynolds imports
+# ----------------
+from reynolds.dict.parser import ReynoldsFoamDict
+
+# ------------------------------------------------------------------------
+#    mesh and decomposition dicts, settings is a scene or a snapshot of it
+# ------------------------------------------------------------------------
+
+FACE_VERTICES = {'Front': [0, 3, 2, 1],
+                 'Back': [4, 5, 6, 7],
+                 'Top': [3, 7, 6, 2],
+                 'Bottom': [0, 1, 5, 4],
+                 'Left': [0, 4, 7, 3],
+                 'Right': [1, 2, 6, 5]}
+
+def geometry_keys(name, geometry_info):
+    """ (key, key without extension) naming a geometry in the dicts. """
+    file_path = geometry_info.get('file_path', None)
+    if file_path:
+        key = os.path.basename(file_path)
+        return key, os.path.splitext(key)[0]
+    return name, name
+
+def build_blockmeshdict(settings, extent):
+    """ blockMeshDict of the block spanning extent, its (min, max) in
+    openfoam axes. """
+    (x0, y0, z0), (x1, y1, z1) = extent
+    block_cells = settings.block_cells_pg
+
+    block_mesh_dict = ReynoldsFoamDict('blockMeshDict.foam')
+
+    # generate bmd vertices
+    block_mesh_dict['vertices'] = [[x0, y0, z0], [x1, y0, z0],
+                                   [x1, y1, z0], [x0, y1, z0],
+                                   [x0, y0, z1], [x1, y0, z1],
+                                   [x1, y1, z1], [x0, y1, z1]]
+
+    # generate bmd blocks
+    grading = [[[1, 1, block_cells.n_grading[i]]] for i in range(3)]
+    block_mesh_dict['blocks'] = ['hex', [0, 1, 2, 3, 4, 5, 6, 7],
+                                 [block_cells.n_cells[i] for i in range(3)],
+                                 'simpleGrading', grading]
+
+    # generate bmd regions
+    bmd_boundary = []
+    for name, r in settings.regions.items():
+        name, patch_type, face_labels, _ = r
+        faces = [FACE_VERTICES[f] for f in face_labels if f in FACE_VERTICES]
+        bmd_boundary.append(name)
+        bmd_boundary.append({'type': patch_type, 'faces': faces})
+    block_mesh_dict['boundary'] = bmd_boundary
+
+    # set convert to meters
+    block_mesh_dict['convertToMeters'] = block_cells.convert_to_meters
+    return block_mesh_dict
+
+def build_surface_feature_dict(settings):
+    surface_feature_dict = ReynoldsFoamDict('surfaceFeatureExtractDict.foam')
+    for name, geometry_info in settings.geometries.items():
+        if geometry_info['has_features']:
+            key, _ = geometry_keys(name, geometry_info)
+            coeffs = {'includedAngle': geometry_info['included_angle']}
+            surface_feature_dict[key] = {
+                'extractionMethod': 'extractFromSurface',
+                'writeObj': 'yes',
+                'extractFromSurfaceCoeffs': coeffs}
+    return surface_feature_dict
+
+def _geometry(geometry_info, key_without_ext):
+    geometry_type = geometry_info['type']
+    if geometry_type == 'triSurfaceMesh':
+        return {'type': geometry_type, 'name': key_without_ext}
+    if geometry_type == 'searchableSphere':
+        return {'type': geometry_type,
+                'centre': foam_point(geometry_info['centre']),
+                'radius': geometry_info['radius']}
+    if geometry_type == 'searchableBox':
+        return {'type': geometry_type,
+                'min': foam_point(geometry_info['min']),
+                'max': foam_point(geometry_info['max'])}
+    return None
+
+def _add_geometries(snappy_dict, geometries):
+    """ geometry, features and refinement entries of every geometry. """
+    castellated = snappy_dict['castellatedMeshControls']
+    features = []
+    for name, geometry_info in geometries.items():
+        key, key_without_ext = geometry_keys(name, geometry_info)
+
+        geometry = _geometry(geometry_info, key_without_ext)
+        if geometry is not None:
+            snappy_dict['geometry'][key] = geometry
+
+        if geometry_info['has_features']:
+            features.append({'file': '"' + key_without_ext + '.eMesh' + '"',
+                             'level': geometry_info['feature_level']})
+
+        if geometry_info['refinement_type'] == 'Surface':
+            surface = geometry_info['refinementSurface']
+            castellated['refinementSurfaces'][key_without_ext] = {
+                'level': [surface['min'], surface['max']]}
+
+        if geometry_info['refinement_type'] == 'Region':
+            region = geometry_info['refinementRegion']
+            castellated['refinementRegions'][key_without_ext] = {
+                'mode': region['mode'],
+                'levels': [[region['dist'], region['level']]]}
+    if features:
+        castellated['features'] = features
+
+def _add_castellated_mesh_controls(controls, settings):
+    controls['maxLocalCells'] = settings.max_local_cells
+    controls['maxGlobalCells'] = settings.max_global_cells
+    controls['minRefinementCells'] = settings.min_refinement_cells
+    controls['maxLoadUnbalance'] = settings.max_load_unbalance
+    controls['resolveFeatureAngle'] = settings.resolve_feature_angle
+    location_in_mesh = settings.location_in_mesh
+    if location_in_mesh[0] != 0 and location_in_mesh[1] != 0 and location_in_mesh[2] != 0:
+        controls['locationInMesh'] = [location_in_mesh[0],
+                                      location_in_mesh[2],
+                                      location_in_mesh[1]]
+    controls['allowFreeStandingZoneFaces'] = settings.allow_free_standing_zones
+
+def _add_snap_controls(controls, settings):
+    controls['nSmoothPatch'] = settings.n_smooth_patch_iter
+    controls['tolerance'] = settings.tolerance
+    controls['nSolveIter'] = settings.disp_relax_iter
+    controls['nRelaxIter'] = settings.snapping_relax_iter
+    controls['nFeatureSnapIter'] = settings.feature_edge_snapping_iter
+    controls['implicitFeatureSanp'] = settings.implicit_feature_snap
+    controls['explicitFeatureSnap'] = settings.explicit_feature_snap
+    controls['multiRegionFeatureSnap'] = settings.multi_region_feature_snap
+
+def _add_layers_controls(controls, settings):
+    for name, layers in settings.add_layers.items():
+        controls['layers'][name] = {'nSurfaceLayers': layers}
+    controls['relativeSizes'] = settings.relative_sizes
+    controls['expansionRatio'] = settings.expansion_ratio
+    controls['finalLayerThickness'] = settings.final_layer_thickness
+    controls['minThickness'] = settings.min_layer_thickness
+    controls['nGrow'] = settings.n_grow_layers
+    controls['featureAngle'] = settings.layer_feature_angle
+    controls['nRelaxIter'] = settings.layer_n_relax_iter
+    controls['nSmoothSurfaceNormals'] = settings.layer_n_smooth_normal_iter
+    controls['nSmoothNormals'] = settings.layer_n_smooth_iter
+    controls['nSmoothThickness'] = settings.smooth_layer_thickness
+    controls['maxFaceThicknessRatio'] = settings.max_face_thickness_ratio
+    controls['maxThicknessToMedialRatio'] = settings.max_thickness_to_medial_ratio
+    controls['minMedianAxisAngle'] = settings.min_median_axis_angle
+    controls['nBufferCellsNoExtrude'] = settings.n_buffer_cells_no_extrude
+    controls['nLayerIter'] = settings.layer_n_add_iter
+    controls['nRelaxedIter'] = settings.layer_n_mesh_quality_iter
+
+def _add_mesh_quality_controls(controls, settings):
+    controls['maxNonOrtho'] = settings.max_non_ortho
+    controls['maxBoundarySkewness'] = settings.max_boundary_skewness
+    controls['maxInternalFaceSkewness'] = settings.max_internal_face_skewness
+    controls['maxConcave'] = settings.max_concaveness
+    if settings.min_pyramid_vol != 0:
+        controls['minVol'] = settings.min_pyramid_vol
+    if settings.min_tetrahedral_quality != 0:
+        controls['minTetQuality'] = settings.min_tetrahedral_quality
+    controls['minArea'] = settings.min_face_area
+    controls['minTwist'] = settings.min_face_twist
+    controls['minDeterminant'] = settings.min_cell_det
+    controls['minFaceWeight'] = settings.min_face_weight
+    controls['minVolRatio'] = settings.min_vol_ratio
+    controls['minTriangleTwist'] = settings.min_tri_twist
+    controls['nSmoothScale'] = settings.n_smooth_scale
+    controls['errorReduction'] = settings.error_reduction
+
+def build_snappyhexmeshdict(settings):
+    """ snappyHexMeshDict in a single pass: the entries of every geometry
+    are accumulated, the global controls are set once. """
+    snappy_dict = ReynoldsFoamDict('snappyHexMeshDict.foam')
+
+    # steps to run
+    snappy_dict['castellatedMesh'] = settings.castellated_mesh_step
+    snappy_dict['snap'] = settings.snap_step
+    snappy_dict['addLayers'] = settings.add_layers_step
+
+    _add_geometries(snappy_dict, settings.geometries)
+    _add_castellated_mesh_controls(snappy_dict['castellatedMeshControls'],
+                                   settings)
+    _add_snap_controls(snappy_dict['snapControls'], settings)
+    _add_layers_controls(snappy_dict['addLayersControls'], settings)
+    _add_mesh_quality_controls(snappy_dict['meshQualityControls'], settings)
+    return snappy_dict
+
+def build_decompose_par_dict(settings, datafile_path=None):
+    """ decomposeParDict, datafile_path is the absolute path of the manual
+    decomposition data file. """
+    decompose_par_dict = ReynoldsFoamDict('decomposeParDict.foam')
+
+    # mandatory
+    decompose_par_dict['numberOfSubdomains'] = settings.number_of_subdomains
+    decompose_par_dict['method'] = settings.decompose_method
+
+    # simpleCoeffs
+    simple_nxyz = (str(settings.nSimpleCoeffsX),
+                   str(settings.nSimpleCoeffsY),
+                   str(settings.nSimpleCoeffsZ))
+    decompose_par_dict['simpleCoeffs']['n'] = '(' + ' '.join(simple_nxyz) + ')'
+    decompose_par_dict['simpleCoeffs']['delta'] = settings.simpleCoeffDelta
+
+    # hierarchicalCoeffs
+    hierarchical_nxyz = (str(settings.nHierarchicalCoeffsX),
+                         str(settings.nHierarchicalCoeffsY),
+                         str(settings.nHierarchicalCoeffsZ))
+    decompose_par_dict['hierarchicalCoeffs']['n'] =  '(' + ' '.join(hierarchical_nxyz) + ')'
+    decompose_par_dict['hierarchicalCoeffs']['delta'] = settings.hierarchicalCoeffDelta
+    decompose_par_dict['hierarchicalCoeffs']['order'] = settings.order_of_decomposition
+
+    # metisCoeffs
+    decompose_par_dict['metisCoeffs']['processorWeights'] = settings.metisCoeffs_processor_weights
+    decompose_par_dict['metisCoeffs']['strategy'] = settings.metisCoeffs_strategy
+
+    # manualCoeffs
+    if datafile_path:
+        decompose_par_dict['manualCoeffs']['datafile'] = """ '"{}"' """.format(datafile_path)
+
+    return decompose_par_dict
@@ -0,0 +1,125 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import copy
+import os
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+from reynolds_blender.gui.spec_cache import gui_spec_path, load_gui_spec
+
+# ------------------------------------------------------------------------
+#    plain settings snapshots
+# ------------------------------------------------------------------------
+
+# set on the scene by the time property operators, not declared in a spec
+UNDECLARED_ATTRS = ['time_props_dimensions', 'time_props_internal_field']
+
+class Settings(object):
+    """ Plain, picklable settings read like the scene: settings.cd_end_time.
+    """
+
+    def __init__(self, values=None, **kwargs):
+        self.__dict__.update(values or {})
+        self.__dict__.update(kwargs)
+
+    def as_dict(self):
+        return dict((name, value.as_dict() if isinstance(value, Settings)
+                     else value) for name, value in self.__dict__.items())
+
+    def __eq__(self, other):
+        return isinstance(other, Settings) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        return 'Settings(%r)' % self.as_dict()
+
+def plain_value(value):
+    """ value without references into blender data. """
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, 'bl_rna'):
+        # a property group
+        return Settings(dict((name, plain_value(getattr(value, name)))
+                             for name in value.bl_rna.properties.keys()
+                             if name != 'rna_type'))
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    if hasattr(value, '__len__'):
+        # property arrays and mathutils vectors
+        return tuple(value)
+    return value
+
+# attr type -> value when the spec gives no default, as bpy.props does
+TYPE_DEFAULTS = {'String': '', 'Bool': False, 'Int': 0, 'Float': 0.0,
+                 'FloatVector': (0.0, 0.0, 0.0), 'IntVector': (0, 0, 0)}
+
+def spec_attrs(spec_files=None):
+    """ name -> props of the scene attributes the YAML panel specs declare. """
+    if spec_files is None:
+        panels_dir = os.path.dirname(gui_spec_path('common_attrs.yaml'))
+        spec_files = sorted(f for f in os.listdir(panels_dir)
+                            if f.endswith('.yaml'))
+    attrs = {}
+    for spec_file in spec_files:
+        attrs.update((load_gui_spec(spec_file) or {}).get('attrs', None)
+                     or {})
+    return attrs
+
+def spec_attr_names(spec_files=None):
+    return sorted(set(spec_attrs(spec_files)).union(UNDECLARED_ATTRS))
+
+def default_settings(spec_files=None):
+    """ Settings of a new scene, from the spec defaults. Property groups
+    are left out since their defaults live in their classes. """
+    values = dict((name, {}) for name in UNDECLARED_ATTRS)
+    for name, props in spec_attrs(spec_files).items():
+        attr_type = props.get('type', None)
+        if attr_type == 'PyDict':
+            values[name] = {}
+        elif attr_type == 'PyList':
+            values[name] = []
+        elif attr_type == 'Enum':
+            values[name] = props.get('default', props['items'][0][0])
+        elif attr_type in TYPE_DEFAULTS:
+            default = props.get('default', TYPE_DEFAULTS[attr_type])
+            if isinstance(default, list):
+                default = tuple(default)
+            values[name] = default
+    return Settings(values)
+
+def snapshot_scene(scene, names=None):
+    """ Settings holding a plain copy of the scene attributes, all those the
+    panel specs declare unless names are given. """
+    values = {}
+    for name in names or spec_attr_names():
+        if hasattr(scene, name):
+            values[name] = plain_value(getattr(scene, name))
+    return Settings(values)
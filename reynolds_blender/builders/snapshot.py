@@ -0,0 +1,234 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+from reynolds_blender.builders.settings import (Settings, UNDECLARED_ATTRS,
+                                                plain_value)
+
+# ------------------------------------------------------------------------
+#    scene snapshot kept current by property update callbacks
+# ------------------------------------------------------------------------
+
+# attr types registered as bpy properties with an update callback, these
+# are only read back from the scene once they are marked dirty
+TRACKED_TYPES = ('String', 'Bool', 'Int', 'Float', 'Enum', 'IntVector',
+                 'FloatVector')
+
+# python values and property groups have no update callback, these are
+# read and compared on every snapshot
+COMPARED_TYPES = ('PyDict', 'PyList', 'Custom')
+
+# the time property files in the 0 dir
+TIME_DIR = '0'
+
+ALL_CASE_FILES = ['system/blockMeshDict',
+                  'system/surfaceFeatureExtractDict',
+                  'system/snappyHexMeshDict',
+                  'system/decomposeParDict',
+                  'system/controlDict',
+                  'system/fvSchemes',
+                  'system/fvSolution',
+                  'constant/transportProperties',
+                  TIME_DIR]
+
+SOLVER_CASE_FILES = ['system/controlDict',
+                     'system/fvSchemes',
+                     'system/fvSolution',
+                     'constant/transportProperties',
+                     TIME_DIR]
+
+SNAPPY_CASE_FILES = ['system/snappyHexMeshDict']
+
+# spec file -> case files generated from its attrs, spec files not listed
+# only hold panel state
+SPEC_CASE_FILES = {
+    'controlDict.yaml': ['system/controlDict'],
+    'fvSchemes.yaml': ['system/fvSchemes'],
+    'fvSolution.yaml': ['system/fvSolution'],
+    'transportProperties.yaml': ['constant/transportProperties'],
+    'block_cells.yaml': ['system/blockMeshDict'],
+    'snappy_steps.yaml': SNAPPY_CASE_FILES,
+    'castellated_mesh.yaml': SNAPPY_CASE_FILES,
+    'snapping.yaml': SNAPPY_CASE_FILES,
+    'layers.yaml': SNAPPY_CASE_FILES,
+    'mesh_quality.yaml': SNAPPY_CASE_FILES,
+    'parallel_solver.yaml': ['system/decomposeParDict'],
+}
+
+# attr -> case files, for attrs declared in shared or panel state specs
+ATTR_CASE_FILES = {
+    'case_dir_path': ALL_CASE_FILES,
+    'solver_name': SOLVER_CASE_FILES,
+    'geometries': ['system/surfaceFeatureExtractDict',
+                   'system/snappyHexMeshDict'],
+    'add_layers': SNAPPY_CASE_FILES,
+    'location_in_mesh': SNAPPY_CASE_FILES,
+    'manual_datafile_path': ['system/decomposeParDict'],
+    'regions': ['system/blockMeshDict', TIME_DIR],
+    'geo_patches': [TIME_DIR],
+    'time_props': [TIME_DIR],
+    'time_props_dimensions': [TIME_DIR],
+    'time_props_internal_field': [TIME_DIR],
+}
+
+_MISSING = object()
+
+class SceneSnapshot(object):
+    """ Settings of the scene read in one pass, then kept current by
+    reading back only the attributes marked dirty since.
+
+    set_scene_attrs adds every spec it loads to the attrs all scene
+    snapshots share, and the properties it creates call mark_dirty from
+    their update callback. Undo, redo and loading a blend file change
+    values without calling it, so those reset every snapshot.
+    """
+
+    def __init__(self, attrs=None):
+        # attr name -> (spec file, attr type)
+        self.attrs = {} if attrs is None else attrs
+        self.dirty = set()
+        self.settings = None
+        # attrs that changed in the last take
+        self.changed = set()
+        # case files whose attrs changed since they were last generated
+        self.stale = set(ALL_CASE_FILES)
+
+    def add_spec(self, spec_file, attrs):
+        for name, props in attrs.items():
+            self.attrs[name] = (spec_file, props['type'])
+        self.dirty.update(attrs)
+
+    def remove_spec(self, spec_file):
+        for name, (attr_spec, _) in list(self.attrs.items()):
+            if attr_spec == spec_file:
+                del self.attrs[name]
+
+    def mark_dirty(self, name):
+        self.dirty.add(name)
+
+    def _read(self, name, attr_type):
+        if attr_type in TRACKED_TYPES:
+            return self.settings is None or name in self.dirty
+        return attr_type in COMPARED_TYPES
+
+    def take(self, scene):
+        """ Settings of the scene, re-reading only dirty attrs. """
+        values = {} if self.settings is None else dict(self.settings.__dict__)
+        attrs = dict((name, 'PyDict') for name in UNDECLARED_ATTRS)
+        attrs.update((name, attr_type)
+                     for name, (_, attr_type) in self.attrs.items())
+        changed = set()
+        for name, attr_type in attrs.items():
+            if not self._read(name, attr_type):
+                continue
+            value = getattr(scene, name, _MISSING)
+            if value is _MISSING:
+                continue
+            value = plain_value(value)
+            if values.get(name, _MISSING) != value:
+                values[name] = value
+                changed.add(name)
+        self.dirty.clear()
+        self.settings = Settings(values)
+        self.changed = changed
+        self.stale.update(self.case_files(changed))
+        return self.settings
+
+    def case_files(self, names):
+        """ Case files generated from the attrs in names. """
+        case_files = set()
+        for name in names:
+            case_files.update(ATTR_CASE_FILES.get(name, []))
+            spec_file, _ = self.attrs.get(name, (None, None))
+            case_files.update(SPEC_CASE_FILES.get(spec_file, []))
+        return case_files
+
+    def is_stale(self, case_files):
+        return any(case_file in self.stale for case_file in case_files)
+
+    def generated(self, case_files):
+        """ Mark case_files as generated from the current settings. """
+        self.stale.difference_update(case_files)
+
+    def reset(self):
+        self.dirty.clear()
+        self.settings = None
+        self.changed = set()
+        self.stale = set(ALL_CASE_FILES)
+
+# ------------------------------------------------------------------------
+#    a snapshot per scene
+# ------------------------------------------------------------------------
+
+# attrs of the specs set_scene_attrs loaded, shared by the snapshots
+_scene_attrs = {}
+
+# scene key -> SceneSnapshot
+_snapshots = {}
+
+def _scene_key(scene):
+    as_pointer = getattr(scene, 'as_pointer', None)
+    return as_pointer() if as_pointer is not None else id(scene)
+
+def scene_snapshot(scene):
+    """ The snapshot of scene, created on first use. """
+    key = _scene_key(scene)
+    snapshot = _snapshots.get(key, None)
+    if snapshot is None:
+        snapshot = _snapshots[key] = SceneSnapshot(_scene_attrs)
+    return snapshot
+
+def scene_settings(scene):
+    """ Settings of scene from its snapshot, brought up to date. """
+    return scene_snapshot(scene).take(scene)
+
+def add_spec(spec_file, attrs):
+    for name, props in attrs.items():
+        _scene_attrs[name] = (spec_file, props['type'])
+    for snapshot in _snapshots.values():
+        snapshot.dirty.update(attrs)
+
+def remove_spec(spec_file):
+    for name, (attr_spec, _) in list(_scene_attrs.items()):
+        if attr_spec == spec_file:
+            del _scene_attrs[name]
+
+def reset_snapshots():
+    """ Forget every snapshot, for when scene values changed without
+    their update callbacks, and scenes may have been freed. """
+    _snapshots.clear()
+
+def mark_dirty_update(name):
+    """ Property update callback marking name dirty in the snapshot of
+    the scene it belongs to. """
+    def update(self, context):
+        snapshot = _snapshots.get(_scene_key(self), None)
+        if snapshot is not None:
+            snapshot.mark_dirty(name)
+    return update
@@ -0,0 +1,169 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------
+# reynolds imports
+# ----------------
+from reynolds.dict.parser import ReynoldsFoamDict
+
+# ------------------------------------------------------------------------
+#    solver dicts, settings is a scene or a snapshot of it
+# ------------------------------------------------------------------------
+
+def generate_controldict(control_dict, settings):
+    control_dict['startFrom'] = settings.cd_start_from
+    control_dict['startTime'] = settings.cd_start_time
+    control_dict['stopAt'] = settings.cd_stop_at
+    control_dict['endTime'] = settings.cd_end_time
+    control_dict['deltaT'] = settings.cd_delta_time
+    control_dict['writeControl'] = settings.cd_write_control
+    control_dict['writeInterval'] = settings.cd_write_interval
+    control_dict['purgeWrite'] = settings.cd_purge_write
+    control_dict['writeFormat'] = settings.cd_write_format
+    control_dict['writePrecision'] = settings.cd_write_precision
+    control_dict['writeCompression'] = settings.cd_write_compression
+    control_dict['timeFormat'] = settings.cd_time_format
+    control_dict['timePrecision'] = settings.cd_time_precision
+    control_dict['runTimeModifiable'] = settings.cd_runtime_modifiable
+
+def build_controldict(settings):
+    control_dict = ReynoldsFoamDict('controlDict.foam')
+    control_dict['application'] = settings.solver_name
+    generate_controldict(control_dict, settings)
+    return control_dict
+
+def generate_laplacianFoam_fvschemes(fvschemes, settings):
+    fvschemes['ddtSchemes']['default'] = settings.ddt_schemes_default
+    fvschemes['gradSchemes']['default'] = settings.grad_schemes_default
+    fvschemes['gradSchemes']['grad(T)'] = settings.grad_schemes_grad_T
+    fvschemes['divSchemes']['default'] = settings.div_schemes_default
+    fvschemes['laplacianSchemes']['default'] = settings.lap_schemes_default
+    fvschemes['laplacianSchemes']['laplacian(DT,T)'] = settings.lap_schemes_dt_t
+    fvschemes['interpolationSchemes']['default'] = settings.interp_schemes_default
+    fvschemes['snGradSchemes']['default'] = settings.sngrad_schemes_default
+    fvschemes['fluxRequired']['default'] = settings.flux_required_default
+    fvschemes['fluxRequired']['T'] = settings.flux_required_t
+
+def generate_icoFoam_fvschemes(fvschemes, settings):
+    fvschemes['ddtSchemes']['default'] = settings.ddt_schemes_default
+    fvschemes['gradSchemes']['default'] = settings.grad_schemes_default
+    fvschemes['gradSchemes']['grad(p)'] = settings.grad_schemes_grad_p
+    fvschemes['divSchemes']['default'] = settings.div_schemes_default
+    fvschemes['divSchemes']['div(phi,U)'] = settings.div_schemes_phi_U
+    fvschemes['laplacianSchemes']['default'] = settings.lap_schemes_default
+    fvschemes['interpolationSchemes']['default'] = settings.interp_schemes_default
+    fvschemes['snGradSchemes']['default'] = settings.sngrad_schemes_default
+
+def build_fvschemes(settings):
+    fvschemes = ReynoldsFoamDict('fvSchemes.foam',
+                                 solver_name=settings.solver_name)
+    if settings.solver_name == 'laplacianFoam':
+        generate_laplacianFoam_fvschemes(fvschemes, settings)
+    elif settings.solver_name == 'icoFoam':
+        generate_icoFoam_fvschemes(fvschemes, settings)
+    return fvschemes
+
+def generate_laplacianFoam_fvsolution(fvsolution, settings):
+    fvsolution['solvers']['T']['solver'] = settings.solvers_T_solver
+    fvsolution['solvers']['T']['preconditioner'] = settings.solvers_T_preconditioner
+    fvsolution['solvers']['T']['tolerance'] = settings.solvers_T_tolerance
+    fvsolution['solvers']['T']['relTol'] = settings.solvers_T_relTol
+    fvsolution['SIMPLE']['nNonOrthogonalCorrectors'] = settings.simple_nNonOrthogonalCorrectors
+
+def generate_icoFoam_fvsolution(fvsolution, settings):
+    fvsolution['solvers']['p']['solver'] = settings.solvers_p_solver
+    fvsolution['solvers']['p']['preconditioner'] = settings.solvers_p_preconditioner
+    fvsolution['solvers']['p']['tolerance'] = settings.solvers_p_tolerance
+    fvsolution['solvers']['p']['relTol'] = settings.solvers_p_relTol
+    fvsolution['solvers']['pFinal']['$p'] = settings.solvers_pfinal_p
+    fvsolution['solvers']['pFinal']['relTol'] = settings.solvers_pfinal_relTol
+    fvsolution['solvers']['U']['solver'] = settings.solvers_U_solver
+    fvsolution['solvers']['U']['smoother'] = settings.solvers_U_smoother
+    fvsolution['solvers']['U']['tolerance'] = settings.solvers_U_tolerance
+    fvsolution['solvers']['U']['relTol'] = settings.solvers_U_relTol
+    fvsolution['PISO']['nNonOrthogonalCorrectors'] = settings.piso_nCorrectors
+    fvsolution['PISO']['nNonOrthogonalCorrectors'] = settings.piso_nNonOrthogonalCorrectors
+    fvsolution['PISO']['pRefCell'] = settings.piso_pRefCell
+    fvsolution['PISO']['pRefValue'] = settings.piso_pRefValue
+
+def build_fvsolution(settings):
+    fvsolution = ReynoldsFoamDict('fvSolution.foam',
+                                  solver_name=settings.solver_name)
+    if settings.solver_name == 'laplacianFoam':
+        generate_laplacianFoam_fvsolution(fvsolution, settings)
+    elif settings.solver_name == 'icoFoam':
+        generate_icoFoam_fvsolution(fvsolution, settings)
+    return fvsolution
+
+def generate_laplacianFoam_transport(transport, settings):
+    if settings.tp_dt_scalar_elt1 != "":
+        transport['DT'][1] = settings.tp_dt_scalar_elt1
+    if settings.tp_dt_scalar_elt1 != 0:
+        transport['DT'][2] = settings.tp_dt_scalar_elt2
+
+def generate_icoFoam_transport(transport, settings):
+    if settings.tp_dt_scalar_elt1 != "":
+        transport['nu'][1] = settings.tp_dt_scalar_elt1
+    if settings.tp_dt_scalar_elt1 != 0:
+        transport['nu'][2] = settings.tp_dt_scalar_elt2
+
+def build_transport_properties(settings):
+    transport = ReynoldsFoamDict('transportProperties.foam',
+                                 solver_name=settings.solver_name)
+    if settings.solver_name == 'laplacianFoam':
+        generate_laplacianFoam_transport(transport, settings)
+    elif settings.solver_name == 'icoFoam':
+        generate_icoFoam_transport(transport, settings)
+    return transport
+
+def _patch_time_props(prop, time_prop_info):
+    patch = {}
+    if prop in time_prop_info:
+        patch['type'] = time_prop_info[prop]['type']
+        v = time_prop_info[prop]['value']
+        if v != "":
+            patch['value'] = v
+    return patch
+
+def build_time_props(settings):
+    """ prop name -> dict of the time property files in the 0 dir. """
+    time_prop_dicts = {}
+    for prop in settings.time_props:
+        time_prop_dict = ReynoldsFoamDict(prop + '.foam')
+        time_prop_dict['dimensions'] = settings.time_props_dimensions[prop]
+        time_prop_dict['internalField'] = settings.time_props_internal_field[prop]
+        patches = {}
+        # these are block mesh patches
+        for _, r in settings.regions.items():
+            name, patch_type, face_labels, time_prop_info = r
+            patches[name] = _patch_time_props(prop, time_prop_info)
+        # these are geometry patches
+        for name, time_prop_info in settings.geo_patches.items():
+            patches[name] = _patch_time_props(prop, time_prop_info)
+        time_prop_dict['boundaryField'] = patches
+        time_prop_dicts[prop] = time_prop_dict
+    return time_prop_dicts
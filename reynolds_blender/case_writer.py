@@ -0,0 +1,97 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import hashlib
+import os
+import tempfile
+
+# ------------------------------------------------------------------------
+#    write case files only when their content changes
+# ------------------------------------------------------------------------
+
+# file path -> (size, mtime_ns, digest) of the content last seen on disk
+_written_digests = {}
+
+def _digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+def file_digest(file_path):
+    """ Digest of the file's content, None if it does not exist. """
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    cached = _written_digests.get(file_path, None)
+    if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+    with open(file_path, 'rb') as f:
+        digest = _digest(f.read())
+    _written_digests[file_path] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+def write_if_changed(file_path, content):
+    """ Write content to file_path unless the file already holds it.
+
+    The content goes to a temporary file in the same directory which is
+    then renamed over file_path, so readers never see a partial file.
+    Returns True if the file was written.
+    """
+    data = content.encode('utf-8')
+    digest = _digest(data)
+    if file_digest(file_path) == digest:
+        return False
+
+    file_dir = os.path.dirname(file_path)
+    if not os.path.exists(file_dir):
+        os.makedirs(file_dir)
+    fd, temp_path = tempfile.mkstemp(dir=file_dir,
+                                     prefix='.' + os.path.basename(file_path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, file_path)
+    except:
+        os.remove(temp_path)
+        raise
+    st = os.stat(file_path)
+    _written_digests[file_path] = (st.st_size, st.st_mtime_ns, digest)
+    return True
+
+def write_case_dict(self, case_dir, sub_dir, file_name, foam_dict):
+    """ Write foam_dict to case_dir/sub_dir/file_name if it changed, and
+    report the files that were actually updated. """
+    file_path = os.path.join(case_dir, sub_dir, file_name)
+    case_file = os.path.join(sub_dir, file_name)
+    if write_if_changed(file_path, str(foam_dict)):
+        self.report({'INFO'}, 'Updated ' + case_file)
+        return True
+    print('Unchanged ' + case_file)
+    return False
@@ -0,0 +1,355 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import inspect
+import queue
+import subprocess
+import threading
+import time
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+from reynolds_blender.log_sink import OutputSink, STAGE_PREFIX
+
+# ------------------------------------------------------------------------
+#    reported command output
+# ------------------------------------------------------------------------
+
+# the console polls this count and only redraws when it changed
+_reported_lines = 0
+
+def reported_line_count():
+    return _reported_lines
+
+def report_output(self, reports):
+    global _reported_lines
+    for level, info in reports:
+        self.report({level}, info)
+    _reported_lines += len(reports)
+
+def report_finished(self, sink, run_status, cancelled=False):
+    """ Close the sink and report what is left, plus the last lines of the
+    output when the command failed. """
+    sink.close()
+    report_output(self, sink.take_reports())
+    if not run_status and not cancelled:
+        report_output(self, [('ERROR', line) for line in
+                             sink.tail(FAILURE_TAIL_LINES)])
+    if sink.log_path:
+        report_output(self, [('INFO', '%s: %d lines written to %s' %
+                              (sink.cmd_name, sink.line_count,
+                               sink.log_path))])
+
+# lines of output reported when a command fails
+FAILURE_TAIL_LINES = 10
+
+def output_sink(scene, runner):
+    return OutputSink.for_runner(
+        runner, tail_lines=scene.console_log_tail,
+        progress_interval=scene.console_progress_interval,
+        max_reports=scene.console_max_reports)
+
+# ------------------------------------------------------------------------
+#    output listeners, called with each output line on the thread that
+#    reads the command, so they must be cheap and thread safe
+# ------------------------------------------------------------------------
+
+_output_listeners = []
+
+def add_output_listener(listener):
+    if listener not in _output_listeners:
+        _output_listeners.append(listener)
+
+def remove_output_listener(listener):
+    if listener in _output_listeners:
+        _output_listeners.remove(listener)
+
+def _notify_listeners(info):
+    for listener in _output_listeners:
+        listener(info)
+
+# ------------------------------------------------------------------------
+#    stopping commands
+# ------------------------------------------------------------------------
+
+# seconds a terminated command gets to exit before it is killed
+KILL_TIMEOUT = 5
+
+# FoamCmdRunner keeps its process to itself, so it is looked up in the
+# locals of the output generators; runners that wrap others keep the
+# generator they read in a local, since one that is reading does not
+# tell which generator it delegates to
+def output_processes(output, seen=None):
+    """ The subprocesses an output generator and the generators it reads
+    hold in their locals, running or not. """
+    seen = set() if seen is None else seen
+    frame = getattr(output, 'gi_frame', None)
+    if frame is None or id(output) in seen:
+        return []
+    seen.add(id(output))
+    processes = []
+    for value in list(frame.f_locals.values()):
+        if isinstance(value, subprocess.Popen):
+            processes.append(value)
+        elif inspect.isgenerator(value):
+            processes += output_processes(value, seen)
+    return processes
+
+def _stop_processes(processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(KILL_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def stop_output(output):
+    """ Terminate the running processes of an output generator, and kill
+    those still running after KILL_TIMEOUT, without blocking. """
+    processes = [process for process in output_processes(output)
+                 if process.poll() is None]
+    if processes:
+        threading.Thread(target=_stop_processes, args=(processes,),
+                         daemon=True).start()
+
+def stop_runner(runner, output):
+    """ Stop the commands of a runner whose output is being read. """
+    if hasattr(runner, 'stop'):
+        runner.stop()
+    elif output is not None:
+        stop_output(output)
+
+# ------------------------------------------------------------------------
+#    background command job
+# ------------------------------------------------------------------------
+
+class FoamCmdJob(object):
+    """ Runs a FoamCmdRunner on a worker thread.
+
+    The command's output goes to an OutputSink, the UI drains the sink's
+    reports from a timer.
+    Cancelling terminates the command, which ends its output, and stops
+    reading it.
+    """
+
+    def __init__(self, runner, sink=None):
+        self.runner = runner
+        self.sink = sink or OutputSink.for_runner(runner)
+        self.finished = False
+        self.cancelled = False
+        self._cancel = threading.Event()
+        self._output = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        output = self._output = self.runner.run()
+        try:
+            for info in output:
+                _notify_listeners(info)
+                self.sink.write(info)
+                if self._cancel.is_set():
+                    # a command started after cancel() looked for it
+                    stop_runner(self.runner, output)
+                    break
+        finally:
+            self.cancelled = self._cancel.is_set()
+            output.close()
+            self.finished = True
+
+    def cancel(self):
+        self._cancel.set()
+        stop_runner(self.runner, self._output)
+
+    def wait(self, timeout=None):
+        """ Wait for the job to finish, return whether it did. """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.finished
+
+    def drain(self):
+        return self.sink.take_reports()
+
+    @property
+    def run_status(self):
+        return self.finished and not self.cancelled and self.runner.run_status
+
+# ------------------------------------------------------------------------
+#    command sequence
+# ------------------------------------------------------------------------
+
+class FoamCmdSequence(object):
+    """ Runs FoamCmdRunners one after the other as a single runner, which
+    stops at the first command that fails.
+
+    Before each command a stage line is output, stage and failed tell how
+    far the sequence got.
+    """
+
+    def __init__(self, cmd_name, case_dir, runners):
+        self.cmd_name = cmd_name
+        self.case_dir = case_dir
+        self.runners = runners
+        self.run_status = False
+        self.stage = 0
+        self.failed = None
+
+    def run(self):
+        self.run_status = False
+        self.failed = None
+        for i, runner in enumerate(self.runners):
+            self.stage = i + 1
+            yield stage_line(self.stage, len(self.runners), runner)
+            # closing this generator closes the runner's as well, which
+            # is a local so stop_output finds its command
+            output = runner.run()
+            yield from output
+            if not runner.run_status:
+                self.failed = runner
+                return
+        self.run_status = True
+
+def stage_line(stage, stages, runner):
+    cmd = [getattr(runner, 'cmd_name', 'cmd')]
+    cmd += list(getattr(runner, 'cmd_flags', None) or [])
+    return '%s[%d/%d] %s' % (STAGE_PREFIX, stage, stages, ' '.join(cmd))
+
+# ------------------------------------------------------------------------
+#    concurrent commands
+# ------------------------------------------------------------------------
+
+class FoamCmdGroup(object):
+    """ Runs FoamCmdRunners concurrently as a single runner, which succeeds
+    when all of them do; at most max_concurrent of them at a time if set.
+
+    Output lines are prefixed with the runner's index; elapsed holds the
+    wall time of each runner and wall_time that of the group.
+    """
+
+    def __init__(self, cmd_name, case_dir, runners, max_concurrent=None):
+        self.cmd_name = cmd_name
+        self.case_dir = case_dir
+        self.runners = runners
+        self.max_concurrent = max_concurrent
+        self.run_status = False
+        self.elapsed = [None] * len(runners)
+        self.wall_time = None
+        self._cancel = threading.Event()
+        self._outputs = [None] * len(runners)
+
+    def _run_one(self, i, runner, lines, cancel, slots):
+        slots.acquire()
+        try:
+            if cancel.is_set():
+                return
+            start = time.time()
+            output = self._outputs[i] = runner.run()
+            try:
+                for info in output:
+                    lines.put('[%d] %s' % (i, info))
+                    if cancel.is_set():
+                        stop_output(output)
+                        break
+            finally:
+                output.close()
+                self._outputs[i] = None
+                self.elapsed[i] = time.time() - start
+        finally:
+            slots.release()
+            lines.put(None)
+
+    def run(self):
+        self.run_status = False
+        start = time.time()
+        lines = queue.Queue()
+        cancel = self._cancel = threading.Event()
+        slots = threading.Semaphore(self.max_concurrent or len(self.runners)
+                                    or 1)
+        for i, runner in enumerate(self.runners):
+            threading.Thread(target=self._run_one, daemon=True,
+                             args=(i, runner, lines, cancel, slots)).start()
+        running = len(self.runners)
+        try:
+            while running:
+                info = lines.get()
+                if info is None:
+                    running -= 1
+                else:
+                    yield info
+        finally:
+            # closed early: stop the runners that are still going
+            self.stop()
+        self.wall_time = time.time() - start
+        self.run_status = all(runner.run_status for runner in self.runners)
+
+    def stop(self):
+        """ Terminate the running commands and start no more. """
+        self._cancel.set()
+        for output in list(self._outputs):
+            if output is not None:
+                stop_output(output)
+
+    def speedup(self):
+        """ Summed runner time over wall time, or None before the run. """
+        if not self.wall_time or None in self.elapsed:
+            return None
+        return sum(self.elapsed) / self.wall_time
+
+# ------------------------------------------------------------------------
+#    foreground command run, used by scripts and the tests
+# ------------------------------------------------------------------------
+
+def run_foam_cmd_status(self, context, start_func, finish_func):
+    """ Run the command in the foreground and return its run status, False
+    if start_func aborted. """
+    runner = start_func(self, context)
+    if runner is None:
+        return False
+
+    sink = output_sink(context.scene, runner)
+    try:
+        for info in runner.run():
+            _notify_listeners(info)
+            sink.write(info)
+            report_output(self, sink.take_reports())
+    finally:
+        report_finished(self, sink, runner.run_status)
+
+    finish_func(self, context, runner.run_status)
+    return runner.run_status
+
+def run_foam_cmd(self, context, start_func, finish_func):
+    run_foam_cmd_status(self, context, start_func, finish_func)
+    return {'FINISHED'}
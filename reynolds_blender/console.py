@@ -64,6 +64,8 @@ from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
 from reynolds_blender.block_cells import BlockMeshCellsOperator
 from reynolds_blender.block_regions import BlockMeshRegionsOperator
 from reynolds_blender.add_block import BlockMeshAddOperator
+from reynolds_blender.cmd_job import reported_line_count
+from reynolds_blender.residuals import residual_monitor
 
 # ----------------
 # reynolds imports
@@ -79,11 +81,22 @@ from reynolds.foam.cmd_runner import FoamCmdRunner
 #    Panel
 # ------------------------------------------------------------------------
 
+# ------------------------------------------------------------------------
+# A single console runs per session; it polls at the configured interval
+# and redraws the info areas only when new command output was reported,
+# and the 3D view tool shelf only when the solver finished a time step.
+# ------------------------------------------------------------------------
+
+console_stats = {'running': False, 'redraws': 0}
+
 class ConsoleOperator(bpy.types.Operator):
     bl_idname = "reynolds.of_console_op"
     bl_label = "Console"
 
     _timer = None
+    _interval = None
+    _seen_lines = 0
+    _seen_steps = 0
 
     def modal(self, context, event):
         scene = context.scene
@@ -93,21 +106,45 @@ class ConsoleOperator(bpy.types.Operator):
             return {'CANCELLED'}
 
         if event.type == 'TIMER':
-            for area in context.screen.areas:
-                if area.type == 'INFO':
-                    area.tag_redraw()
+            if scene.console_refresh_interval != self._interval:
+                self._add_timer(context)
+            line_count = reported_line_count()
+            if line_count != self._seen_lines:
+                self._seen_lines = line_count
+                for area in context.screen.areas:
+                    if area.type == 'INFO':
+                        area.tag_redraw()
+                console_stats['redraws'] += 1
+            if residual_monitor.version != self._seen_steps:
+                self._seen_steps = residual_monitor.version
+                for area in context.screen.areas:
+                    if area.type == 'VIEW_3D':
+                        area.tag_redraw()
 
         return {'PASS_THROUGH'}
 
-    def execute(self, context):
+    def _add_timer(self, context):
         wm = context.window_manager
-        self._timer = wm.event_timer_add(0.000001, context.window)
-        wm.modal_handler_add(self)
+        if self._timer:
+            wm.event_timer_remove(self._timer)
+        self._interval = context.scene.console_refresh_interval
+        # never poll faster than 100 times per second
+        self._timer = wm.event_timer_add(max(self._interval, 0.01),
+                                         context.window)
+
+    def execute(self, context):
+        if console_stats['running']:
+            return {'FINISHED'}
+        console_stats['running'] = True
+        self._seen_lines = reported_line_count()
+        self._add_timer(context)
+        context.window_manager.modal_handler_add(self)
         return {'RUNNING_MODAL'}
 
     def cancel(self, context):
         wm = context.window_manager
         wm.event_timer_remove(self._timer)
+        console_stats['running'] = False
 
 
 # ------------------------------------------------------------------------
@@ -115,10 +152,13 @@ class ConsoleOperator(bpy.types.Operator):
 # ------------------------------------------------------------------------
 
 def register():
+    console_stats['running'] = False
     register_classes(__name__)
+    set_scene_attrs('console.yaml')
 
 def unregister():
     unregister_classes(__name__)
+    del_scene_attrs('console.yaml')
 
 if __name__ == "__main__":
     register()
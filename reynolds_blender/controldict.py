@@ -61,6 +61,9 @@ from reynolds_blender.gui.register import register_classes, unregister_classes
 from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
 from reynolds_blender.gui.custom_operator import create_custom_operators
 from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.case_writer import write_case_dict
+from reynolds_blender.builders.solver_dicts import build_controldict
+from reynolds_blender.builders.snapshot import scene_settings
 
 # ----------------
 # reynolds imports
@@ -68,26 +71,6 @@ from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
 from reynolds.dict.parser import ReynoldsFoamDict
 from reynolds.foam.cmd_runner import FoamCmdRunner
 
-# ------------------------------------------------------------------------
-#    operators
-# ------------------------------------------------------------------------
-
-def generate_controldict(control_dict, scene):
-    control_dict['startFrom'] = scene.cd_start_from
-    control_dict['startTime'] = scene.cd_start_time
-    control_dict['stopAt'] = scene.cd_stop_at
-    control_dict['endTime'] = scene.cd_end_time
-    control_dict['deltaT'] = scene.cd_delta_time
-    control_dict['writeControl'] = scene.cd_write_control
-    control_dict['writeInterval'] = scene.cd_write_interval
-    control_dict['purgeWrite'] = scene.cd_purge_write
-    control_dict['writeFormat'] = scene.cd_write_format
-    control_dict['writePrecision'] = scene.cd_write_precision
-    control_dict['writeCompression'] = scene.cd_write_compression
-    control_dict['timeFormat'] = scene.cd_time_format
-    control_dict['timePrecision'] = scene.cd_time_precision
-    control_dict['runTimeModifiable'] = scene.cd_runtime_modifiable
-
 # ------------------------------------------------------------------------
 #    Panel
 # ------------------------------------------------------------------------
@@ -104,16 +87,10 @@ class ControlDictOperator(bpy.types.Operator):
         scene = context.scene
         print('Generate controldict for solver: ' + scene.solver_name)
         abs_case_dir_path = bpy.path.abspath(scene.case_dir_path)
-        control_dict = ReynoldsFoamDict('controlDict.foam')
-        control_dict['application'] = scene.solver_name
-        generate_controldict(control_dict, scene)
-
-        system_dir = os.path.join(abs_case_dir_path, "system")
-        if not os.path.exists(system_dir):
-            os.makedirs(system_dir)
-        controldict_file_path = os.path.join(system_dir, "controlDict")
-        with open(controldict_file_path, "w+") as f:
-            f.write(str(control_dict))
+        control_dict = build_controldict(scene_settings(scene))
+
+        write_case_dict(self, abs_case_dir_path, "system", "controlDict",
+                        control_dict)
         return {'FINISHED'}
 
     # Return True to force redraw
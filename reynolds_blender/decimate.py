@@ -0,0 +1,156 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import numpy as np
+
+# ------------------------------------------------------------------------
+#    vertex clustering decimation of streamed triangle soups
+# ------------------------------------------------------------------------
+
+# cells per axis fit in 21 bits, so a cell packs into one int64 key
+MAX_RESOLUTION = (1 << 21) - 1
+
+# resolution used to merge coincident vertices without decimating
+WELD_RESOLUTION = 1 << 20
+
+def _cell_keys(points, lo, cell_size, resolution):
+    ijk = np.floor((points - lo) / cell_size).astype(np.int64)
+    np.clip(ijk, 0, resolution, out=ijk)
+    return (ijk[:, 0] << 42) | (ijk[:, 1] << 21) | ijk[:, 2]
+
+def _canonical(triangles):
+    # rotate each triangle to start at its smallest key, which keeps its
+    # orientation while making duplicates compare equal
+    first = np.argmin(triangles, axis=1)
+    rows = np.arange(len(triangles))[:, None]
+    return triangles[rows, (first[:, None] + np.arange(3)) % 3]
+
+def _unique_rows(triangles):
+    # lexsort is much faster than np.unique(axis=0) on int64 rows
+    triangles = triangles[np.lexsort(triangles.T[::-1])]
+    keep = np.ones(len(triangles), dtype=bool)
+    keep[1:] = np.any(triangles[1:] != triangles[:-1], axis=1)
+    return triangles[keep]
+
+def cluster_triangles(chunks, lo, hi, resolution):
+    """ Snap the vertices of (k, 3, 3) triangle chunks to a grid with
+    resolution cells along the longest axis of the (lo, hi) box. Each
+    occupied cell becomes one vertex at the mean of its members, and
+    triangles that collapse are dropped. Returns (vertices, triangles). """
+    lo = np.asarray(lo, dtype=np.float64)
+    hi = np.asarray(hi, dtype=np.float64)
+    resolution = max(1, min(int(resolution), MAX_RESOLUTION))
+    cell_size = float((hi - lo).max()) / resolution or 1.0
+
+    vertex_parts = []
+    triangle_parts = []
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        points = np.asarray(chunk, dtype=np.float64).reshape(-1, 3)
+        keys = _cell_keys(points, lo, cell_size, resolution)
+        cells, inverse = np.unique(keys, return_inverse=True)
+        sums = np.zeros((len(cells), 3))
+        np.add.at(sums, inverse.ravel(), points)
+        counts = np.bincount(inverse.ravel(), minlength=len(cells))
+        vertex_parts.append((cells, sums, counts))
+
+        triangles = keys.reshape(-1, 3)
+        keep = ((triangles[:, 0] != triangles[:, 1]) &
+                (triangles[:, 1] != triangles[:, 2]) &
+                (triangles[:, 0] != triangles[:, 2]))
+        triangles = _canonical(triangles[keep])
+        if len(triangles):
+            triangle_parts.append(_unique_rows(triangles))
+
+    if not triangle_parts:
+        return np.empty((0, 3)), np.empty((0, 3), dtype=np.int64)
+
+    cells = np.concatenate([part[0] for part in vertex_parts])
+    cells, inverse = np.unique(cells, return_inverse=True)
+    sums = np.zeros((len(cells), 3))
+    np.add.at(sums, inverse.ravel(),
+              np.concatenate([part[1] for part in vertex_parts]))
+    counts = np.bincount(inverse.ravel(),
+                         weights=np.concatenate([part[2]
+                                                 for part in vertex_parts]),
+                         minlength=len(cells))
+    vertices = sums / counts[:, None]
+
+    triangles = _unique_rows(np.concatenate(triangle_parts))
+    return vertices, np.searchsorted(cells, triangles)
+
+def decimate_to_budget(chunks_func, lo, hi, n_triangles, budget,
+                       max_passes=5):
+    """ Cluster the triangles streamed by chunks_func() until at most
+    budget triangles remain. Surfaces with fewer triangles than the
+    budget only have their coincident vertices welded. """
+    if n_triangles <= budget:
+        return cluster_triangles(chunks_func(), lo, hi, WELD_RESOLUTION)
+
+    # a surface crossing an r^3 grid occupies roughly r^2 cells, each of
+    # which ends up with about two triangles
+    resolution = max(2, int(np.sqrt(budget / 2.0)))
+    for i in range(max_passes):
+        vertices, triangles = cluster_triangles(chunks_func(), lo, hi,
+                                                resolution)
+        if len(triangles) <= budget:
+            break
+        resolution = max(1, int(resolution * 0.95 *
+                                np.sqrt(budget / float(len(triangles)))))
+    return vertices, triangles
+
+def box_triangles(lo, hi):
+    """ 8 vertices and 12 outward facing triangles of the (lo, hi) box. """
+    (x0, y0, z0), (x1, y1, z1) = lo, hi
+    vertices = np.array([[x0, y0, z0], [x1, y0, z0], [x1, y1, z0],
+                         [x0, y1, z0], [x0, y0, z1], [x1, y0, z1],
+                         [x1, y1, z1], [x0, y1, z1]], dtype=np.float64)
+    triangles = np.array([[0, 2, 1], [0, 3, 2], [4, 5, 6], [4, 6, 7],
+                          [0, 1, 5], [0, 5, 4], [3, 6, 2], [3, 7, 6],
+                          [0, 4, 7], [0, 7, 3], [1, 2, 6], [1, 6, 5]],
+                         dtype=np.int64)
+    return vertices, triangles
+
+def fan_triangulate(loops, sizes):
+    """ (m, 3) triangles fanning out from the first vertex of each polygon
+    given as flat loops and polygon sizes. """
+    loops = np.asarray(loops)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    starts = np.zeros(len(sizes), dtype=np.int64)
+    np.cumsum(sizes[:-1], out=starts[1:])
+    n_fan = np.maximum(sizes - 2, 0)
+    fan_starts = np.repeat(starts, n_fan)
+    # position of each triangle within its polygon's fan, from 1
+    firsts = np.zeros(len(n_fan), dtype=np.int64)
+    np.cumsum(n_fan[:-1], out=firsts[1:])
+    j = np.arange(n_fan.sum()) - np.repeat(firsts, n_fan) + 1
+    return np.column_stack((loops[fan_starts], loops[fan_starts + j],
+                            loops[fan_starts + j + 1]))
@@ -0,0 +1,148 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import glob
+import math
+import os
+import re
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+from reynolds_blender.polymesh_io import (read_mesh_size, read_labels,
+                                          read_points)
+
+# ------------------------------------------------------------------------
+#    mesh size
+# ------------------------------------------------------------------------
+
+_check_mesh_cells_re = re.compile(r'^\s*cells:\s+(\d+)', re.MULTILINE)
+_subdomains_re = re.compile(r'^\s*numberOfSubdomains\s+(\d+)\s*;', re.MULTILINE)
+
+def polymesh_dir(case_dir):
+    return os.path.join(case_dir, 'constant', 'polyMesh')
+
+def check_mesh_cells(log_path):
+    """ Cell count from the last mesh stats block of a checkMesh log. """
+    if not os.path.exists(log_path):
+        return None
+    with open(log_path) as f:
+        counts = _check_mesh_cells_re.findall(f.read())
+    return int(counts[-1]) if counts else None
+
+def mesh_cell_count(case_dir):
+    """ Cell count of the case mesh, from the owner header note, the owner
+    list or the log of the last checkMesh run, None if there is no mesh. """
+    mesh_dir = polymesh_dir(case_dir)
+    try:
+        n_cells = read_mesh_size(mesh_dir).get('nCells', None)
+        if n_cells is None:
+            # every cell owns at least one face
+            n_cells = int(read_labels(mesh_dir, 'owner').max()) + 1
+        return n_cells
+    except (IOError, OSError, ValueError):
+        return check_mesh_cells(os.path.join(case_dir, 'log.checkMesh'))
+
+def mesh_extent(case_dir):
+    """ (min, max) of the mesh points in OpenFoam axes, None if there is
+    no mesh. """
+    try:
+        points = read_points(polymesh_dir(case_dir))
+    except (IOError, OSError, ValueError):
+        return None
+    if not len(points):
+        return None
+    return points.min(axis=0).tolist(), points.max(axis=0).tolist()
+
+# ------------------------------------------------------------------------
+#    decomposition plan
+# ------------------------------------------------------------------------
+
+def plan_subdomains(n_cells, cells_per_core, cores):
+    """ Enough subdomains for cells_per_core cells each, at most cores. """
+    if not n_cells or cells_per_core <= 0:
+        return max(cores, 1)
+    return max(1, min(cores, int(math.ceil(n_cells / cells_per_core))))
+
+def _factor_triples(n):
+    for nx in range(1, n + 1):
+        if n % nx:
+            continue
+        for ny in range(1, n // nx + 1):
+            if (n // nx) % ny == 0:
+                yield nx, ny, n // (nx * ny)
+
+def split_subdomains(n, size):
+    """ The (nx, ny, nz) with nx * ny * nz == n whose subdomains of the
+    domain size have the smallest surface, that is the fewest processor
+    faces. Flat directions of a 2D or 1D domain are not split. """
+    flat = max(size) * 1e-6 if max(size) > 0 else 1.0
+    # a flat axis counts as huge, so splitting it costs most
+    lengths = [s if s > flat else 0.0 for s in size]
+    if not any(lengths):
+        lengths = [1.0, 1.0, 1.0]
+    best, best_cost = (n, 1, 1), None
+    for split in _factor_triples(n):
+        if any(k > 1 and not l for k, l in zip(split, lengths)):
+            continue
+        a, b, c = [(l or 1.0) / k for l, k in zip(lengths, split)]
+        cost = a * b + b * c + a * c
+        # ties go to the split with most subdomains along x, then y
+        if best_cost is None or cost <= best_cost + 1e-12:
+            best, best_cost = split, cost
+    return best
+
+def plan_decomposition(case_dir, cells_per_core, cores, extent=None):
+    """ {'cells', 'subdomains', 'n'} for the case mesh; extent is the
+    (min, max) fallback when there is no mesh yet. """
+    n_cells = mesh_cell_count(case_dir)
+    extent = mesh_extent(case_dir) or extent
+    n = plan_subdomains(n_cells, cells_per_core, cores)
+    size = [1.0, 1.0, 1.0]
+    if extent:
+        size = [hi - lo for lo, hi in zip(*extent)]
+    return {'cells': n_cells, 'subdomains': n,
+            'n': split_subdomains(n, size)}
+
+# ------------------------------------------------------------------------
+#    decomposed case
+# ------------------------------------------------------------------------
+
+def dict_subdomains(case_dir):
+    """ numberOfSubdomains of the case's decomposeParDict, or None. """
+    dict_path = os.path.join(case_dir, 'system', 'decomposeParDict')
+    if not os.path.exists(dict_path):
+        return None
+    with open(dict_path) as f:
+        match = _subdomains_re.search(f.read())
+    return int(match.group(1)) if match else None
+
+def processor_dirs(case_dir):
+    return glob.glob(os.path.join(case_dir, 'processor[0-9]*'))
@@ -0,0 +1,140 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+
+import numpy as np
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+
+from reynolds_blender.stl_io import stl_stats
+
+# ------------------------------------------------------------------------
+#    world space extents of blender objects
+# ------------------------------------------------------------------------
+
+# object pointer -> (cache key, (min, max))
+_extent_cache = {}
+
+def stl_to_blender(points):
+    """ (n, 3) STL file points placed the way import_stl places them in
+    blender, which maps the file's (x, y, z) to (-x, z, y). """
+    points = np.asarray(points)
+    return np.column_stack((-points[:, 0], points[:, 2], points[:, 1]))
+
+def stl_extent(file_path):
+    """ (min, max) of an STL file as import_stl places it in blender. """
+    stats = stl_stats(file_path)
+    corners = stl_to_blender([stats['min'], stats['max']])
+    return corners.min(axis=0), corners.max(axis=0)
+
+def _source_stl(obj, matrix):
+    # snappyHexMesh meshes the file, not the blender mesh, so as long as
+    # the object sits where it was imported the file gives the extent
+    file_path = obj.get('stl_file_path', None)
+    if file_path and os.path.exists(file_path) and \
+       np.array_equal(matrix, np.identity(4)):
+        return file_path
+    return None
+
+def _cache_key(obj):
+    matrix = tuple(tuple(row) for row in obj.matrix_world)
+    # blender has no mesh version counter, the local bound box and the
+    # vertex count change with any edit that moves the extent
+    local_bbox = tuple(tuple(corner) for corner in obj.bound_box)
+    n_verts = len(obj.data.vertices) if obj.type == 'MESH' else 0
+    return (matrix, local_bbox, n_verts)
+
+def _is_axis_aligned(matrix):
+    rot = matrix[:3, :3]
+    return np.count_nonzero(rot - np.diag(np.diag(rot))) == 0
+
+def _local_points(obj, matrix):
+    # the corners of the local bound box transform to the exact extent
+    # unless the object is rotated, then only the vertices give a tight fit
+    if obj.type == 'MESH' and not _is_axis_aligned(matrix):
+        mesh = obj.data
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get('co', coords)
+        if len(coords) > 0:
+            return coords.reshape(-1, 3)
+    return np.array([tuple(corner) for corner in obj.bound_box],
+                    dtype=np.float64)
+
+def world_extent(obj):
+    """ (min, max) corners of the object's world space axis aligned
+    bounding box, in blender axes. """
+    key = _cache_key(obj)
+    cached = _extent_cache.get(obj.as_pointer(), None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    matrix = np.array(key[0], dtype=np.float64)
+    file_path = _source_stl(obj, matrix)
+    if file_path:
+        extent = stl_extent(file_path)
+    else:
+        points = _local_points(obj, matrix)
+        world = np.dot(points, matrix[:3, :3].T) + matrix[:3, 3]
+        extent = (world.min(axis=0), world.max(axis=0))
+    _extent_cache[obj.as_pointer()] = (key, extent)
+    return extent
+
+def world_centre(obj):
+    lo, hi = world_extent(obj)
+    return (lo + hi) / 2.0
+
+def world_size(obj):
+    lo, hi = world_extent(obj)
+    return hi - lo
+
+def clear_extent_cache():
+    _extent_cache.clear()
+
+# ------------------------------------------------------------------------
+#    blender to openfoam axes, openfoam's y axis is blender's z axis
+# ------------------------------------------------------------------------
+
+def foam_point(v):
+    return [float(v[0]), float(v[2]), float(v[1])]
+
+def foam_points(points):
+    """ (n, 3) points swapped between blender and openfoam axes, the swap
+    is its own inverse. """
+    points = np.asarray(points)
+    return points[:, [0, 2, 1]]
+
+def foam_extent(obj):
+    """ (min, max) of the object's world extent in openfoam axes, as
+    plain lists for the foam dicts. """
+    lo, hi = world_extent(obj)
+    return foam_point(lo), foam_point(hi)
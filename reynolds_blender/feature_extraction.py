@@ -54,7 +54,6 @@ import glob
 import operator
 import os
 import pathlib
-from shutil import copy
 
 # ------------------------
 # reynolds blender imports
@@ -64,6 +63,11 @@ from reynolds_blender.gui.register import register_classes, unregister_classes
 from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
 from reynolds_blender.gui.custom_operator import create_custom_operators
 from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.cmd_job import run_foam_cmd
+from reynolds_blender.case_writer import write_case_dict
+from reynolds_blender.staging import stage_file
+from reynolds_blender.builders.mesh_dicts import build_surface_feature_dict
+from reynolds_blender.builders.snapshot import scene_settings
 
 # ----------------
 # reynolds imports
@@ -90,35 +94,15 @@ def show_location_in_mesh(self, context):
 
 def generate_surface_dict(self, context):
     scene = context.scene
-    surface_feature_dict = ReynoldsFoamDict('surfaceFeatureExtractDict.foam')
-
-    for name, geometry_info in scene.geometries.items():
-        if geometry_info['has_features']:
-            print('generate feature extract dict for ', name)
-            file_path = geometry_info.get('file_path', None)
-            if file_path:
-                key = os.path.basename(file_path)
-            else:
-                key = name
-            surface_feature_dict[key] = {}
-            surface_feature_dict[key]['extractionMethod'] = 'extractFromSurface'
-            surface_feature_dict[key]['writeObj'] = 'yes'
-            coeffs = {'includedAngle': geometry_info['included_angle']}
-            surface_feature_dict[key]['extractFromSurfaceCoeffs'] = coeffs
-            print(surface_feature_dict[key])
-
+    surface_feature_dict = build_surface_feature_dict(scene_settings(scene))
     print(surface_feature_dict)
     abs_case_dir_path = bpy.path.abspath(scene.case_dir_path)
-    system_dir = os.path.join(abs_case_dir_path, "system")
-    if not os.path.exists(system_dir):
-        os.makedirs(system_dir)
-    sfed_file_path = os.path.join(system_dir, "surfaceFeatureExtractDict")
-    with open(sfed_file_path, "w") as f:
-        f.write(str(surface_feature_dict))
+    write_case_dict(self, abs_case_dir_path, "system",
+                    "surfaceFeatureExtractDict", surface_feature_dict)
 
     return {'FINISHED'}
 
-def extract_surface_features(self, context):
+def start_extract_surface_features(self, context):
     scene = context.scene
     case_dir = bpy.path.abspath(scene.case_dir_path)
 
@@ -129,7 +113,7 @@ def extract_surface_features(self, context):
 
     scene.features_extracted = False
 
-    # first copy all obj, stl files
+    # first stage all obj, stl files
     trisurface_dir = os.path.join(case_dir, 'constant', 'triSurface')
     if not os.path.exists(trisurface_dir):
         print('Creating trisurface dir: ', trisurface_dir)
@@ -138,15 +122,17 @@ def extract_surface_features(self, context):
         print(' Geo info : ')
         if 'file_path' in geo_info:
             src_file = geo_info['file_path']
-            print(' Copying geometry file ' + src_file + ' to ' + trisurface_dir)
-            copy(src_file, trisurface_dir)
+            how = stage_file(src_file, trisurface_dir)
+            print(' Staged geometry file ' + src_file + ' to ' +
+                  trisurface_dir + ' : ' + how)
 
-    cr = FoamCmdRunner(cmd_name='surfaceFeatureExtract', case_dir=case_dir)
+    return FoamCmdRunner(cmd_name='surfaceFeatureExtract', case_dir=case_dir)
 
-    for info in cr.run():
-        self.report({'WARNING'}, info)
+def finish_extract_surface_features(self, context, run_status):
+    scene = context.scene
+    case_dir = bpy.path.abspath(scene.case_dir_path)
 
-    if cr.run_status:
+    if run_status:
         scene.features_extracted = True
         self.report({'INFO'}, 'SurfaceFeatureExtract : SUCCESS')
         # switch to layer 1
@@ -167,7 +153,9 @@ def extract_surface_features(self, context):
     else:
         self.report({'ERROR'}, 'SurfaceFeatureExtract : FAILED')
 
-    return {'FINISHED'}
+def extract_surface_features(self, context):
+    return run_foam_cmd(self, context, start_extract_surface_features,
+                        finish_extract_surface_features)
 
 # ------------------------------------------------------------------------
 #    Panel
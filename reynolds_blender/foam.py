@@ -47,6 +47,7 @@ from reynolds_blender.fvschemes import FVSchemesOperator
 from reynolds_blender.fvsolution import FVSolutionOperator
 from reynolds_blender.controldict import ControlDictOperator
 from reynolds_blender.transportproperties import TransportPropertiesOperator
+from reynolds_blender.console import console_stats
 
 # ---------------
 # reynolds imports
@@ -111,6 +112,9 @@ class FoamPanel(Panel):
         row.operator(ControlDictOperator.bl_idname, text='', icon='SETTINGS')
         row.operator(TransportPropertiesOperator.bl_idname, text='', icon='SETTINGS')
 
+        row = layout.row()
+        row.label(text='Console redraws: %d' % console_stats['redraws'])
+
 
 # ------------------------------------------------------------------------
 # register and unregister
@@ -62,6 +62,9 @@ from reynolds_blender.gui.register import register_classes, unregister_classes
 from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
 from reynolds_blender.gui.custom_operator import create_custom_operators
 from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.case_writer import write_case_dict
+from reynolds_blender.builders.solver_dicts import build_fvschemes
+from reynolds_blender.builders.snapshot import scene_settings
 
 # ----------------
 # reynolds imports
@@ -69,32 +72,6 @@ from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
 from reynolds.dict.parser import ReynoldsFoamDict
 from reynolds.foam.cmd_runner import FoamCmdRunner
 
-# ------------------------------------------------------------------------
-#    operators
-# ------------------------------------------------------------------------
-
-def generate_laplacianFoam_fvschemes(fvschemes, scene):
-    fvschemes['ddtSchemes']['default'] = scene.ddt_schemes_default
-    fvschemes['gradSchemes']['default'] = scene.grad_schemes_default
-    fvschemes['gradSchemes']['grad(T)'] = scene.grad_schemes_grad_T
-    fvschemes['divSchemes']['default'] = scene.div_schemes_default
-    fvschemes['laplacianSchemes']['default'] = scene.lap_schemes_default
-    fvschemes['laplacianSchemes']['laplacian(DT,T)'] = scene.lap_schemes_dt_t
-    fvschemes['interpolationSchemes']['default'] = scene.interp_schemes_default
-    fvschemes['snGradSchemes']['default'] = scene.sngrad_schemes_default
-    fvschemes['fluxRequired']['default'] = scene.flux_required_default
-    fvschemes['fluxRequired']['T'] = scene.flux_required_t
-
-def generate_icoFoam_fvschemes(fvschemes, scene):
-    fvschemes['ddtSchemes']['default'] = scene.ddt_schemes_default
-    fvschemes['gradSchemes']['default'] = scene.grad_schemes_default
-    fvschemes['gradSchemes']['grad(p)'] = scene.grad_schemes_grad_p
-    fvschemes['divSchemes']['default'] = scene.div_schemes_default
-    fvschemes['divSchemes']['div(phi,U)'] = scene.div_schemes_phi_U
-    fvschemes['laplacianSchemes']['default'] = scene.lap_schemes_default
-    fvschemes['interpolationSchemes']['default'] = scene.interp_schemes_default
-    fvschemes['snGradSchemes']['default'] = scene.sngrad_schemes_default
-
 # ------------------------------------------------------------------------
 #    Panel
 # ------------------------------------------------------------------------
@@ -111,17 +88,9 @@ class FVSchemesOperator(bpy.types.Operator):
         scene = context.scene
         print('Generate fvschemes for solver: ' + scene.solver_name)
         abs_case_dir_path = bpy.path.abspath(scene.case_dir_path)
-        fvschemes = ReynoldsFoamDict('fvSchemes.foam', solver_name=scene.solver_name)
-        if scene.solver_name == 'laplacianFoam':
-            generate_laplacianFoam_fvschemes(fvschemes, scene)
-        elif scene.solver_name == 'icoFoam':
-            generate_icoFoam_fvschemes(fvschemes, scene)
-        system_dir = os.path.join(abs_case_dir_path, "system")
-        if not os.path.exists(system_dir):
-            os.makedirs(system_dir)
-        fvschemes_file_path = os.path.join(system_dir, "fvSchemes")
-        with open(fvschemes_file_path, "w+") as f:
-            f.write(str(fvschemes))
+        fvschemes = build_fvschemes(scene_settings(scene))
+        write_case_dict(self, abs_case_dir_path, "system", "fvSchemes",
+                        fvschemes)
         return {'FINISHED'}
 
     # Return True to force redraw
@@ -61,6 +61,9 @@ from reynolds_blender.gui.register import register_classes, unregister_classes
 from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
 from reynolds_blender.gui.custom_operator import create_custom_operators
 from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.case_writer import write_case_dict
+from reynolds_blender.builders.solver_dicts import build_fvsolution
+from reynolds_blender.builders.snapshot import scene_settings
 
 # ----------------
 # reynolds imports
@@ -68,33 +71,6 @@ from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
 from reynolds.dict.parser import ReynoldsFoamDict
 from reynolds.foam.cmd_runner import FoamCmdRunner
 
-# ------------------------------------------------------------------------
-#    operators
-# ------------------------------------------------------------------------
-
-def generate_laplacianFoam_fvsolution(fvsolution, scene):
-    fvsolution['solvers']['T']['solver'] = scene.solvers_T_solver
-    fvsolution['solvers']['T']['preconditioner'] = scene.solvers_T_preconditioner
-    fvsolution['solvers']['T']['tolerance'] = scene.solvers_T_tolerance
-    fvsolution['solvers']['T']['relTol'] = scene.solvers_T_relTol
-    fvsolution['SIMPLE']['nNonOrthogonalCorrectors'] = scene.simple_nNonOrthogonalCorrectors
-
-def generate_icoFoam_fvsolution(fvsolution, scene):
-    fvsolution['solvers']['p']['solver'] = scene.solvers_p_solver
-    fvsolution['solvers']['p']['preconditioner'] = scene.solvers_p_preconditioner
-    fvsolution['solvers']['p']['tolerance'] = scene.solvers_p_tolerance
-    fvsolution['solvers']['p']['relTol'] = scene.solvers_p_relTol
-    fvsolution['solvers']['pFinal']['$p'] = scene.solvers_pfinal_p
-    fvsolution['solvers']['pFinal']['relTol'] = scene.solvers_pfinal_relTol
-    fvsolution['solvers']['U']['solver'] = scene.solvers_U_solver
-    fvsolution['solvers']['U']['smoother'] = scene.solvers_U_smoother
-    fvsolution['solvers']['U']['tolerance'] = scene.solvers_U_tolerance
-    fvsolution['solvers']['U']['relTol'] = scene.solvers_U_relTol
-    fvsolution['PISO']['nNonOrthogonalCorrectors'] = scene.piso_nCorrectors
-    fvsolution['PISO']['nNonOrthogonalCorrectors'] = scene.piso_nNonOrthogonalCorrectors
-    fvsolution['PISO']['pRefCell'] = scene.piso_pRefCell
-    fvsolution['PISO']['pRefValue'] = scene.piso_pRefValue
-
 # ------------------------------------------------------------------------
 #    Panel
 # ------------------------------------------------------------------------
@@ -111,17 +87,9 @@ class FVSolutionOperator(bpy.types.Operator):
         scene = context.scene
         print('Generate fvsolution for solver: ' + scene.solver_name)
         abs_case_dir_path = bpy.path.abspath(scene.case_dir_path)
-        fvsolution = ReynoldsFoamDict('fvSolution.foam', solver_name=scene.solver_name)
-        if scene.solver_name == 'laplacianFoam':
-            generate_laplacianFoam_fvsolution(fvsolution, scene)
-        elif scene.solver_name == 'icoFoam':
-            generate_icoFoam_fvsolution(fvsolution, scene)
-        system_dir = os.path.join(abs_case_dir_path, "system")
-        if not os.path.exists(system_dir):
-            os.makedirs(system_dir)
-        fvsolution_file_path = os.path.join(system_dir, "fvSolution")
-        with open(fvsolution_file_path, "w+") as f:
-            f.write(str(fvsolution))
+        fvsolution = build_fvsolution(scene_settings(scene))
+        write_case_dict(self, abs_case_dir_path, "system", "fvSolution",
+                        fvsolution)
         return {'FINISHED'}
 
     # Return True to force redraw
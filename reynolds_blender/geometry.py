@@ -61,6 +61,8 @@ from reynolds_blender.gui.register import register_classes, unregister_classes
 from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
 from reynolds_blender.gui.custom_operator import create_custom_operators
 from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.extents import (world_centre, world_extent,
+                                      world_size)
 
 # ----------------
 # reynolds imports
@@ -83,6 +85,7 @@ def import_stl(self, context):
     # TBD : OBJ IS NONE, if multiple objects are added after import
     # -------------------------------------------------------------
     scene.geometries[obj.name] = {'file_path': scene.stl_file_path}
+    obj['stl_file_path'] = bpy.path.abspath(scene.stl_file_path)
     print('STL IMPORT: ', scene.geometries)
     return {'FINISHED'}
 
@@ -114,20 +117,12 @@ def assign_shmd_geometry(self, context):
     print('obj ', obj.name, 'geometry_info :' , geometry_info)
     geometry_info['type'] = scene.geometry_type
     if geometry_info['type'] == 'searchableSphere':
-        local_bbox_center = 0.125 * sum((Vector(b) for b in obj.bound_box), Vector())
-        geometry_info['centre'] = obj.matrix_world * local_bbox_center
-        x = [v[0] for v in obj.bound_box]
-        x.sort()
-        geometry_info['radius'] = (abs(x[0]) + abs(x[7])) / 2.0
+        geometry_info['centre'] = Vector(world_centre(obj))
+        geometry_info['radius'] = float(world_size(obj).max()) / 2.0
     if geometry_info['type'] == 'searchableBox':
-        x = [v[0] for v in obj.bound_box]
-        x.sort()
-        y = [v[2] for v in obj.bound_box]
-        y.sort()
-        z = [v[1] for v in obj.bound_box]
-        z.sort()
-        geometry_info['min'] = [x[0], y[0], z[0]]
-        geometry_info['max'] = [x[7], y[7], z[7]]
+        lo, hi = world_extent(obj)
+        geometry_info['min'] = [float(c) for c in lo]
+        geometry_info['max'] = [float(c) for c in hi]
     geometry_info['refinement_type'] = scene.refinement_type
     if scene.refinement_type == 'Surface':
         geometry_info['refinementSurface'] = {'min': scene.refinement_level_min,
@@ -36,14 +36,15 @@ from bpy.props import (StringProperty, BoolProperty, FloatProperty, IntProperty,
 # --------------
 # python imports
 # --------------
-import os
 import sys
-import yaml
 
 # ------------------------
 # reynolds blender imports
 # ------------------------
 from reynolds_blender.gui.custom_operator import ReynoldsListLabel
+from reynolds_blender.gui.spec_cache import load_gui_spec
+from reynolds_blender.builders.snapshot import (add_spec, remove_spec,
+                                                mark_dirty_update)
 
 def load_py_dict_attr(name, props):
     setattr(bpy.types.Scene, name, {})
@@ -54,13 +55,15 @@ def load_py_list_attr(name, props):
 def load_float_attr(name, props):
     float_property = FloatProperty(name=props.get(name, ''),
                                    description=props.get('description', ''),
-                                   default=props.get('default', 0.0))
+                                   default=props.get('default', 0.0),
+                                   update=mark_dirty_update(name))
     setattr(bpy.types.Scene, name, float_property)
 
 def load_int_attr(name, props):
     float_property = IntProperty(name=props.get(name, ''),
                                  description=props.get('description', ''),
-                                 default=props.get('default', 0))
+                                 default=props.get('default', 0),
+                                 update=mark_dirty_update(name))
     setattr(bpy.types.Scene, name, float_property)
 
 def load_int_vector_attr(name, props):
@@ -69,7 +72,8 @@ def load_int_vector_attr(name, props):
                                                                ''),
                                          default=tuple(props.get('default',
                                                                 [0, 0, 0])),
-                                         subtype=props.get('subtype', 'NONE'))
+                                         subtype=props.get('subtype', 'NONE'),
+                                         update=mark_dirty_update(name))
     setattr(bpy.types.Scene, name, int_vec_property)
 
 def load_float_vector_attr(name, props):
@@ -78,7 +82,8 @@ def load_float_vector_attr(name, props):
                                                                    ''),
                                              default=tuple(props.get('default',
                                                                      [0, 0, 0])),
-                                             subtype=props.get('subtype', 'NONE'))
+                                             subtype=props.get('subtype', 'NONE'),
+                                             update=mark_dirty_update(name))
     setattr(bpy.types.Scene, name, float_vec_property)
 
 def load_enum_attr(name, props):
@@ -87,7 +92,8 @@ def load_enum_attr(name, props):
     print(items)
     enum_property =  EnumProperty(name=props.get('name', ''),
                                   description=props.get('description', ''),
-                                  items=items, default=props.get('default', None))
+                                  items=items, default=props.get('default', None),
+                                  update=mark_dirty_update(name))
     setattr(bpy.types.Scene, name, enum_property)
 
 def load_ui_list_attrs(name, props):
@@ -103,13 +109,15 @@ def load_string_attr(name, props):
                                      description=props.get('description', ''),
                                      default=props.get('default', ''),
                                      maxlen=props.get('maxlen', 30),
-                                     subtype=props.get('subtype', 'NONE'))
+                                     subtype=props.get('subtype', 'NONE'),
+                                     update=mark_dirty_update(name))
     setattr(bpy.types.Scene, name, string_property)
 
 def load_bool_attr(name, props):
     bool_property = BoolProperty(name=props.get('name', ''),
                                  description=props.get('description', ''),
-                                 default=props.get('default', False))
+                                 default=props.get('default', False),
+                                 update=mark_dirty_update(name))
     setattr(bpy.types.Scene, name, bool_property)
 
 def load_custom_attr(name, props):
@@ -156,13 +164,10 @@ def load_scene_attr(attr):
         load_custom_attr(name, props)
 
 def set_scene_attrs(attrs_filename):
-    current_dir = os.path.realpath(os.path.dirname(__file__))
-    attrs_file = os.path.join(current_dir, "../yaml", "panels",
-                                attrs_filename)
-    with open(attrs_file) as f:
-        d = yaml.load(f)
-        for attr in d['attrs'].items():
-            load_scene_attr(attr)
+    d = load_gui_spec(attrs_filename)
+    for attr in d['attrs'].items():
+        load_scene_attr(attr)
+    add_spec(attrs_filename, d['attrs'])
 
 def del_scene_attr(attr):
     name, props = attr
@@ -178,10 +183,7 @@ def del_scene_attr(attr):
         del a
 
 def del_scene_attrs(attrs_filename):
-    current_dir = os.path.realpath(os.path.dirname(__file__))
-    attrs_file = os.path.join(current_dir, "../yaml", "panels",
-                                attrs_filename)
-    with open(attrs_file) as f:
-        d = yaml.load(f)
-        for attr in d['attrs'].items():
-            del_scene_attr(attr)
+    d = load_gui_spec(attrs_filename)
+    for attr in d['attrs'].items():
+        del_scene_attr(attr)
+    remove_spec(attrs_filename)
@@ -37,14 +37,16 @@ from bpy.types import PropertyGroup, UIList
 # python imports
 # --------------
 import inspect
-import os
 import sys
-import yaml
 
 # ------------------------
 # reynolds blender imports
 # ------------------------
 from .register import register_classes
+from .spec_cache import load_gui_spec
+from reynolds_blender.cmd_job import (FoamCmdJob, run_foam_cmd,
+                                      report_output, report_finished,
+                                      output_sink, KILL_TIMEOUT)
 
 # ---------------
 # custom operator
@@ -64,6 +66,82 @@ def create_custom_operator(class_name, id_name, label, description,
           getattr(opclass, '__module__', None))
     bpy.utils.register_class(opclass)
 
+# ------------------------------------------------------------------
+# custom operator running an OpenFoam command without blocking the UI
+# ------------------------------------------------------------------
+
+def create_custom_cmd_operator(class_name, id_name, label, description,
+                               func_module_name, start_func, finish_func):
+    """ The operator runs start_func(self, context), which validates the
+    case and returns a FoamCmdRunner (or None to abort), and calls
+    finish_func(self, context, run_status) once the command is done.
+
+    Invoked from the UI the command runs on a worker thread and the operator
+    stays modal until it completes, ESC cancels it. Executed from a script
+    the command runs in the foreground.
+    """
+    module = sys.modules[func_module_name]
+    all_functions = dict([f for f in inspect.getmembers(module,
+                                                        inspect.isfunction)
+                          if inspect.getmodule(f[1]) == module])
+    start = all_functions[start_func]
+    finish = all_functions[finish_func]
+
+    def execute_func(self, context):
+        return run_foam_cmd(self, context, start, finish)
+
+    def invoke_func(self, context, event):
+        runner = start(self, context)
+        if runner is None:
+            return {'FINISHED'}
+        self._job = FoamCmdJob(runner, output_sink(context.scene, runner))
+        self._job.start()
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal_func(self, context, event):
+        job = self._job
+        if event.type == 'ESC' and not job.finished:
+            self.report({'WARNING'}, label + ' : CANCELLING')
+            job.cancel()
+            return {'RUNNING_MODAL'}
+
+        if event.type == 'TIMER':
+            report_output(self, job.drain())
+            if job.finished:
+                context.window_manager.event_timer_remove(self._timer)
+                report_finished(self, job.sink, job.run_status, job.cancelled)
+                finish(self, context, job.run_status)
+                if job.cancelled:
+                    self.report({'WARNING'}, label + ' : CANCELLED')
+                    return {'CANCELLED'}
+                return {'FINISHED'}
+
+        return {'PASS_THROUGH'}
+
+    def cancel_func(self, context):
+        # blender cancels the operator, on loading a file or closing the
+        # window: stop the command and close its log like modal_func does
+        job = self._job
+        job.cancel()
+        context.window_manager.event_timer_remove(self._timer)
+        job.wait(KILL_TIMEOUT)
+        report_output(self, job.drain())
+        report_finished(self, job.sink, job.run_status, cancelled=True)
+        finish(self, context, job.run_status)
+
+    opclass = type(class_name, (bpy.types.Operator, ),
+                   {"bl_idname": id_name, "bl_label": label,
+                    "bl_description": description,
+                    "execute": execute_func, "invoke": invoke_func,
+                    "modal": modal_func, "cancel": cancel_func,
+                    "_job": None, "_timer": None})
+    print('Registering ', class_name, ' in module',
+          getattr(opclass, '__module__', None))
+    bpy.utils.register_class(opclass)
+
 #---------------
 # custom UI list
 #---------------
@@ -148,29 +226,31 @@ class ReynoldsListLabel(bpy.types.PropertyGroup):
 # -----------------------
 
 def create_custom_operators(operators_filename, func_module_name):
-    current_dir = os.path.realpath(os.path.dirname(__file__))
-    operators_file = os.path.join(current_dir, "../yaml", "panels",
-                                    operators_filename)
-    with open(operators_file) as f:
-        d = yaml.load(f)
-        for operator in d['operators'].items():
-            op_id, props = operator
-            op_type = props.get('operator_type', None)
-            class_name = props.get('class_name', None)
-            label = props.get('label', None)
-            description = props.get('description', None)
-
-            if op_type == 'ListOperator':
-                data_prop = props.get('data_prop', None)
-                id_prop = props.get('id_prop', None)
-                create_custom_list_operator(class_name, op_id, label,
-                                            description,
-                                            data_prop, id_prop)
-            if op_type == 'Operator':
-                exec_func = props.get('execute_func', None)
-                create_custom_operator(class_name, op_id, label,
+    d = load_gui_spec(operators_filename)
+    for operator in d['operators'].items():
+        op_id, props = operator
+        op_type = props.get('operator_type', None)
+        class_name = props.get('class_name', None)
+        label = props.get('label', None)
+        description = props.get('description', None)
+
+        if op_type == 'ListOperator':
+            data_prop = props.get('data_prop', None)
+            id_prop = props.get('id_prop', None)
+            create_custom_list_operator(class_name, op_id, label,
+                                        description,
+                                        data_prop, id_prop)
+        if op_type == 'Operator':
+            exec_func = props.get('execute_func', None)
+            create_custom_operator(class_name, op_id, label,
+                                   description, func_module_name,
+                                   exec_func)
+        if op_type == 'FoamCmdOperator':
+            start_func = props.get('start_func', None)
+            finish_func = props.get('finish_func', None)
+            create_custom_cmd_operator(class_name, op_id, label,
                                        description, func_module_name,
-                                       exec_func)
+                                       start_func, finish_func)
 
 # ---------------------------------------------------------------------
 # Register the classes for loading UI scene attrs and rendering UI list
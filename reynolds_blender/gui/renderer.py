@@ -33,28 +33,161 @@ import bpy
 # --------------
 # python imports
 # --------------
-import yaml
 import os
 
 # ------------------------
 # reynolds blender imports
 # ------------------------
 from .register import register_classes
+from .spec_cache import load_gui_spec
+
+# ------------------------------------------------------------------------
+#    compile a YAML GUI spec into draw closures
+# ------------------------------------------------------------------------
+
+def _compile_children(metadata):
+    return [c for c in (_compile_gui_element(child) for child in metadata)
+            if c is not None]
+
+def _compile_box(metadata):
+    children = _compile_children(metadata)
+    def draw(scene, parent):
+        box = parent.box()
+        for child in children:
+            child(scene, box)
+    return draw
+
+def _compile_row(metadata):
+    children = _compile_children(metadata)
+    def draw(scene, parent):
+        row = parent.row()
+        for child in children:
+            child(scene, row)
+    return draw
+
+def _compile_col(metadata):
+    children = _compile_children(metadata)
+    def draw(scene, parent):
+        col = parent.column()
+        for child in children:
+            child(scene, col)
+    return draw
+
+def _compile_label(metadata):
+    text = metadata.get('text', '')
+    def draw(scene, parent):
+        parent.label(text=text)
+    return draw
+
+def _compile_prop(metadata):
+    enabled = metadata.get('enabled', True)
+    scene_attr = metadata['scene_attr']
+    def draw(scene, parent):
+        parent.enabled = enabled
+        parent.prop(scene, scene_attr)
+    return draw
+
+def _compile_group_prop(metadata):
+    enabled = metadata.get('enabled', True)
+    pointer_name = metadata['pointer']
+    scene_attr = metadata['scene_attr']
+    def draw(scene, parent):
+        parent.enabled = enabled
+        pointer = getattr(scene, pointer_name, None)
+        if pointer:
+            parent.prop(pointer, scene_attr)
+    return draw
+
+def _compile_operator(metadata):
+    op_id = metadata['id']
+    icon = metadata['icon']
+    action = metadata.get('action', False)
+    if action:
+        def draw(scene, parent):
+            parent.operator(op_id, icon=icon, text="").action = action
+    else:
+        def draw(scene, parent):
+            parent.operator(op_id, icon=icon)
+    return draw
+
+def _compile_separator(metadata):
+    nums = range(metadata['nums'])
+    def draw(scene, parent):
+        for i in nums:
+            parent.separator()
+    return draw
+
+def _compile_template_list(metadata):
+    list_type = metadata.get('list_type', 'ReynoldsListItems')
+    data_propname = metadata['coll_data_propname']
+    index_propname = metadata['coll_index_propname']
+    def draw(scene, parent):
+        parent.template_list(list_type, "", scene, data_propname,
+                             scene, index_propname)
+    return draw
+
+_element_compilers = {
+    'box': _compile_box,
+    'row': _compile_row,
+    'col': _compile_col,
+    'label': _compile_label,
+    'prop': _compile_prop,
+    'group_prop': _compile_group_prop,
+    'operator': _compile_operator,
+    'separator': _compile_separator,
+    'template_list': _compile_template_list,
+}
+
+def _compile_gui_element(gui_element):
+    name = list(gui_element.keys())[0]
+    compiler = _element_compilers.get(name, None)
+    if compiler is None:
+        return None
+    return compiler(gui_element[name])
+
+def compile_gui_spec(gui_spec):
+    """ Compile the gui tree of a spec into a flat list of draw closures,
+    so that drawing a panel only makes the layout calls. """
+    return _compile_children(gui_spec['gui'])
+
+# filename -> (parsed spec, compiled draw closures)
+_compiled_specs = {}
+
+def load_compiled_gui_spec(gui_filename):
+    gui_spec = load_gui_spec(gui_filename)
+    compiled = _compiled_specs.get(gui_filename, None)
+    # a new spec object means the yaml file was re-parsed
+    if compiled is None or compiled[0] is not gui_spec:
+        compiled = (gui_spec, compile_gui_spec(gui_spec))
+        _compiled_specs[gui_filename] = compiled
+    return compiled[1]
+
+def clear_compiled_gui_specs():
+    _compiled_specs.clear()
+
+# ------------------------------------------------------------------------
+#    renderer
+# ------------------------------------------------------------------------
 
 class ReynoldsGUIRenderer(object):
     def __init__(self, scene, layout, gui_filename):
         self.scene = scene
         self.layout = layout
+        self.gui_filename = gui_filename
 
-        current_dir = os.path.realpath(os.path.dirname(__file__))
-        gui_file = os.path.join(current_dir, "../yaml", "panels",
-                                gui_filename)
-
-        self.gui_spec = []
-        with open(gui_file) as f:
-            self.gui_spec = yaml.load(f)
+    @property
+    def gui_spec(self):
+        return load_gui_spec(self.gui_filename)
 
     def render(self):
+        scene = self.scene
+        layout = self.layout
+        for draw in load_compiled_gui_spec(self.gui_filename):
+            draw(scene, layout)
+
+    def render_interpreted(self):
+        """ Walk the spec tree on every call; kept as the reference
+        implementation for the compiled renderer. """
         for gui_element in self.gui_spec['gui']:
             self._render_gui_element(gui_element, self.layout)
 
@@ -108,7 +241,9 @@ class ReynoldsGUIRenderer(object):
                 parent.separator()
 
         if name == 'template_list':
-            parent.template_list('ReynoldsListItems', "", self.scene,
+            parent.template_list(metadata.get('list_type',
+                                              'ReynoldsListItems'),
+                                 "", self.scene,
                                  metadata['coll_data_propname'], self.scene,
                                  metadata['coll_index_propname'])
 
@@ -0,0 +1,98 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import time
+import yaml
+
+# ------------------------------------------------------------------------
+#    process wide cache of parsed YAML panel specs
+# ------------------------------------------------------------------------
+
+class SpecCacheStats(object):
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.parse_time = 0.0
+
+    def as_dict(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'parse_time': self.parse_time}
+
+    def __str__(self):
+        return 'hits: {} misses: {} parse time: {:.4f}s'.format(self.hits,
+                                                               self.misses,
+                                                               self.parse_time)
+
+# filename -> [mtime, parsed spec, time of last mtime check]
+_spec_cache = {}
+spec_cache_stats = SpecCacheStats()
+
+# panels are drawn many times per second, so the spec files are stat'ed at
+# most once per interval to pick up edits
+MTIME_CHECK_INTERVAL = 1.0
+
+def gui_spec_path(gui_filename):
+    current_dir = os.path.realpath(os.path.dirname(__file__))
+    return os.path.join(current_dir, "../yaml", "panels", gui_filename)
+
+def load_gui_spec(gui_filename):
+    """ Return the parsed YAML spec for gui_filename.
+
+    The spec is parsed once and shared by every caller until the file's
+    mtime changes, so callers must treat it as read only.
+    """
+    now = time.monotonic()
+    cached = _spec_cache.get(gui_filename, None)
+    if cached is not None:
+        if now - cached[2] < MTIME_CHECK_INTERVAL:
+            spec_cache_stats.hits += 1
+            return cached[1]
+        cached[2] = now
+        if os.path.getmtime(gui_spec_path(gui_filename)) == cached[0]:
+            spec_cache_stats.hits += 1
+            return cached[1]
+
+    gui_file = gui_spec_path(gui_filename)
+    mtime = os.path.getmtime(gui_file)
+    start = time.perf_counter()
+    with open(gui_file) as f:
+        spec = yaml.safe_load(f)
+    spec_cache_stats.parse_time += time.perf_counter() - start
+    spec_cache_stats.misses += 1
+    _spec_cache[gui_filename] = [mtime, spec, now]
+    return spec
+
+def clear_spec_cache():
+    _spec_cache.clear()
+    spec_cache_stats.reset()
@@ -0,0 +1,208 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# Run case pipelines without the Blender UI:
+#
+#   blender -b --addons reynolds_blender \
+#           --python <addons>/reynolds_blender/headless.py -- \
+#           case1.yaml [case2.json ...] [--summary summary.json]
+#
+# A case description, in YAML or JSON:
+#
+#   blend: cavity.blend        # optional, opened before the case runs
+#   case_dir: /runs/cavity
+#   active_object: Plane       # the block object blockMesh is made from
+#   force: false               # re-run stages whose inputs did not change
+#   settings:                  # scene attributes, dotted paths as in sweeps
+#     solver_name: icoFoam
+#     cd_delta_time: 0.005
+#     block_cells_pg.n_cells: [20, 20, 1]
+#     time_props: [p, U]
+#     time_props_dimensions.p: '[ 0 2 -2 0 0 0 0 ]'
+#
+# Relative paths are relative to the description file.
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import argparse
+import json
+import os
+import sys
+import time
+
+import yaml
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+from reynolds_blender.batch import set_path, SweepError
+
+# ------------------------------------------------------------------------
+#    stand-ins for the operator and context the generators take
+# ------------------------------------------------------------------------
+
+class HeadlessError(Exception):
+    pass
+
+class HeadlessOperator(object):
+    """ Takes the place of the operator (self) of the generator and
+    command functions, printing and keeping what they report. """
+
+    def __init__(self, name='case'):
+        self.name = name
+        self.reports = []
+
+    def report(self, levels, message):
+        level = ','.join(sorted(levels))
+        self.reports.append((level, message))
+        print('%s %s: %s' % (self.name, level, message))
+
+    def errors(self):
+        return [message for level, message in self.reports
+                if 'ERROR' in level]
+
+class HeadlessContext(object):
+    def __init__(self, scene, active_object=None):
+        self.scene = scene
+        self.active_object = active_object
+
+# ------------------------------------------------------------------------
+#    case descriptions
+# ------------------------------------------------------------------------
+
+def load_case_description(file_path):
+    with open(file_path) as f:
+        if file_path.endswith('.json'):
+            description = json.load(f)
+        else:
+            description = yaml.safe_load(f)
+    if not isinstance(description, dict) or 'case_dir' not in description:
+        raise HeadlessError(file_path + ': a case description needs a '
+                            'case_dir')
+    base_dir = os.path.dirname(os.path.abspath(file_path))
+    for key in ('blend', 'case_dir'):
+        if description.get(key, None):
+            description[key] = os.path.join(base_dir, description[key])
+    description.setdefault('name', os.path.splitext(
+        os.path.basename(file_path))[0])
+    return description
+
+def apply_settings(scene, settings):
+    for path, value in (settings or {}).items():
+        set_path(scene, path, value)
+
+# ------------------------------------------------------------------------
+#    case runs
+# ------------------------------------------------------------------------
+
+def blender_context(description):
+    """ The context of the scene the case runs in, after opening the
+    case's blend file and activating its block object. """
+    try:
+        import bpy
+    except ImportError:
+        raise HeadlessError('generating the case dicts needs blender: '
+                            'blender -b --addons reynolds_blender --python '
+                            + os.path.abspath(__file__) + ' -- <case>')
+    if description.get('blend', None):
+        bpy.ops.wm.open_mainfile(filepath=description['blend'])
+    scene = bpy.context.scene
+    obj = None
+    name = description.get('active_object', None)
+    if name:
+        if name not in scene.objects:
+            raise HeadlessError('No object ' + name + ' in the scene')
+        obj = scene.objects[name]
+        scene.objects.active = obj
+    return HeadlessContext(scene, obj)
+
+def run_case(description, context=None, operator=None):
+    """ Generate the dicts of the described case and run its pipeline;
+    returns (success, seconds). """
+    start = time.time()
+    operator = operator or HeadlessOperator(description['name'])
+    context = context or blender_context(description)
+
+    # imported here, they need bpy
+    from reynolds_blender.foam import start_openfoam
+    from reynolds_blender.pipeline import run_case_pipeline
+
+    scene = context.scene
+
+    case_dir = description['case_dir']
+    if not os.path.isdir(case_dir):
+        os.makedirs(case_dir)
+    scene.case_dir_path = case_dir
+    scene.pipeline_force = bool(description.get('force', False))
+    try:
+        apply_settings(scene, description.get('settings', None))
+    except SweepError as e:
+        operator.report({'ERROR'}, str(e))
+        return False, time.time() - start
+
+    if not scene.foam_started:
+        start_openfoam(operator, context)
+    success = scene.foam_started and run_case_pipeline(operator, context)
+    return bool(success), time.time() - start
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='headless.py',
+                                     description='Run reynolds case '
+                                     'pipelines without the UI')
+    parser.add_argument('cases', nargs='+',
+                        help='case descriptions, YAML or JSON')
+    parser.add_argument('--summary', help='write a JSON run summary here')
+    args = parser.parse_args(argv)
+
+    results = []
+    for file_path in args.cases:
+        try:
+            description = load_case_description(file_path)
+            success, seconds = run_case(description)
+            error = None
+        except (IOError, OSError, ValueError, HeadlessError) as e:
+            success, seconds, error = False, 0.0, str(e)
+            print(file_path + ': ' + error)
+        results.append({'case': file_path, 'success': success,
+                        'seconds': round(seconds, 2), 'error': error})
+        print('%s: %s in %.1f s' % (file_path,
+                                    'SUCCESS' if success else 'FAILED',
+                                    seconds))
+
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(results, f, indent=2)
+    return len([r for r in results if not r['success']])
+
+if __name__ == '__main__':
+    # blender passes the script's own arguments after --
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else \
+           sys.argv[1:]
+    sys.exit(1 if main(argv) else 0)
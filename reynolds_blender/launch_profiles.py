@@ -0,0 +1,204 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import copy
+import json
+import os
+import re
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+from reynolds_blender.case_writer import write_if_changed
+
+# ------------------------------------------------------------------------
+#    machines (host) files
+# ------------------------------------------------------------------------
+
+_slots_re = re.compile(r'\b(slots|max[-_]slots|cpu)\s*=\s*(\d+)')
+
+def parse_hostfile_text(text):
+    """ Hosts of an Open MPI hostfile ('node1 slots=4 max_slots=8') or an
+    MPICH machines file ('node1:4'), as dicts with host, slots and
+    max_slots (None when unlimited). A host without a slot count has one
+    slot, a host listed twice adds up. """
+    hosts = {}
+    order = []
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        host = line.split()[0]
+        slots, max_slots = None, None
+        if ':' in host:
+            host, count = host.split(':', 1)
+            if count.isdigit():
+                slots = int(count)
+        for key, value in _slots_re.findall(line):
+            if key == 'slots' or key == 'cpu':
+                slots = int(value)
+            else:
+                max_slots = int(value)
+        if slots is None:
+            slots = 1
+        if host not in hosts:
+            order.append(host)
+            hosts[host] = {'host': host, 'slots': 0, 'max_slots': None}
+        entry = hosts[host]
+        entry['slots'] += slots
+        if max_slots is not None:
+            entry['max_slots'] = (entry['max_slots'] or 0) + max_slots
+    return [hosts[host] for host in order]
+
+_hostfile_cache = {}
+
+def parse_hostfile(file_path):
+    """ parse_hostfile_text of a file, cached until it changes. """
+    stat = os.stat(file_path)
+    key = (stat.st_mtime, stat.st_size)
+    cached = _hostfile_cache.get(file_path, None)
+    if cached is None or cached[0] != key:
+        with open(file_path) as f:
+            cached = (key, parse_hostfile_text(f.read()))
+        _hostfile_cache[file_path] = cached
+    return cached[1]
+
+def total_slots(hosts):
+    return sum(host['slots'] for host in hosts)
+
+def max_total_slots(hosts):
+    """ Processes the hosts take with oversubscription, None if any host
+    has no max_slots limit. """
+    if any(host['max_slots'] is None for host in hosts):
+        return None
+    return sum(host['max_slots'] for host in hosts)
+
+# ------------------------------------------------------------------------
+#    launch profiles
+# ------------------------------------------------------------------------
+
+BIND_TO = ['none', 'core', 'socket', 'hwthread', 'numa']
+MAP_BY = ['slot', 'core', 'socket', 'node', 'numa']
+
+def default_profile():
+    return {'hostfile': '', 'bind_to': '', 'map_by': '',
+            'oversubscribe': False, 'local': False, 'extra_flags': ''}
+
+def profile_hosts(profile):
+    hostfile = profile.get('hostfile', '')
+    if hostfile and os.path.exists(hostfile):
+        return parse_hostfile(hostfile)
+    return []
+
+def launch_problem(profile, np):
+    """ Why np processes cannot be launched with the profile, or None. """
+    hosts = profile_hosts(profile)
+    if not hosts or profile.get('local') or profile.get('oversubscribe'):
+        return None
+    slots = total_slots(hosts)
+    if np <= slots:
+        return None
+    limit = max_total_slots(hosts)
+    return ('%d processes but the machines file has %d slots%s: set '
+            'Oversubscribe, use fewer subdomains or more hosts' %
+            (np, slots, '' if limit is None else
+             ' (%d max slots)' % limit))
+
+def local_hostfile(case_dir, hosts, np):
+    """ Hostfile putting the slots of all hosts, or np of them without
+    hosts, on localhost; for trying a cluster launch on one machine. """
+    file_path = os.path.join(case_dir, '.reynolds', 'hostfile.local')
+    slots = total_slots(hosts) or np
+    write_if_changed(file_path, 'localhost slots=%d\n' % slots)
+    return file_path
+
+def launch_flags(profile, np, app_flags, case_dir):
+    """ mpirun flags launching app_flags on np processes as the profile
+    says. The local stand-in runs every process on this machine, with
+    oversubscription, through a localhost hostfile. """
+    flags = []
+    hosts = profile_hosts(profile)
+    if profile.get('local'):
+        flags += ['--hostfile', local_hostfile(case_dir, hosts, np),
+                  '--oversubscribe']
+    else:
+        if hosts:
+            flags += ['--hostfile', profile['hostfile']]
+        if profile.get('oversubscribe'):
+            flags += ['--oversubscribe']
+    if profile.get('map_by'):
+        flags += ['--map-by', profile['map_by']]
+    # binding oversubscribed processes fails, the stand-in does not bind
+    if profile.get('bind_to') and not profile.get('local'):
+        flags += ['--bind-to', profile['bind_to']]
+    flags += profile.get('extra_flags', '').split()
+    return flags + ['-np', str(np)] + app_flags
+
+# ------------------------------------------------------------------------
+#    named profiles, saved per case
+# ------------------------------------------------------------------------
+
+def _profiles_path(case_dir):
+    return os.path.join(case_dir, '.reynolds', 'launch_profiles.json')
+
+# profiles file path -> (stat key, profiles)
+_profiles_cache = {}
+
+def load_profiles(case_dir):
+    """ name -> profile saved for the case, cached until the file
+    changes since the solver panel lists them on every redraw. """
+    file_path = _profiles_path(case_dir)
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return {}
+    key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    cached = _profiles_cache.get(file_path, None)
+    if cached is None or cached[0] != key:
+        try:
+            with open(file_path) as f:
+                cached = (key, json.load(f))
+        except (IOError, OSError, ValueError):
+            cached = (key, {})
+        _profiles_cache[file_path] = cached
+    # callers change what they load before saving it back
+    return copy.deepcopy(cached[1])
+
+def save_profile(case_dir, name, profile):
+    profiles = load_profiles(case_dir)
+    profiles[name] = dict(default_profile(), **profile)
+    write_if_changed(_profiles_path(case_dir),
+                     json.dumps(profiles, indent=2, sort_keys=True))
+
+def delete_profile(case_dir, name):
+    profiles = load_profiles(case_dir)
+    if profiles.pop(name, None) is not None:
+        write_if_changed(_profiles_path(case_dir),
+                         json.dumps(profiles, indent=2, sort_keys=True))
@@ -0,0 +1,201 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# -----------
+# bpy imports
+# -----------
+import bpy
+from mathutils import Vector
+
+# --------------
+# python imports
+# --------------
+import math
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+
+from reynolds_blender.gui.register import register_classes, unregister_classes
+from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
+from reynolds_blender.decimate import decimate_to_budget, fan_triangulate
+from reynolds_blender.mesh_builder import create_mesh
+
+# ------------------------------------------------------------------------
+#    decimation levels of shown mesh patches
+# ------------------------------------------------------------------------
+
+# each level keeps a quarter of the triangles of the one before
+LEVEL_REDUCTION = 4
+
+# levels are not built below this many triangles
+MIN_LEVEL_TRIANGLES = 500
+
+def build_lod_levels(scene, obj, vertices, loops, sizes):
+    """ Build up to scene.lod_levels coarser meshes of obj, whose own mesh
+    is level 0. vertices are in blender axes. Returns the triangle count
+    of every level. """
+    if 'lod_meshes' in obj:
+        set_lod_level(obj, 0)
+        remove_lod_levels(obj)
+    triangles = fan_triangulate(loops, sizes)
+    counts = [len(triangles)]
+    names = [obj.data.name]
+    # level 0 has no user while a coarser level is shown, it must also
+    # survive saving the blend file
+    obj.data.use_fake_user = True
+    if len(triangles):
+        corners = vertices[triangles]
+        lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+        budget = len(triangles)
+        for level in range(1, scene.lod_levels + 1):
+            budget //= LEVEL_REDUCTION
+            if budget < MIN_LEVEL_TRIANGLES:
+                break
+            level_vertices, level_triangles = decimate_to_budget(
+                lambda: [corners], lo, hi, len(triangles), budget)
+            mesh = create_mesh('%s.lod%d' % (obj.name, level),
+                               level_vertices, level_triangles)
+            # unused levels must survive saving the blend file
+            mesh.use_fake_user = True
+            names.append(mesh.name)
+            counts.append(len(level_triangles))
+    obj['lod_meshes'] = '\n'.join(names)
+    obj['lod_triangles'] = counts
+    obj['lod_level'] = 0
+    return counts
+
+def lod_meshes(obj):
+    if 'lod_meshes' not in obj:
+        return []
+    return [bpy.data.meshes.get(name, None)
+            for name in obj['lod_meshes'].split('\n')]
+
+def remove_lod_levels(obj):
+    for mesh in lod_meshes(obj):
+        if mesh is not None:
+            mesh.use_fake_user = False
+            if mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+    for key in ('lod_meshes', 'lod_triangles', 'lod_level'):
+        if key in obj:
+            del obj[key]
+
+def set_lod_level(obj, level):
+    """ Show the given level of obj, clamped to the levels it has.
+    Returns True if the displayed mesh changed. """
+    meshes = lod_meshes(obj)
+    level = max(0, min(level, len(meshes) - 1))
+    if level == obj['lod_level'] or meshes[level] is None:
+        return False
+    obj.data = meshes[level]
+    obj['lod_level'] = level
+    return True
+
+def distance_level(obj, view_location, near):
+    """ Level for the object seen from view_location: 0 until the view is
+    near object sizes away, one level coarser for each doubling after. """
+    size = max(obj.dimensions.length, 1e-9)
+    # patch objects keep world space vertices with an identity matrix, so
+    # their origin says nothing of where they are
+    centre = sum((Vector(c) for c in obj.bound_box), Vector()) / 8
+    ratio = (obj.matrix_world * centre - view_location).length / size
+    if ratio <= near:
+        return 0
+    return int(math.log(ratio / near, 2)) + 1
+
+def _view_location(context):
+    for area in context.screen.areas:
+        if area.type == 'VIEW_3D':
+            region_3d = area.spaces.active.region_3d
+            return region_3d.view_matrix.inverted().translation
+    return None
+
+# ------------------------------------------------------------------------
+# A single LOD updater runs per session; it polls the view and the
+# quality slider and swaps the meshes of the objects that have levels.
+# ------------------------------------------------------------------------
+
+lod_stats = {'running': False, 'swaps': 0}
+
+class LODOperator(bpy.types.Operator):
+    bl_idname = "reynolds.of_lod_op"
+    bl_label = "Level Of Detail"
+
+    _timer = None
+
+    def modal(self, context, event):
+        if not lod_stats['running']:
+            self.cancel(context)
+            return {'CANCELLED'}
+
+        if event.type == 'TIMER':
+            scene = context.scene
+            view_location = _view_location(context)
+            for obj in scene.objects:
+                if 'lod_meshes' not in obj:
+                    continue
+                if scene.lod_mode == 'Distance' and view_location is not None:
+                    level = distance_level(obj, view_location,
+                                           scene.lod_distance)
+                else:
+                    level = scene.lod_quality
+                if set_lod_level(obj, level):
+                    lod_stats['swaps'] += 1
+
+        return {'PASS_THROUGH'}
+
+    def execute(self, context):
+        # the button toggles the updater
+        if lod_stats['running']:
+            lod_stats['running'] = False
+            return {'FINISHED'}
+        lod_stats['running'] = True
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.25, context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def cancel(self, context):
+        context.window_manager.event_timer_remove(self._timer)
+        lod_stats['running'] = False
+
+# ------------------------------------------------------------------------
+# register and unregister
+# ------------------------------------------------------------------------
+
+def register():
+    lod_stats['running'] = False
+    register_classes(__name__)
+    set_scene_attrs('lod.yaml')
+
+def unregister():
+    unregister_classes(__name__)
+    del_scene_attrs('lod.yaml')
+
+if __name__ == "__main__":
+    register()
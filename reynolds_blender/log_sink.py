@@ -0,0 +1,146 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import re
+import threading
+import time
+from collections import deque
+
+# ------------------------------------------------------------------------
+#    command output sink
+# ------------------------------------------------------------------------
+
+# write buffer of the log file
+LOG_BUFFER_SIZE = 1 << 16
+
+# output lines starting with this are always reported
+STAGE_PREFIX = '==> '
+
+_problem_re = re.compile(r'FOAM FATAL|\*\*\*|\b(ERROR|Error|WARNING|Warning)\b')
+_error_re = re.compile(r'FATAL|ERROR|Error')
+
+def log_name(runner):
+    """ Name of the command whose output the runner produces; for mpirun
+    that is the application after the -np option. """
+    cmd_name = getattr(runner, 'cmd_name', 'cmd')
+    flags = list(getattr(runner, 'cmd_flags', None) or [])
+    if cmd_name == 'mpirun' and '-np' in flags:
+        i = flags.index('-np') + 2
+        if i < len(flags):
+            return flags[i]
+    return cmd_name
+
+class OutputSink(object):
+    """ Collects a command's output.
+
+    Every line goes to case_dir/log.<cmd> through a buffered file and into
+    a ring buffer of the last tail_lines lines. Only warnings, errors and a
+    progress line every progress_interval seconds are queued for the UI,
+    which takes at most max_reports of them per call to take_reports and
+    is told how many more it skipped. Stage lines, which start with
+    STAGE_PREFIX, are always queued.
+
+    write is called on the thread reading the command, take_reports and
+    tail on the UI thread, and close on either, while write may still run
+    if an operator is cancelled.
+    """
+
+    def __init__(self, case_dir, cmd_name, tail_lines=200,
+                 progress_interval=1.0, max_reports=20):
+        self.cmd_name = cmd_name
+        self.log_path = None
+        self.line_count = 0
+        self.progress_interval = progress_interval
+        self.max_reports = max_reports
+        self.skipped = 0
+        self._tail = deque(maxlen=max(tail_lines, 0))
+        self._reports = deque()
+        self._lock = threading.Lock()
+        self._last_progress = time.monotonic()
+        self._log = None
+        if case_dir and os.path.isdir(case_dir):
+            self.log_path = os.path.join(case_dir, 'log.' + cmd_name)
+            self._log = open(self.log_path, 'w', buffering=LOG_BUFFER_SIZE)
+
+    @classmethod
+    def for_runner(cls, runner, **kwargs):
+        return cls(getattr(runner, 'case_dir', None), log_name(runner),
+                   **kwargs)
+
+    def write(self, line):
+        line = line.rstrip('\n')
+        self.line_count += 1
+        with self._lock:
+            if self._log:
+                self._log.write(line)
+                self._log.write('\n')
+            self._tail.append(line)
+        if line.startswith(STAGE_PREFIX):
+            self._reports.append(('INFO', line))
+            return
+        if _problem_re.search(line):
+            level = 'ERROR' if _error_re.search(line) else 'WARNING'
+            self._reports.append((level, line))
+            return
+        now = time.monotonic()
+        if now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            self._reports.append(('INFO', '%s [%d]: %s' %
+                                  (self.cmd_name, self.line_count, line)))
+
+    def take_reports(self):
+        """ The queued reports, at most max_reports of them. """
+        reports = []
+        while self._reports and len(reports) < self.max_reports:
+            reports.append(self._reports.popleft())
+        # drop what is left rather than flood the UI, it is in the log
+        dropped = len(self._reports)
+        for i in range(dropped):
+            self._reports.popleft()
+        if dropped:
+            self.skipped += dropped
+            reports.append(('WARNING', '%s: %d more messages in %s' %
+                            (self.cmd_name, dropped,
+                             self.log_path or 'the output')))
+        return reports
+
+    def tail(self, count=None):
+        with self._lock:
+            lines = list(self._tail)
+        if count is not None:
+            lines = lines[-count:]
+        return lines
+
+    def close(self):
+        with self._lock:
+            if self._log:
+                self._log.close()
+                self._log = None
@@ -0,0 +1,87 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# -----------
+# bpy imports
+# -----------
+import bpy
+
+# --------------
+# python imports
+# --------------
+import numpy as np
+
+# ------------------------------------------------------------------------
+#    build blender meshes straight from numpy arrays
+# ------------------------------------------------------------------------
+
+def create_polygon_mesh(name, vertices, loops, sizes, edges=None):
+    """ Mesh from (n, 3) vertices, the flat vertex indices of its polygons
+    and the vertex count of each polygon, plus optional (k, 2) loose
+    edges. Filled with foreach_set instead of per element python calls. """
+    vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+    loops = np.ascontiguousarray(loops, dtype=np.int32)
+    sizes = np.ascontiguousarray(sizes, dtype=np.int32)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set('co', vertices.ravel())
+    if edges is not None and len(edges):
+        edges = np.ascontiguousarray(edges, dtype=np.int32)
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set('vertices', edges.ravel())
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set('vertex_index', loops)
+    mesh.polygons.add(len(sizes))
+    loop_start = np.zeros(len(sizes), dtype=np.int32)
+    np.cumsum(sizes[:-1], out=loop_start[1:])
+    mesh.polygons.foreach_set('loop_start', loop_start)
+    mesh.polygons.foreach_set('loop_total', sizes)
+    mesh.update(calc_edges=True)
+    mesh.validate()
+    return mesh
+
+def create_mesh(name, vertices, triangles):
+    """ Mesh from (n, 3) vertices and (m, 3) vertex indices. """
+    triangles = np.asarray(triangles)
+    return create_polygon_mesh(name, vertices, triangles.ravel(),
+                               np.full(len(triangles), 3, dtype=np.int32))
+
+def link_mesh_object(scene, name, mesh):
+    """ Link a new object for the mesh into the scene and make it the
+    active, selected object, like the stock importers do. """
+    obj = bpy.data.objects.new(name, mesh)
+    scene.objects.link(obj)
+    for o in scene.objects:
+        o.select = False
+    obj.select = True
+    scene.objects.active = obj
+    return obj
+
+def create_mesh_object(scene, name, vertices, triangles):
+    return link_mesh_object(scene, name,
+                            create_mesh(name, vertices, triangles))
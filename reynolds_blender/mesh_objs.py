@@ -61,6 +61,18 @@ from reynolds_blender.gui.register import register_classes, unregister_classes
 from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
 from reynolds_blender.gui.custom_operator import create_custom_operators
 from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.cmd_job import run_foam_cmd
+from reynolds_blender.obj_io import read_obj, obj_to_blender
+from reynolds_blender.mesh_builder import (create_polygon_mesh,
+                                           link_mesh_object)
+from reynolds_blender.polymesh_io import (ArrayCache, foam_file_path,
+                                          read_points, read_faces,
+                                          read_labels, read_boundary,
+                                          read_cell_zones, read_mesh_size,
+                                          patch_faces, zone_faces,
+                                          select_faces)
+from reynolds_blender.extents import foam_points
+from reynolds_blender.lod import build_lod_levels, remove_lod_levels
 
 # ----------------
 # reynolds imports
@@ -72,17 +84,18 @@ from reynolds.foam.cmd_runner import FoamCmdRunner
 #    operators
 # ------------------------------------------------------------------------
 
-def load_mesh_objs(self, context):
+def start_load_mesh_objs(self, context):
     print ('load list of mesh objs from case dir')
 
     scene = context.scene
     case_dir = bpy.path.abspath(scene.case_dir_path)
-    wmr = FoamCmdRunner(cmd_name='writeMeshObj', case_dir=case_dir)
+    return FoamCmdRunner(cmd_name='writeMeshObj', case_dir=case_dir)
 
-    for info in wmr.run():
-        self.report({'WARNING'}, info)
+def finish_load_mesh_objs(self, context, run_status):
+    scene = context.scene
+    case_dir = bpy.path.abspath(scene.case_dir_path)
 
-    if wmr.run_status:
+    if run_status:
         index = 0
         item_coll = scene.mesh_objs
         item_idx = scene.mesh_rindex
@@ -98,7 +111,9 @@ def load_mesh_objs(self, context):
     else:
         self.report({'INFO'}, 'Could not generate mesh objs')
 
-    return {'FINISHED'}
+def load_mesh_objs(self, context):
+    return run_foam_cmd(self, context, start_load_mesh_objs,
+                        finish_load_mesh_objs)
 
 def show_mesh_obj(self, context):
     print("Showing mesh obj")
@@ -111,10 +126,191 @@ def show_mesh_obj(self, context):
 
     case_dir = bpy.path.abspath(scene.case_dir_path)
     obj_file_path = case_dir + item.name
-    bpy.ops.import_scene.obj(filepath=obj_file_path)
+    load_obj_mesh(scene, obj_file_path, self)
 
     return{'FINISHED'}
 
+# ---------------------------------------------------------------------
+# polyMesh patches and cell zones, loaded one at a time when shown
+# ---------------------------------------------------------------------
+
+# decoded points, faces and parts of the meshes viewed recently, the
+# budget is set from scene.mesh_cache_budget before each use
+polymesh_cache = ArrayCache(256 * 1024 * 1024)
+
+def _polymesh_dir(scene):
+    case_dir = bpy.path.abspath(scene.case_dir_path)
+    return os.path.join(case_dir, 'constant', 'polyMesh')
+
+def _mesh_stamp(polymesh_dir):
+    # every mesh run rewrites faces, which retires all cached parts
+    return str(os.stat(foam_file_path(polymesh_dir, 'faces')).st_mtime_ns)
+
+def _cached(polymesh_dir, key, load):
+    stamp = _mesh_stamp(polymesh_dir)
+    # parts of an older mesh of this case are never used again
+    polymesh_cache.retain(lambda cached: (cached[0] != polymesh_dir or
+                                          cached[1] == stamp))
+    return polymesh_cache.get((polymesh_dir, stamp) + key, load)
+
+def _mesh_points_faces(polymesh_dir):
+    points, = _cached(polymesh_dir, ('points',),
+                      lambda: (read_points(polymesh_dir),))
+    faces = _cached(polymesh_dir, ('faces',),
+                    lambda: read_faces(polymesh_dir))
+    return points, faces
+
+def _show_mesh_part(self, scene, name, stamp, part):
+    obj = scene.objects.get(name, None)
+    if obj is not None and obj.get('polymesh_stamp', None) == stamp:
+        for o in scene.objects:
+            o.select = False
+        obj.select = True
+        scene.objects.active = obj
+        return obj
+    if obj is not None and 'polymesh_stamp' in obj:
+        # shown from an older mesh
+        remove_lod_levels(obj)
+        scene.objects.unlink(obj)
+        bpy.data.objects.remove(obj)
+    vertices, loops, sizes = part
+    vertices = foam_points(vertices)
+    mesh = create_polygon_mesh(name, vertices, loops, sizes)
+    obj = link_mesh_object(scene, name, mesh)
+    obj['polymesh_stamp'] = stamp
+    _build_lod(self, scene, obj, vertices, loops, sizes)
+    return obj
+
+def _build_lod(self, scene, obj, vertices, loops, sizes):
+    if not scene.lod_enabled:
+        return
+    counts = build_lod_levels(scene, obj, vertices, loops, sizes)
+    self.report({'INFO'}, obj.name + ' triangles per level: ' +
+                ', '.join('L%d %d' % (level, count)
+                          for level, count in enumerate(counts)))
+
+def list_polymesh_parts(self, context):
+    scene = context.scene
+    polymesh_dir = _polymesh_dir(scene)
+
+    if not os.path.exists(foam_file_path(polymesh_dir, 'boundary')):
+        self.report({'ERROR'}, 'No polyMesh in case dir, please run blockMesh')
+        return {'FINISHED'}
+
+    # the list items keep the face count of a patch, the cell count of a
+    # zone, in their id
+    scene.mesh_patches.clear()
+    for patch in read_boundary(polymesh_dir):
+        item = scene.mesh_patches.add()
+        item.name = patch['name']
+        item.id = patch['nFaces']
+    scene.mesh_zones.clear()
+    for zone in read_cell_zones(polymesh_dir, labels=False):
+        item = scene.mesh_zones.add()
+        item.name = zone['name']
+        item.id = zone['nCells']
+    scene.mesh_patch_index = 0
+    scene.mesh_zone_index = 0
+    self.report({'INFO'}, 'Found %d patches, %d cell zones' %
+                (len(scene.mesh_patches), len(scene.mesh_zones)))
+
+    return {'FINISHED'}
+
+def show_polymesh_patch(self, context):
+    scene = context.scene
+    polymesh_dir = _polymesh_dir(scene)
+    polymesh_cache.budget = scene.mesh_cache_budget * 1024 * 1024
+
+    if len(scene.mesh_patches) == 0:
+        self.report({'ERROR'}, 'Please list the polyMesh patches')
+        return {'FINISHED'}
+    name = scene.mesh_patches[scene.mesh_patch_index].name
+
+    def load():
+        for patch in read_boundary(polymesh_dir):
+            if patch['name'] == name:
+                points, faces = _mesh_points_faces(polymesh_dir)
+                return patch_faces(points, faces, patch['startFace'],
+                                   patch['nFaces'])
+        return None
+
+    part = _cached(polymesh_dir, ('patch', name), load)
+    if part is None:
+        self.report({'ERROR'}, 'No patch ' + name + ', please list again')
+        return {'FINISHED'}
+    _show_mesh_part(self, scene, name, _mesh_stamp(polymesh_dir), part)
+    print('polyMesh cache: ', len(polymesh_cache), ' entries ',
+          polymesh_cache.size, ' bytes')
+
+    return {'FINISHED'}
+
+def show_polymesh_zone(self, context):
+    scene = context.scene
+    polymesh_dir = _polymesh_dir(scene)
+    polymesh_cache.budget = scene.mesh_cache_budget * 1024 * 1024
+
+    if len(scene.mesh_zones) == 0:
+        self.report({'ERROR'}, 'Please list the polyMesh cell zones')
+        return {'FINISHED'}
+    name = scene.mesh_zones[scene.mesh_zone_index].name
+
+    def load():
+        for zone in read_cell_zones(polymesh_dir):
+            if zone['name'] == name:
+                points, faces = _mesh_points_faces(polymesh_dir)
+                owner, = _cached(polymesh_dir, ('owner',),
+                                 lambda: (read_labels(polymesh_dir,
+                                                      'owner'),))
+                neighbour, = _cached(polymesh_dir, ('neighbour',),
+                                     lambda: (read_labels(polymesh_dir,
+                                                          'neighbour'),))
+                n_cells = read_mesh_size(polymesh_dir).get(
+                    'nCells', int(owner.max()) + 1)
+                face_ids = zone_faces(owner, neighbour, zone['cellLabels'],
+                                      n_cells)
+                return select_faces(points, faces, face_ids)
+        return None
+
+    part = _cached(polymesh_dir, ('zone', name), load)
+    if part is None:
+        self.report({'ERROR'}, 'No cell zone ' + name + ', please list again')
+        return {'FINISHED'}
+    _show_mesh_part(self, scene, name, _mesh_stamp(polymesh_dir), part)
+
+    return {'FINISHED'}
+
+def load_obj_mesh(scene, obj_file_path, operator=None):
+    """ Load a writeMeshObj file through the chunked OBJ reader, which
+    scales to meshes the stock importer takes minutes on. """
+    vertices, loops, sizes, edges = read_obj(obj_file_path)
+    print('Loaded ', len(vertices), ' vertices ', len(sizes), ' faces ',
+          len(edges), ' edges')
+    name = os.path.splitext(os.path.basename(obj_file_path))[0]
+    vertices = obj_to_blender(vertices)
+    mesh = create_polygon_mesh(name, vertices, loops, sizes, edges)
+    obj = link_mesh_object(scene, name, mesh)
+    if operator is not None and len(sizes):
+        _build_lod(operator, scene, obj, vertices, loops, sizes)
+    return obj
+
+# ------------------------------------------------------------------------
+#    Lists
+# ------------------------------------------------------------------------
+
+class ReynoldsMeshPatchItems(UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data,
+                  active_propname, index):
+        split = layout.split(0.6)
+        split.label(item.name, icon='MESH_PLANE')
+        split.label('%d faces' % item.id)
+
+class ReynoldsMeshZoneItems(UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data,
+                  active_propname, index):
+        split = layout.split(0.6)
+        split.label(item.name, icon='MESH_CUBE')
+        split.label('%d cells' % item.id)
+
 # ------------------------------------------------------------------------
 #    Panel
 # ------------------------------------------------------------------------
@@ -139,7 +335,6 @@ class ShowMeshObjOperator(bpy.types.Operator):
         return True
 
     def invoke(self, context, event):
-        load_mesh_objs(self, context)
         return context.window_manager.invoke_props_dialog(self, width=500)
 
     def draw(self, context):
@@ -63,6 +63,11 @@ from reynolds_blender.gui.custom_operator import create_custom_operators
 from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
 from reynolds_blender.sphere import SearchableSphereAddOperator
 from reynolds_blender.add_block import BlockMeshAddOperator
+from reynolds_blender.extents import (world_centre, world_size,
+                                      stl_to_blender)
+from reynolds_blender.stl_io import stl_stats, iter_triangles
+from reynolds_blender.decimate import decimate_to_budget, box_triangles
+from reynolds_blender.mesh_builder import create_mesh_object
 
 # ----------------
 # reynolds imports
@@ -74,22 +79,45 @@ from reynolds.foam.cmd_runner import FoamCmdRunner
 #    operators
 # ------------------------------------------------------------------------
 
+def import_stl_proxy(scene, file_path):
+    """ Show a decimated or bounding box stand in for the STL file, the
+    file itself is what gets meshed. """
+    stats = stl_stats(file_path)
+    if scene.import_mode == 'BoundingBox':
+        vertices, triangles = box_triangles(stats['min'], stats['max'])
+    else:
+        vertices, triangles = decimate_to_budget(
+            lambda: iter_triangles(file_path), stats['min'], stats['max'],
+            stats['triangles'], scene.proxy_triangle_budget)
+    print('STL proxy: ', stats['triangles'], ' -> ', len(triangles),
+          ' triangles')
+    name = bpy.path.display_name(os.path.basename(file_path))
+    return create_mesh_object(scene, name, stl_to_blender(vertices),
+                              triangles)
+
 def import_stl(self, context):
     scene = context.scene
-    bpy.ops.import_mesh.stl(filepath=scene.stl_file_path,
-                            axis_forward='Z',
-                            axis_up='Y')
-    obj = scene.objects.active
+    if scene.import_mode == 'Full':
+        bpy.ops.import_mesh.stl(filepath=scene.stl_file_path,
+                                axis_forward='Z',
+                                axis_up='Y')
+        obj = scene.objects.active
+    else:
+        obj = import_stl_proxy(scene, bpy.path.abspath(scene.stl_file_path))
     print('active objects after import ', obj)
     # -------------------------------------------------------------
     # TBD : OBJ IS NONE, if multiple objects are added after import
     # -------------------------------------------------------------
     scene.geometries[obj.name] = {'file_path': scene.stl_file_path}
+    obj['stl_file_path'] = bpy.path.abspath(scene.stl_file_path)
     print('STL IMPORT: ', scene.geometries)
     return {'FINISHED'}
 
 def import_obj(self, context):
     scene = context.scene
+    if scene.import_mode != 'Full':
+        self.report({'WARNING'}, 'Proxy import supports STL files only, '
+                    'importing the full OBJ')
     bpy.ops.import_scene.obj(filepath=scene.obj_file_path)
     obj = scene.objects.active
     print('active objects after import ', obj)
@@ -105,7 +133,6 @@ def import_obj(self, context):
 
 def add_geometry_block(self, context):
     scene = context.scene
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
     obj = scene.objects.active
 
     # -------------------------
@@ -116,12 +143,17 @@ def add_geometry_block(self, context):
     if obj is None:
         self.report({'ERROR'}, 'Please select a geometry')
         return {'FINISHED'}
+
+    # an imported geometry's extent comes from its STL file until the
+    # origin moves, so take it first
+    dims = world_size(obj)
+    centre = world_centre(obj)
+    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
     bpy.ops.mesh.primitive_cube_add()
     bound_box = bpy.context.active_object
 
-    dims = obj.dimensions
-    bound_box.dimensions = Vector((dims.x * 1.5, dims.y * 1.5, dims.z * 1.2))
-    bound_box.location = obj.location
+    bound_box.dimensions = Vector((dims[0] * 1.5, dims[1] * 1.5, dims[2] * 1.2))
+    bound_box.location = Vector(centre)
     bpy.ops.object.transform_apply(location=True,
                                    rotation=True,
                                    scale=True)
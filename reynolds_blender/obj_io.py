@@ -0,0 +1,136 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import mmap
+import os
+import re
+
+import numpy as np
+
+# ------------------------------------------------------------------------
+#    memory mapped OBJ reader, parses in chunks into numpy arrays
+# ------------------------------------------------------------------------
+
+READ_SIZE = 64 * 1024 * 1024
+
+_vertex_re = re.compile(rb'^v[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)', re.MULTILINE)
+_face_re = re.compile(rb'^f[ \t]+([^\r\n]*)', re.MULTILINE)
+_line_re = re.compile(rb'^l[ \t]+([^\r\n]*)', re.MULTILINE)
+# texture and normal indices of v/vt/vn face tokens
+_face_extra_re = re.compile(rb'/[^ \t]*')
+
+def _iter_blocks(file_path):
+    """ Yield blocks of about READ_SIZE bytes that end at a line end. """
+    if os.path.getsize(file_path) == 0:
+        return
+    with open(file_path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            start = 0
+            size = len(mm)
+            while start < size:
+                end = mm.find(b'\n', min(start + READ_SIZE, size - 1))
+                end = size if end == -1 else end + 1
+                yield mm[start:end]
+                start = end
+        finally:
+            mm.close()
+
+def _indices(text, n_vertices):
+    indices = np.fromstring(text, dtype=np.int64, sep=' ')
+    # obj indices are 1 based, negative ones count back from the last
+    # vertex read so far, n_vertices may hold that count per index
+    return np.where(indices > 0, indices - 1, indices + n_vertices)
+
+def _vertex_counts(block, pattern, n_before):
+    """ Vertices read before each match of pattern in block. """
+    vertex_starts = [m.start() for m in _vertex_re.finditer(block)]
+    starts = [m.start() for m in pattern.finditer(block)]
+    return n_before + np.searchsorted(vertex_starts, starts)
+
+def read_obj(file_path):
+    """ Read the vertices, polygons and loose edges of an OBJ file.
+
+    Returns (vertices, loops, sizes, edges): (n, 3) float64 vertices in the
+    file's axes, the flat vertex indices of all polygons, the vertex count
+    of each polygon and (k, 2) edge vertex indices from 'l' lines.
+    """
+    vertex_parts = []
+    loop_parts = []
+    size_parts = []
+    edge_parts = []
+    n_vertices = 0
+    for block in _iter_blocks(file_path):
+        n_before = n_vertices
+        found = _vertex_re.findall(block)
+        if found:
+            vertices = np.array(found, dtype=np.bytes_).astype(np.float64)
+            vertex_parts.append(vertices)
+            n_vertices += len(vertices)
+
+        faces = _face_re.findall(block)
+        if faces:
+            if b'/' in block:
+                faces = [_face_extra_re.sub(b'', face) for face in faces]
+            sizes = np.array([len(face.split()) for face in faces],
+                             dtype=np.int32)
+            text = b' '.join(faces)
+            counts = n_vertices
+            if b'-' in text:
+                # relative indices count back from the vertices read
+                # before their own face, not from those of the block
+                counts = np.repeat(_vertex_counts(block, _face_re,
+                                                  n_before), sizes)
+            loop_parts.append(_indices(text, counts))
+            size_parts.append(sizes)
+
+        lines = _line_re.findall(block)
+        counts = [n_vertices] * len(lines)
+        if any(b'-' in line for line in lines):
+            counts = _vertex_counts(block, _line_re, n_before)
+        for line, count in zip(lines, counts):
+            polyline = _indices(_face_extra_re.sub(b'', line), count)
+            edge_parts.append(np.column_stack((polyline[:-1], polyline[1:])))
+
+    def join(parts, shape, dtype):
+        if not parts:
+            return np.empty(shape, dtype=dtype)
+        return np.concatenate(parts).astype(dtype, copy=False)
+
+    return (join(vertex_parts, (0, 3), np.float64),
+            join(loop_parts, (0,), np.int32),
+            join(size_parts, (0,), np.int32),
+            join(edge_parts, (0, 2), np.int32))
+
+def obj_to_blender(points):
+    """ (n, 3) OBJ file points placed the way the stock OBJ importer
+    places them, which maps the file's (x, y, z) to (x, -z, y). """
+    points = np.asarray(points)
+    return np.column_stack((points[:, 0], -points[:, 2], points[:, 1]))
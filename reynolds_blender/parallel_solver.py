@@ -50,6 +50,7 @@ from mathutils import Matrix, Vector
 # --------------
 # python imports
 # --------------
+import multiprocessing
 import operator
 import os
 
@@ -61,6 +62,13 @@ from reynolds_blender.gui.register import register_classes, unregister_classes
 from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
 from reynolds_blender.gui.custom_operator import create_custom_operators
 from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.case_writer import write_case_dict
+from reynolds_blender.builders.mesh_dicts import build_decompose_par_dict
+from reynolds_blender.builders.snapshot import scene_settings
+from reynolds_blender.decompose_planner import plan_decomposition
+from reynolds_blender.extents import foam_extent
+from reynolds_blender.launch_profiles import (launch_flags, launch_problem,
+                                              profile_hosts, total_slots)
 
 # ----------------
 # reynolds imports
@@ -68,6 +76,98 @@ from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
 from reynolds.dict.parser import ReynoldsFoamDict
 from reynolds.foam.cmd_runner import FoamCmdRunner
 
+# ------------------------------------------------------------------------
+#    operators
+# ------------------------------------------------------------------------
+
+def _launch_option(value):
+    return '' if value == 'default' else value
+
+def scene_launch_profile(scene):
+    """ The launch settings of the solver panel as a launch profile. """
+    return {'hostfile': bpy.path.abspath(scene.machines_file_path),
+            'bind_to': _launch_option(scene.launch_bind_to),
+            'map_by': _launch_option(scene.launch_map_by),
+            'oversubscribe': scene.launch_oversubscribe,
+            'local': scene.launch_local,
+            'extra_flags': scene.launch_extra_flags}
+
+def check_launch(self, scene, np):
+    """ Report and return False if np processes cannot be launched. """
+    problem = launch_problem(scene_launch_profile(scene), np)
+    if problem:
+        self.report({'ERROR'}, problem)
+        return False
+    return True
+
+def mpirun_flags(scene, np, app_flags):
+    """ mpirun flags running app_flags on np processes with the launch
+    settings of the solver panel. """
+    case_dir = bpy.path.abspath(scene.case_dir_path)
+    cmd_flags = launch_flags(scene_launch_profile(scene), np, app_flags,
+                             case_dir)
+    print('mpirun ' + ' '.join(cmd_flags))
+    return cmd_flags
+
+def available_cores(scene):
+    """ The configured cores, else the slots of the machines file, else
+    the cores of this machine. """
+    slots = total_slots(profile_hosts(scene_launch_profile(scene)))
+    return scene.decompose_cores or slots or multiprocessing.cpu_count()
+
+def plan_case_decomposition(self, context):
+    """ Set the number of subdomains and the simple and hierarchical n
+    vectors from the mesh size and the cores available. """
+    scene = context.scene
+    obj = context.active_object
+    case_dir = bpy.path.abspath(scene.case_dir_path)
+
+    # without a mesh yet, the block object gives the domain shape
+    extent = None
+    if obj is not None and obj.type == 'MESH':
+        extent = foam_extent(obj)
+    plan = plan_decomposition(case_dir, scene.decompose_cells_per_core,
+                              available_cores(scene), extent)
+
+    nx, ny, nz = plan['n']
+    scene.number_of_subdomains = plan['subdomains']
+    scene.nSimpleCoeffsX = scene.nHierarchicalCoeffsX = nx
+    scene.nSimpleCoeffsY = scene.nHierarchicalCoeffsY = ny
+    scene.nSimpleCoeffsZ = scene.nHierarchicalCoeffsZ = nz
+
+    cells = 'unknown' if plan['cells'] is None else str(plan['cells'])
+    self.report({'INFO'}, 'Decomposition: %d subdomains (%d %d %d) for %s '
+                'cells' % (plan['subdomains'], nx, ny, nz, cells))
+    return {'FINISHED'}
+
+def generate_decompose_par_dict(self, context):
+    scene = context.scene
+    # -------------------------
+    # Start the console operatorr
+    # --------------------------
+    bpy.ops.reynolds.of_console_op()
+
+    if scene.decompose_auto:
+        plan_case_decomposition(self, context)
+
+    print('Generate decomposeParDict parallel config: ')
+
+    data_file_path = None
+    if scene.manual_datafile_path:
+        data_file_path = bpy.path.abspath(scene.manual_datafile_path)
+    decompose_par_dict = build_decompose_par_dict(scene_settings(scene),
+                                                  data_file_path)
+
+    print("DECOMPOSE PAR DICT")
+    print(decompose_par_dict)
+
+    abs_case_dir_path = bpy.path.abspath(scene.case_dir_path)
+    write_case_dict(self, abs_case_dir_path, "system", "decomposeParDict",
+                    decompose_par_dict)
+
+    return {'FINISHED'}
+
+
 # ------------------------------------------------------------------------
 #    Operator Panel
 # ------------------------------------------------------------------------
@@ -92,59 +192,7 @@ class ParallelSolverOperator(bpy.types.Operator):
         return context.window_manager.invoke_props_dialog(self, width=750)
 
     def execute(self, context):
-        scene = context.scene
-        # -------------------------
-        # Start the console operatorr
-        # --------------------------
-        bpy.ops.reynolds.of_console_op()
-
-        print('Generate decomposeParDict parallel config: ')
-
-        decompose_par_dict = ReynoldsFoamDict('decomposeParDict.foam')
-
-        # mandatory
-        decompose_par_dict['numberOfSubdomains'] = scene.number_of_subdomains
-        decompose_par_dict['method'] = scene.decompose_method
-
-        # simpleCoeffs
-        simple_nxyz = (str(scene.nSimpleCoeffsX),
-                       str(scene.nSimpleCoeffsY),
-                       str(scene.nSimpleCoeffsZ))
-        decompose_par_dict['simpleCoeffs']['n'] = '(' + ' '.join(simple_nxyz) + ')'
-        decompose_par_dict['simpleCoeffs']['delta'] = scene.simpleCoeffDelta
-
-        # hierarchicalCoeffs
-        hierarchical_nxyz = (str(scene.nHierarchicalCoeffsX),
-                             str(scene.nHierarchicalCoeffsY),
-                             str(scene.nHierarchicalCoeffsZ))
-        decompose_par_dict['hierarchicalCoeffs']['n'] =  '(' + ' '.join(hierarchical_nxyz) + ')'
-        decompose_par_dict['hierarchicalCoeffs']['delta'] = scene.hierarchicalCoeffDelta
-        decompose_par_dict['hierarchicalCoeffs']['order'] = scene.order_of_decomposition
-
-        # metisCoeffs
-        decompose_par_dict['metisCoeffs']['processorWeights'] = scene.metisCoeffs_processor_weights
-        decompose_par_dict['metisCoeffs']['strategy'] = scene.metisCoeffs_strategy
-
-        # manualCoeffs
-        if scene.manual_datafile_path:
-            data_file_path = bpy.path.abspath(scene.manual_datafile_path)
-            decompose_par_dict['manualCoeffs']['datafile'] = """ '"{}"' """.format(data_file_path)
-
-
-        print("DECOMPOSE PAR DICT")
-        print(decompose_par_dict)
-
-        abs_case_dir_path = bpy.path.abspath(scene.case_dir_path)
-        system_dir = os.path.join(abs_case_dir_path, "system")
-        if not os.path.exists(system_dir):
-            os.makedirs(system_dir)
-
-        dpd_file_path = os.path.join(system_dir, "decomposeParDict")
-        with open(dpd_file_path, "w") as f:
-            f.write(str(decompose_par_dict))
-
-
-        return {'FINISHED'}
+        return generate_decompose_par_dict(self, context)
 
     def draw(self, context):
         layout = self.layout
@@ -165,6 +213,7 @@ class ParallelSolverOperator(bpy.types.Operator):
 def register():
     register_classes(__name__)
     set_scene_attrs('parallel_solver.yaml')
+    create_custom_operators('parallel_solver.yaml', __name__)
 
 def unregister():
     del_scene_attrs('parallel_solver.yaml')
@@ -0,0 +1,254 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# -----------
+# bpy imports
+# -----------
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import Panel
+
+# --------------
+# python imports
+# --------------
+import os
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+
+from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
+from reynolds_blender.gui.register import register_classes, unregister_classes
+from reynolds_blender.gui.custom_operator import create_custom_operators
+from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.block_mesh import (generate_blockmeshdict,
+                                         generate_time_props,
+                                         start_blockmesh, finish_blockmesh)
+from reynolds_blender.feature_extraction import (generate_surface_dict,
+                                                 start_extract_surface_features,
+                                                 finish_extract_surface_features)
+from reynolds_blender.snappy_hexmesh import (generate_snappyhexmeshdict,
+                                             start_snappyhexmesh,
+                                             finish_snappyhexmesh)
+from reynolds_blender.parallel_solver import generate_decompose_par_dict
+from reynolds_blender.solver import (start_decompose_par, finish_decompose_par,
+                                     start_solve_case, finish_solve_case,
+                                     start_reconstruct_par,
+                                     finish_reconstruct_par,
+                                     reconstruct_times)
+from reynolds_blender.cmd_job import run_foam_cmd_status
+from reynolds_blender.stage_runner import run_stages, BACKGROUND_MESH_DIR
+from reynolds_blender.builders.snapshot import (scene_snapshot, reset_snapshots,
+                                                TIME_DIR)
+
+# ------------------------------------------------------------------------
+#    stage inputs
+# ------------------------------------------------------------------------
+
+def _geometry_files(scene, case_dir):
+    return [info['file_path'] for info in scene.geometries.values()
+            if 'file_path' in info]
+
+def _time_files(scene, case_dir):
+    zero_dir = os.path.join(case_dir, '0')
+    if not os.path.isdir(zero_dir):
+        return []
+    return [os.path.join('0', f) for f in os.listdir(zero_dir)]
+
+def start_pipeline_reconstruct_par(self, context):
+    # a solver run rewrites times that may already be reconstructed, so
+    # reconstruct them all
+    return start_reconstruct_par(self, context, new_only=False)
+
+def run_stage(self, context, stage):
+    return run_foam_cmd_status(self, context, stage['start'], stage['finish'])
+
+def generate_solver_dicts(self, context):
+    bpy.ops.reynolds.of_fvschemes()
+    bpy.ops.reynolds.of_fvsolutionop()
+    bpy.ops.reynolds.of_controldict()
+    bpy.ops.reynolds.of_transportproperties()
+    generate_time_props(self, context)
+
+# ------------------------------------------------------------------------
+#    stage graph, in run order; a stage depends on every stage before it
+# ------------------------------------------------------------------------
+
+STAGES = [
+    {'name': 'blockMesh',
+     'generate': generate_blockmeshdict,
+     'start': start_blockmesh,
+     'finish': finish_blockmesh,
+     'inputs': lambda scene, case_dir: ['system/blockMeshDict'],
+     # the block extent is not a scene setting, generate it every run
+     'generates': None,
+     'outputs': ['constant/polyMesh/owner',
+                 os.path.join(BACKGROUND_MESH_DIR, 'owner')],
+     'enabled': lambda scene: True,
+     'mesh': 'save',
+     'flag': 'blockmesh_executed'},
+    {'name': 'surfaceFeatureExtract',
+     'generate': generate_surface_dict,
+     'start': start_extract_surface_features,
+     'finish': finish_extract_surface_features,
+     'inputs': lambda scene, case_dir: (['system/surfaceFeatureExtractDict'] +
+                                        _geometry_files(scene, case_dir)),
+     'generates': ['system/surfaceFeatureExtractDict'],
+     'outputs': ['constant/extendedFeatureEdgeMesh'],
+     'enabled': lambda scene: len(scene.geometries) > 0,
+     'flag': 'features_extracted'},
+    {'name': 'snappyHexMesh',
+     'generate': generate_snappyhexmeshdict,
+     'start': start_snappyhexmesh,
+     'finish': finish_snappyhexmesh,
+     'inputs': lambda scene, case_dir: ['system/snappyHexMeshDict'],
+     'generates': ['system/snappyHexMeshDict'],
+     'outputs': ['constant/polyMesh/owner'],
+     'enabled': lambda scene: len(scene.geometries) > 0,
+     'mesh': 'restore',
+     'flag': 'snappyhexmesh_executed'},
+    {'name': 'decomposePar',
+     'generate': generate_decompose_par_dict,
+     'start': start_decompose_par,
+     'finish': finish_decompose_par,
+     'inputs': lambda scene, case_dir: (['system/decomposeParDict'] +
+                                        _time_files(scene, case_dir)),
+     'generates': ['system/decomposeParDict'],
+     'outputs': ['processor0'],
+     'enabled': lambda scene: scene.solve_in_parallel,
+     'flag': None},
+    {'name': 'solver',
+     'generate': generate_solver_dicts,
+     'start': start_solve_case,
+     'finish': finish_solve_case,
+     'inputs': lambda scene, case_dir: (['system/controlDict',
+                                         'system/fvSchemes',
+                                         'system/fvSolution',
+                                         'constant/transportProperties'] +
+                                        _time_files(scene, case_dir)),
+     'generates': ['system/controlDict', 'system/fvSchemes',
+                   'system/fvSolution', 'constant/transportProperties',
+                   TIME_DIR],
+     'outputs': [],
+     'enabled': lambda scene: True,
+     'flag': 'case_solved'},
+    {'name': 'reconstructPar',
+     'generate': lambda self, context: None,
+     'start': start_pipeline_reconstruct_par,
+     'finish': finish_reconstruct_par,
+     'inputs': lambda scene, case_dir: [],
+     'generates': [],
+     'outputs': [],
+     # with no decomposed times there is nothing to do, which is no failure
+     'enabled': lambda scene: (scene.solve_in_parallel and
+                               len(reconstruct_times(scene, False)) > 0),
+     'flag': None},
+]
+
+# ------------------------------------------------------------------------
+#    operators
+# ------------------------------------------------------------------------
+
+def run_case_pipeline(self, context):
+    """ Run the pipeline stages on the scene's case, see run_stages.
+    Returns True if the pipeline completed. """
+    scene = context.scene
+    case_dir = bpy.path.abspath(scene.case_dir_path)
+
+    if case_dir is None or case_dir == '':
+        self.report({'ERROR'}, 'Please select a case directory')
+        return False
+
+    if not run_stages(self, context, STAGES, case_dir, run_stage,
+                      force=scene.pipeline_force,
+                      snapshot=scene_snapshot(scene)):
+        return False
+
+    self.report({'INFO'}, 'Pipeline : SUCCESS')
+    return True
+
+def run_pipeline(self, context):
+    run_case_pipeline(self, context)
+    return {'FINISHED'}
+
+# ------------------------------------------------------------------------
+#    Panel
+# ------------------------------------------------------------------------
+
+class PipelinePanel(Panel):
+    bl_idname = "of_pipeline_panel"
+    bl_label = "Pipeline"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "TOOLS"
+    bl_category = "Tools"
+    bl_context = "objectmode"
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        # -----------------------------------------
+        # Render Pipeline Panel using YAML GUI Spec
+        # -----------------------------------------
+
+        gui_renderer = ReynoldsGUIRenderer(scene, layout, 'pipeline.yaml')
+        gui_renderer.render()
+
+# ------------------------------------------------------------------------
+# undo, redo and loading a blend file change scene values without their
+# update callbacks, the snapshots are read again after them
+# ------------------------------------------------------------------------
+
+@persistent
+def reset_scene_snapshots(*args):
+    reset_snapshots()
+
+SNAPSHOT_HANDLERS = [bpy.app.handlers.load_post,
+                     bpy.app.handlers.undo_post,
+                     bpy.app.handlers.redo_post]
+
+# ------------------------------------------------------------------------
+# register and unregister
+# ------------------------------------------------------------------------
+
+def register():
+    register_classes(__name__)
+    set_scene_attrs('pipeline.yaml')
+    create_custom_operators('pipeline.yaml', __name__)
+    for handlers in SNAPSHOT_HANDLERS:
+        if reset_scene_snapshots not in handlers:
+            handlers.append(reset_scene_snapshots)
+
+def unregister():
+    unregister_classes(__name__)
+    del_scene_attrs('pipeline.yaml')
+    for handlers in SNAPSHOT_HANDLERS:
+        if reset_scene_snapshots in handlers:
+            handlers.remove(reset_scene_snapshots)
+
+if __name__ == "__main__":
+    register()
@@ -0,0 +1,312 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import gzip
+import mmap
+import os
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+# ------------------------------------------------------------------------
+#    OpenFoam polyMesh reader, ascii and binary, optionally gzipped
+# ------------------------------------------------------------------------
+
+_header_re = re.compile(rb'FoamFile\s*\{(.*?)\}', re.DOTALL)
+_entry_re = re.compile(rb'(\w+)\s+([^;]*);')
+_list_start_re = re.compile(rb'(\d+)\s*([({])')
+_list_end_re = re.compile(rb'\)\s*\)')
+_face_re = re.compile(rb'(\d+)\s*\(([^)]*)\)')
+_patch_re = re.compile(rb'(\S+)\s*\{([^}]*)\}')
+
+def foam_file_path(polymesh_dir, name):
+    """ Path of a polyMesh file, which OpenFoam may have gzipped. """
+    file_path = os.path.join(polymesh_dir, name)
+    if not os.path.exists(file_path) and os.path.exists(file_path + '.gz'):
+        return file_path + '.gz'
+    return file_path
+
+def read_foam_file(file_path):
+    """ Header entries of a foam file, its raw data and the offset at which
+    the data follows the header. Uncompressed files are memory mapped. """
+    if file_path.endswith('.gz'):
+        with gzip.open(file_path, 'rb') as f:
+            data = f.read()
+    else:
+        # binary lists are decoded as views of the mapped file, so only
+        # the pages a caller indexes are ever read
+        with open(file_path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    match = _header_re.search(data)
+    if match is None:
+        raise ValueError(file_path + ' has no FoamFile header')
+    header = {}
+    for key, value in _entry_re.findall(match.group(1)):
+        header[key.decode('ascii')] = value.strip().strip(b'"').decode('ascii')
+    return header, data, match.end()
+
+def _dtypes(header):
+    # arch reads like "LSB;label=32;scalar=64"
+    arch = header.get('arch', '')
+    label_bits = re.search(r'label=(\d+)', arch)
+    scalar_bits = re.search(r'scalar=(\d+)', arch)
+    order = '>' if arch.startswith('MSB') else '<'
+    label = np.dtype(order + 'i' + str(int(label_bits.group(1)) // 8
+                                       if label_bits else 4))
+    scalar = np.dtype(order + 'f' + str(int(scalar_bits.group(1)) // 8
+                                        if scalar_bits else 8))
+    return label, scalar
+
+def _read_list(header, data, pos, kind):
+    """ Read a label, scalar, vector or face list starting at or after pos.
+    Returns the decoded array and the offset just past the list. """
+    match = _list_start_re.search(data, pos)
+    n = int(match.group(1))
+    label, scalar = _dtypes(header)
+    dtype = label if kind in ('label', 'face') else scalar
+    width = 3 if kind == 'vector' else 1
+
+    if match.group(2) == b'{':
+        # uniform list, n copies of one value
+        end = data.find(b'}', match.end())
+        value = np.fromstring(data[match.end():end].translate(None, b'()'),
+                              dtype=dtype, sep=' ')
+        if width == 3:
+            return np.tile(value, (n, 1)), end + 1
+        return np.full(n, value[0], dtype=dtype), end + 1
+
+    start = match.end()
+    if header.get('format', 'ascii') == 'binary' and kind != 'face':
+        values = np.frombuffer(data, dtype=dtype, count=n * width,
+                               offset=start)
+        end = start + values.nbytes + 1
+        return values.reshape(n, 3) if width == 3 else values, end
+
+    if n == 0:
+        # numpy parses blank text as a single zero
+        end = data.find(b')', start) + 1
+        if kind == 'face':
+            return (np.zeros(0, dtype=dtype),
+                    np.zeros(1, dtype=np.int64)), end
+        return np.zeros((0, 3) if width == 3 else 0, dtype=dtype), end
+
+    if kind in ('label', 'scalar'):
+        end = data.find(b')', start)
+        values = np.fromstring(data[start:end], dtype=dtype, sep=' ')
+        return values, end + 1
+
+    end = _list_end_re.search(data, start).end()
+    body = data[start:end - 1]
+    if kind == 'vector':
+        values = np.fromstring(body.translate(None, b'()'), dtype=dtype,
+                               sep=' ')
+        return values.reshape(n, 3), end
+
+    # ascii faceList, n entries like 4(0 1 2 3)
+    faces = _face_re.findall(body)
+    sizes = np.array([int(size) for size, _ in faces], dtype=np.int64)
+    loops = np.fromstring(b' '.join(indices for _, indices in faces),
+                          dtype=dtype, sep=' ')
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    return (loops, offsets), end
+
+def read_points(polymesh_dir):
+    header, data, pos = read_foam_file(foam_file_path(polymesh_dir,
+                                                      'points'))
+    return _read_list(header, data, pos, 'vector')[0]
+
+def read_labels(polymesh_dir, name):
+    header, data, pos = read_foam_file(foam_file_path(polymesh_dir, name))
+    return _read_list(header, data, pos, 'label')[0]
+
+def read_faces(polymesh_dir):
+    """ All faces as (loops, offsets): face i has the point labels
+    loops[offsets[i]:offsets[i + 1]]. """
+    header, data, pos = read_foam_file(foam_file_path(polymesh_dir, 'faces'))
+    if header.get('class', '') == 'faceCompactList':
+        offsets, pos = _read_list(header, data, pos, 'label')
+        loops, pos = _read_list(header, data, pos, 'label')
+        return loops, offsets
+    return _read_list(header, data, pos, 'face')[0]
+
+def read_boundary(polymesh_dir):
+    """ Boundary patches in file order, as dicts with name, type, nFaces
+    and startFace. """
+    header, data, pos = read_foam_file(foam_file_path(polymesh_dir,
+                                                      'boundary'))
+    start = _list_start_re.search(data, pos).end()
+    patches = []
+    for name, body in _patch_re.findall(data[start:]):
+        entries = dict((key.decode('ascii'), value.strip().decode('ascii'))
+                       for key, value in _entry_re.findall(body))
+        patches.append({'name': name.decode('ascii'),
+                        'type': entries.get('type', 'patch'),
+                        'nFaces': int(entries.get('nFaces', 0)),
+                        'startFace': int(entries.get('startFace', 0))})
+    return patches
+
+def read_mesh_size(polymesh_dir):
+    """ nPoints, nCells, nFaces and nInternalFaces from the note OpenFoam
+    writes into the owner header, without reading the owner list. """
+    header, _, _ = read_foam_file(foam_file_path(polymesh_dir, 'owner'))
+    return dict((key, int(value)) for key, value in
+                re.findall(r'(\w+):\s*(\d+)', header.get('note', '')))
+
+def read_cell_zones(polymesh_dir, labels=True):
+    """ Cell zones in file order, as dicts with name, nCells and, if
+    labels is set, the cellLabels array. """
+    file_path = foam_file_path(polymesh_dir, 'cellZones')
+    if not os.path.exists(file_path):
+        return []
+    header, data, pos = read_foam_file(file_path)
+    pos = _list_start_re.search(data, pos).end()
+    zones = []
+    # zones are parsed one after the other, binary cellLabels may hold
+    # any byte, braces included
+    zone_re = re.compile(rb'\s*([^\s{}()]+)\s*\{')
+    while True:
+        match = zone_re.match(data, pos)
+        if match is None:
+            break
+        labels_pos = data.find(b'cellLabels', match.end())
+        count = _list_start_re.search(data, labels_pos)
+        zone = {'name': match.group(1).decode('ascii'),
+                'nCells': int(count.group(1))}
+        cell_labels, end = _read_list(header, data, labels_pos, 'label')
+        if labels:
+            zone['cellLabels'] = cell_labels
+        zones.append(zone)
+        pos = data.find(b'}', end) + 1
+    return zones
+
+def zone_faces(owner, neighbour, cell_labels, n_cells):
+    """ Faces on the surface of a cell zone: those with a zone cell on
+    exactly one side. """
+    in_zone = np.zeros(n_cells, dtype=bool)
+    in_zone[cell_labels] = True
+    owner_in = in_zone[owner]
+    neighbour_in = np.zeros(len(owner), dtype=bool)
+    neighbour_in[:len(neighbour)] = in_zone[neighbour]
+    return np.flatnonzero(owner_in != neighbour_in)
+
+def select_faces(points, faces, face_ids):
+    """ Vertices, flat loops and face sizes of the given faces, with the
+    points renumbered to the ones those faces use. """
+    loops, offsets = faces
+    starts = np.asarray(offsets[face_ids], dtype=np.int64)
+    sizes = np.asarray(offsets[face_ids + 1], dtype=np.int64) - starts
+    # index of every loop of the selected faces, face after face
+    firsts = np.zeros(len(sizes), dtype=np.int64)
+    np.cumsum(sizes[:-1], out=firsts[1:])
+    loop_ids = np.repeat(starts - firsts, sizes) + np.arange(sizes.sum())
+    used, local_loops = np.unique(loops[loop_ids], return_inverse=True)
+    return points[used], local_loops.ravel(), sizes
+
+def patch_faces(points, faces, start_face, n_faces):
+    """ Vertices, flat loops and face sizes of the faces
+    [start_face, start_face + n_faces), with the points renumbered to the
+    ones those faces use. """
+    loops, offsets = faces
+    first, last = offsets[start_face], offsets[start_face + n_faces]
+    patch_loops = loops[first:last]
+    sizes = np.diff(offsets[start_face:start_face + n_faces + 1])
+    used, local_loops = np.unique(patch_loops, return_inverse=True)
+    return points[used], local_loops.ravel(), sizes
+
+# ------------------------------------------------------------------------
+#    LRU cache of decoded mesh parts with a memory budget
+# ------------------------------------------------------------------------
+
+def _is_mapped(array):
+    base = array
+    while getattr(base, 'base', None) is not None:
+        base = base.base
+    # numpy wraps the mapped file in a memoryview
+    return isinstance(getattr(base, 'obj', base), mmap.mmap)
+
+def owned_arrays(arrays):
+    """ arrays with views of a mapped file copied into memory, so a cached
+    entry neither keeps the file mapped nor reads it after it is
+    rewritten in place. """
+    return tuple(np.array(array) if _is_mapped(array) else array
+                 for array in arrays)
+
+def array_bytes(arrays):
+    return sum(array.nbytes for array in arrays or ())
+
+class ArrayCache(object):
+    """ Least recently used cache of array tuples, bounded by budget
+    bytes. Arrays of mapped files are copied in, and count in full. An
+    entry larger than the whole budget is returned but not kept, nor is
+    a load that returns None, like that of a missing patch. """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key, load):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            value = load()
+            if value is None:
+                return None
+            value = owned_arrays(value)
+            entry = (value, array_bytes(value))
+        else:
+            self.hits += 1
+            self.size -= entry[1]
+        self._entries[key] = entry
+        self.size += entry[1]
+        self.evict()
+        return entry[0]
+
+    def evict(self):
+        while self.size > self.budget and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.size -= nbytes
+
+    def retain(self, keep):
+        """ Drop the entries whose key keep rejects. """
+        for key in [key for key in self._entries if not keep(key)]:
+            _, nbytes = self._entries.pop(key)
+            self.size -= nbytes
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
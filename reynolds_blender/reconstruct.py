@@ -0,0 +1,78 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+
+# ------------------------------------------------------------------------
+#    time selection for reconstructPar
+# ------------------------------------------------------------------------
+
+def _time_value(name):
+    try:
+        return float(name)
+    except ValueError:
+        return None
+
+def time_dirs(case_dir, processor='processor0'):
+    """ Names of the time dirs of a decomposed case, in time order. """
+    processor_dir = os.path.join(case_dir, processor)
+    if not os.path.isdir(processor_dir):
+        return []
+    times = [(_time_value(name), name) for name in os.listdir(processor_dir)
+             if os.path.isdir(os.path.join(processor_dir, name))]
+    return [name for value, name in sorted(t for t in times
+                                           if t[0] is not None)]
+
+def select_times(case_dir, mode, start=0.0, end=0.0, new_only=False):
+    """ The decomposed times to reconstruct: 'All', 'Latest' or those of
+    'Range' between start and end; new_only skips those already
+    reconstructed. """
+    times = time_dirs(case_dir)
+    if mode == 'Latest':
+        times = times[-1:]
+    elif mode == 'Range':
+        times = [t for t in times if start <= float(t) <= end]
+    if new_only:
+        times = [t for t in times
+                 if not os.path.isdir(os.path.join(case_dir, t))]
+    return times
+
+def split_times(times, jobs):
+    """ times split into at most jobs runs of consecutive times, of sizes
+    differing by one at most. """
+    jobs = max(1, min(jobs, len(times)))
+    size, extra = divmod(len(times), jobs)
+    groups = []
+    start = 0
+    for i in range(jobs):
+        end = start + size + (1 if i < extra else 0)
+        groups.append(times[start:end])
+        start = end
+    return [group for group in groups if group]
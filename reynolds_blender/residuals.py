@@ -0,0 +1,186 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import math
+import re
+import threading
+from collections import deque
+
+# ------------------------------------------------------------------------
+#    incremental solver log parser
+# ------------------------------------------------------------------------
+
+# longer lines are cut before parsing, which bounds the cost of a line
+MAX_LINE_LENGTH = 512
+
+# time steps kept per series
+HISTORY = 1000
+
+_time_re = re.compile(r'Time = (\S+)')
+_delta_t_re = re.compile(r'deltaT = (\S+)')
+_courant_re = re.compile(r'Courant Number mean: (\S+) max: (\S+)')
+_solving_re = re.compile(r'Solving for (\w+), Initial residual = (\S+), '
+                         r'Final residual = (\S+), No Iterations (\d+)')
+_execution_re = re.compile(r'ExecutionTime = (\S+) s(?:\s+ClockTime = (\S+) s)?')
+
+class ResidualMonitor(object):
+    """ Parses solver output line by line into ring buffers of the time,
+    Courant number, execution time and per field residuals of each time
+    step.
+
+    feed runs on the thread that reads the solver, the UI reads through
+    snapshot; both hold the lock only for a few appends or copies.
+    """
+
+    def __init__(self, history=HISTORY):
+        self.history = history
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.steps = 0
+            self.lines = 0
+            # bumped on every completed time step, for cheap change checks
+            self.version = 0
+            self.time = None
+            self.delta_t = None
+            self.courant = None
+            self.execution_time = None
+            self.clock_time = None
+            self.times = deque(maxlen=self.history)
+            self.courant_max = deque(maxlen=self.history)
+            # field -> deque of (time, initial, final, iterations)
+            self.residuals = {}
+            self._solved = set()
+
+    def feed(self, line):
+        self.lines += 1
+        line = line[:MAX_LINE_LENGTH].strip()
+        # '[i] ' prefixed lines are interleaved output of concurrent
+        # commands, which would mix up the time steps
+        if not line or line[0] == '[':
+            return
+        # dispatch on a cheap prefix test before any regex runs
+        if line.startswith('Time = '):
+            match = _time_re.match(line)
+            if match:
+                self._start_step(match.group(1))
+        elif line.startswith('deltaT'):
+            match = _delta_t_re.match(line)
+            if match:
+                self.delta_t = _float(match.group(1))
+        elif line.startswith('Courant'):
+            match = _courant_re.match(line)
+            if match:
+                self.courant = (_float(match.group(1)),
+                                _float(match.group(2)))
+        elif 'Solving for' in line:
+            match = _solving_re.search(line)
+            if match:
+                self._add_residual(*match.groups())
+        elif line.startswith('ExecutionTime'):
+            match = _execution_re.match(line)
+            if match:
+                self.execution_time = _float(match.group(1))
+                self.clock_time = _float(match.group(2))
+
+    def _start_step(self, time):
+        with self._lock:
+            self.time = _float(time)
+            self.steps += 1
+            self.version += 1
+            self.times.append(self.time)
+            if self.courant is not None:
+                self.courant_max.append(self.courant[1])
+            self._solved = set()
+
+    def _add_residual(self, field, initial, final, iterations):
+        # PISO and PIMPLE solve a field several times per step, the first
+        # initial residual is the one that measures convergence
+        if field in self._solved:
+            return
+        self._solved.add(field)
+        with self._lock:
+            series = self.residuals.get(field, None)
+            if series is None:
+                series = self.residuals[field] = deque(maxlen=self.history)
+            series.append((self.time, _float(initial), _float(final),
+                           int(iterations)))
+
+    def snapshot(self):
+        """ Copy of the current state, safe to read while feed runs. """
+        with self._lock:
+            return {'time': self.time,
+                    'steps': self.steps,
+                    'delta_t': self.delta_t,
+                    'courant': self.courant,
+                    'execution_time': self.execution_time,
+                    'clock_time': self.clock_time,
+                    'times': list(self.times),
+                    'courant_max': list(self.courant_max),
+                    'residuals': dict((field, list(series)) for field, series
+                                      in self.residuals.items())}
+
+def _float(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+# ------------------------------------------------------------------------
+#    panel text
+# ------------------------------------------------------------------------
+
+def format_value(value, fmt='%g'):
+    """ value formatted with fmt, '-' for a value the log did not parse. """
+    return '-' if value is None else fmt % value
+
+# ------------------------------------------------------------------------
+#    text plot of a residual history
+# ------------------------------------------------------------------------
+
+SPARK_LEVELS = ' .:-=+*#%@'
+
+def sparkline(values, width=24):
+    """ One character per value for the last width values, scaled on a
+    log axis between the smallest and largest of them. """
+    values = [v for v in values[-width:] if v is not None and v > 0]
+    if not values:
+        return ''
+    logs = [math.log10(v) for v in values]
+    lo, hi = min(logs), max(logs)
+    span = (hi - lo) or 1.0
+    top = len(SPARK_LEVELS) - 1
+    return ''.join(SPARK_LEVELS[int(round((l - lo) / span * top))]
+                   for l in logs)
+
+# the monitor of the case being solved
+residual_monitor = ResidualMonitor()
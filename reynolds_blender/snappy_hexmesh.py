@@ -52,6 +52,7 @@ from mathutils import Matrix, Vector
 # --------------
 import operator
 import os
+import shutil
 
 # ------------------------
 # reynolds blender imports
@@ -70,6 +71,13 @@ from reynolds_blender.mesh_quality import MeshQualityOperator
 from reynolds_blender.snappy_steps import SnappyStepsOperator
 from reynolds_blender.mesh_objs import ShowMeshObjOperator
 from reynolds_blender.geo_patch_time_props import GeometryPatchTimePropsOperator
+from reynolds_blender.cmd_job import run_foam_cmd, FoamCmdSequence
+from reynolds_blender.parallel_solver import (generate_decompose_par_dict,
+                                              mpirun_flags, check_launch)
+from reynolds_blender.decompose_planner import dict_subdomains, processor_dirs
+from reynolds_blender.case_writer import write_case_dict
+from reynolds_blender.builders.mesh_dicts import build_snappyhexmeshdict
+from reynolds_blender.builders.snapshot import scene_settings
 
 # ----------------
 # reynolds imports
@@ -83,7 +91,6 @@ from reynolds.foam.cmd_runner import FoamCmdRunner
 
 def generate_snappyhexmeshdict(self, context):
     scene = context.scene
-    snappy_dict = ReynoldsFoamDict('snappyHexMeshDict.foam')
 
     # -------------------------
     # Start the console operatorr
@@ -128,134 +135,19 @@ def generate_snappyhexmeshdict(self, context):
         self.report({'ERROR'}, 'Please run extract surface features')
         return {'FINISHED'}
 
-    # steps to run
-    snappy_dict['castellatedMesh'] = scene.castellated_mesh_step
-    snappy_dict['snap'] = scene.snap_step
-    snappy_dict['addLayers'] = scene.add_layers_step
-
-    for name, geometry_info in scene.geometries.items():
-        print('generate feature extract dict for ', name)
-
-        # geometry
-        file_path = geometry_info.get('file_path', None)
-        if file_path:
-            key = os.path.basename(file_path)
-            key_without_ext = os.path.splitext(key)[0]
-        else:
-            key = name
-            key_without_ext = name
-        print('key : key without ext' , key, ' : ', key_without_ext)
-        if geometry_info['type'] == 'triSurfaceMesh':
-            snappy_dict['geometry'][key] = {'type': geometry_info['type'],
-                                            'name': key_without_ext }
-        if geometry_info['type'] == 'searchableSphere':
-            centre = geometry_info['centre']
-            snappy_dict['geometry'][key] = {'type': geometry_info['type'],
-                                            'centre': [centre.x, centre.z, centre.y],
-                                            'radius': geometry_info['radius']}
-        if geometry_info['type'] == 'searchableBox':
-            level_min = geometry_info['min']
-            level_max = geometry_info['max']
-            snappy_dict['geometry'][key] = {'type': geometry_info['type'],
-                                            'min': [level_min[0], level_min[2], level_min[1]],
-                                            'max': [level_max[0], level_max[2], level_max[1]]}
-        # features
-        features = []
-        if geometry_info['has_features']:
-            features.append({'file': '"' + key_without_ext + '.eMesh' + '"',
-                        'level': geometry_info['feature_level']})
-            snappy_dict['castellatedMeshControls']['features'] = features
-
-        # refinement surface
-        if geometry_info['refinement_type'] == 'Surface':
-            surface = {'level': [geometry_info['refinementSurface']['min'],
-                                 geometry_info['refinementSurface']['max']]}
-            snappy_dict['castellatedMeshControls']['refinementSurfaces'][key_without_ext] = surface
-
-        # refinement region
-        if geometry_info['refinement_type'] == 'Region':
-            region = {'mode': geometry_info['refinementRegion']['mode'],
-                      'levels': [[geometry_info['refinementRegion']['dist'],
-                                  geometry_info['refinementRegion']['level']]]}
-            snappy_dict['castellatedMeshControls']['refinementRegions'][key_without_ext] = region
-
-        # castellatedMeshControls
-        snappy_dict['castellatedMeshControls']['maxLocalCells'] = scene.max_local_cells
-        snappy_dict['castellatedMeshControls']['maxGlobalCells'] = scene.max_global_cells
-        snappy_dict['castellatedMeshControls']['minRefinementCells'] = scene.min_refinement_cells
-        snappy_dict['castellatedMeshControls']['maxLoadUnbalance'] = scene.max_load_unbalance
-        snappy_dict['castellatedMeshControls']['resolveFeatureAngle'] = scene.resolve_feature_angle
-        location_in_mesh = scene.location_in_mesh
-        if location_in_mesh[0] != 0 and location_in_mesh[1] != 0 and location_in_mesh[2] != 0:
-            snappy_dict['castellatedMeshControls']['locationInMesh'] = [location_in_mesh[0],
-                                                                        location_in_mesh[2],
-                                                                        location_in_mesh[1]]
-        snappy_dict['castellatedMeshControls']['allowFreeStandingZoneFaces'] = scene.allow_free_standing_zones
-
-        # snapControls
-        snappy_dict['snapControls']['nSmoothPatch'] = scene.n_smooth_patch_iter
-        snappy_dict['snapControls']['tolerance'] = scene.tolerance
-        snappy_dict['snapControls']['nSolveIter'] = scene.disp_relax_iter
-        snappy_dict['snapControls']['nRelaxIter'] = scene.snapping_relax_iter
-        snappy_dict['snapControls']['nFeatureSnapIter'] = scene.feature_edge_snapping_iter
-        snappy_dict['snapControls']['implicitFeatureSanp'] = scene.implicit_feature_snap
-        snappy_dict['snapControls']['explicitFeatureSnap'] = scene.explicit_feature_snap
-        snappy_dict['snapControls']['multiRegionFeatureSnap'] = scene.multi_region_feature_snap
-
-        # addLayersControls
-        for name, layers in scene.add_layers.items():
-            snappy_dict['addLayersControls']['layers'][name] = {'nSurfaceLayers': layers}
-        snappy_dict['addLayersControls']['relativeSizes'] = scene.relative_sizes
-        snappy_dict['addLayersControls']['expansionRatio'] = scene.expansion_ratio
-        snappy_dict['addLayersControls']['finalLayerThickness'] = scene.final_layer_thickness
-        snappy_dict['addLayersControls']['minThickness'] = scene.min_layer_thickness
-        snappy_dict['addLayersControls']['nGrow'] = scene.n_grow_layers
-        snappy_dict['addLayersControls']['featureAngle'] = scene.layer_feature_angle
-        snappy_dict['addLayersControls']['nRelaxIter'] = scene.layer_n_relax_iter
-        snappy_dict['addLayersControls']['nSmoothSurfaceNormals'] = scene.layer_n_smooth_normal_iter
-        snappy_dict['addLayersControls']['nSmoothNormals'] = scene.layer_n_smooth_iter
-        snappy_dict['addLayersControls']['nSmoothThickness'] = scene.smooth_layer_thickness
-        snappy_dict['addLayersControls']['maxFaceThicknessRatio'] = scene.max_face_thickness_ratio
-        snappy_dict['addLayersControls']['maxThicknessToMedialRatio'] = scene.max_thickness_to_medial_ratio
-        snappy_dict['addLayersControls']['minMedianAxisAngle'] = scene.min_median_axis_angle
-        snappy_dict['addLayersControls']['nBufferCellsNoExtrude'] = scene.n_buffer_cells_no_extrude
-        snappy_dict['addLayersControls']['nLayerIter'] = scene.layer_n_add_iter
-        snappy_dict['addLayersControls']['nRelaxedIter'] = scene.layer_n_mesh_quality_iter
-
-        #meshQualityControls
-        snappy_dict['meshQualityControls']['maxNonOrtho'] = scene.max_non_ortho
-        snappy_dict['meshQualityControls']['maxBoundarySkewness'] = scene.max_boundary_skewness
-        snappy_dict['meshQualityControls']['maxInternalFaceSkewness'] = scene.max_internal_face_skewness
-        snappy_dict['meshQualityControls']['maxConcave'] = scene.max_concaveness
-        if scene.min_pyramid_vol != 0:
-            snappy_dict['meshQualityControls']['minVol'] = scene.min_pyramid_vol
-        if scene.min_tetrahedral_quality != 0:
-            snappy_dict['meshQualityControls']['minTetQuality'] = scene.min_tetrahedral_quality
-        snappy_dict['meshQualityControls']['minArea'] = scene.min_face_area
-        snappy_dict['meshQualityControls']['minTwist'] = scene.min_face_twist
-        snappy_dict['meshQualityControls']['minDeterminant'] = scene.min_cell_det
-        snappy_dict['meshQualityControls']['minFaceWeight'] = scene.min_face_weight
-        snappy_dict['meshQualityControls']['minVolRatio'] = scene.min_vol_ratio
-        snappy_dict['meshQualityControls']['minTriangleTwist'] = scene.min_tri_twist
-        snappy_dict['meshQualityControls']['nSmoothScale'] = scene.n_smooth_scale
-        snappy_dict['meshQualityControls']['errorReduction'] = scene.error_reduction
+    snappy_dict = build_snappyhexmeshdict(scene_settings(scene))
 
     print('--------------------')
     print('SNAPPY HEX MESH DICT')
     print('--------------------')
     print(snappy_dict)
     print('--------------------')
-    system_dir = os.path.join(abs_case_dir_path, "system")
-    if not os.path.exists(system_dir):
-        os.makedirs(system_dir)
-    shmd_file_path = os.path.join(system_dir, "snappyHexMeshDict")
-    with open(shmd_file_path, "w") as f:
-        f.write(str(snappy_dict))
-
+    write_case_dict(self, abs_case_dir_path, "system", "snappyHexMeshDict",
+                    snappy_dict)
 
     return {'FINISHED'}
 
-def run_snappyhexmesh(self, context):
+def start_snappyhexmesh(self, context):
     scene = context.scene
     case_dir = bpy.path.abspath(scene.case_dir_path)
 
@@ -267,31 +159,94 @@ def run_snappyhexmesh(self, context):
 
     if case_dir is None or case_dir == '':
         self.report({'ERROR'}, 'Please select a case directory')
-        return {'FINISHED'}
+        return None
 
     if not scene.foam_started:
         self.report({'ERROR'}, 'Please start open foam')
-        return {'FINISHED'}
+        return None
 
     shmd_file_path = os.path.join(case_dir, "system", "snappyHexMeshDict")
     if not os.path.exists(shmd_file_path):
         self.report({'ERROR'}, 'Please generate snappyHexMeshDict')
-        return {'FINISHED'}
+        return None
 
     scene.snappyhexmesh_executed = False
-    cr = FoamCmdRunner(cmd_name='snappyHexMesh', case_dir=case_dir,
-                       cmd_flags=['-overwrite'])
-
-    for info in cr.run():
-        self.report({'WARNING'}, info)
-
-    if cr.run_status:
+    parallel_mesh_status['sequence'] = None
+    if scene.snappy_parallel:
+        sequence = parallel_snappyhexmesh(self, context, case_dir)
+        if sequence is False:
+            return None
+        if sequence:
+            parallel_mesh_status['sequence'] = sequence
+            return sequence
+    return FoamCmdRunner(cmd_name='snappyHexMesh', case_dir=case_dir,
+                         cmd_flags=['-overwrite'])
+
+def finish_snappyhexmesh(self, context, run_status):
+    scene = context.scene
+    sequence = parallel_mesh_status['sequence']
+    if sequence:
+        finish_parallel_snappyhexmesh(self, context, sequence, run_status)
+    if run_status:
         scene.snappyhexmesh_executed = True
         self.report({'INFO'}, 'SnappyHexMesh : SUCCESS')
     else:
         self.report({'ERROR'}, 'SnappyHexMesh : FAILED')
 
-    return {'FINISHED'}
+# ------------------------------------------------------------------------
+# parallel meshing: decompose the background mesh, run snappyHexMesh on
+# each subdomain and reconstruct the refined mesh into constant/polyMesh
+# ------------------------------------------------------------------------
+
+# the running or last parallel meshing sequence, for the panel
+parallel_mesh_status = {'sequence': None}
+
+def parallel_snappyhexmesh(self, context, case_dir):
+    """ The parallel meshing sequence, None to mesh serially, False if it
+    cannot be launched. """
+    scene = context.scene
+    generate_decompose_par_dict(self, context)
+    np = dict_subdomains(case_dir) or scene.number_of_subdomains
+    if np < 2:
+        self.report({'WARNING'}, 'decomposeParDict has a single subdomain, '
+                    'running snappyHexMesh serially')
+        return None
+    if not check_launch(self, scene, np):
+        return False
+
+    snappy_flags = ['snappyHexMesh', '-parallel', '-overwrite']
+    runners = [FoamCmdRunner(cmd_name='decomposePar', case_dir=case_dir,
+                             cmd_flags=['-force']),
+               FoamCmdRunner(cmd_name='mpirun', case_dir=case_dir,
+                             cmd_flags=mpirun_flags(scene, np, snappy_flags)),
+               FoamCmdRunner(cmd_name='reconstructParMesh', case_dir=case_dir,
+                             cmd_flags=['-constant'])]
+    return FoamCmdSequence('snappyHexMesh', case_dir, runners)
+
+def remove_processor_dirs(case_dir):
+    for processor_dir in processor_dirs(case_dir):
+        shutil.rmtree(processor_dir, ignore_errors=True)
+
+def finish_parallel_snappyhexmesh(self, context, sequence, run_status):
+    # the processor dirs hold the background mesh decomposition, which no
+    # longer matches constant/polyMesh once reconstructed, and is only
+    # half meshed after a failure; either way the solver needs a fresh
+    # decomposePar
+    remove_processor_dirs(sequence.case_dir)
+    if run_status:
+        return
+    if sequence.failed is not None:
+        stage = sequence.runners.index(sequence.failed) + 1
+        self.report({'ERROR'}, 'Parallel snappyHexMesh failed in stage '
+                    '%d/%d (%s)' % (stage, len(sequence.runners),
+                                    sequence.failed.cmd_name))
+    self.report({'WARNING'}, 'Processor dirs removed, constant/polyMesh '
+                'still holds the background mesh: run again, or serially '
+                'without "Parallel"')
+
+def run_snappyhexmesh(self, context):
+    return run_foam_cmd(self, context, start_snappyhexmesh,
+                        finish_snappyhexmesh)
 
 # ------------------------------------------------------------------------
 #    Panel
@@ -327,6 +282,20 @@ class SnappyHexMeshPanel(Panel):
                                            'snappy_hexmesh.yaml')
         gui_renderer.render()
 
+        sequence = parallel_mesh_status['sequence']
+        if sequence is not None and sequence.stage:
+            runner = sequence.runners[sequence.stage - 1]
+            if sequence.run_status:
+                state = 'done'
+            elif sequence.failed:
+                state = 'failed'
+            else:
+                state = 'running'
+            layout.label(text='Stage %d/%d %s: %s' % (sequence.stage,
+                                                      len(sequence.runners),
+                                                      runner.cmd_name, state),
+                         icon='TIME')
+
 
 # ------------------------------------------------------------------------
 # register and unregister
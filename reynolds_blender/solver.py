@@ -36,8 +36,8 @@ from progress_report import ProgressReport
 # --------------
 # python imports
 # --------------
-import os
 import multiprocessing
+import os
 
 # ------------------------
 # reynolds blender imports
@@ -47,7 +47,18 @@ from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
 from reynolds_blender.gui.register import register_classes, unregister_classes
 from reynolds_blender.gui.custom_operator import create_custom_operators
 from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
-from reynolds_blender.parallel_solver import ParallelSolverOperator
+from reynolds_blender.parallel_solver import (ParallelSolverOperator,
+                                              mpirun_flags, check_launch,
+                                              scene_launch_profile)
+from reynolds_blender.launch_profiles import (load_profiles, save_profile,
+                                              delete_profile, profile_hosts,
+                                              total_slots)
+from reynolds_blender.cmd_job import (run_foam_cmd, add_output_listener,
+                                      remove_output_listener, FoamCmdGroup)
+from reynolds_blender.reconstruct import select_times, split_times
+from reynolds_blender.residuals import (residual_monitor, sparkline,
+                                        format_value)
+from reynolds_blender.decompose_planner import dict_subdomains, processor_dirs
 
 # ----------------
 # reynolds imports
@@ -59,7 +70,7 @@ from reynolds.foam.cmd_runner import FoamCmdRunner
 #    operators
 # ------------------------------------------------------------------------
 
-def run_decompose_par(self, context):
+def start_decompose_par(self, context):
     scene = context.scene
     obj = context.active_object
 
@@ -73,21 +84,24 @@ def run_decompose_par(self, context):
     # ----------------------------------
     case_dir = bpy.path.abspath(scene.case_dir_path)
 
-    sr = FoamCmdRunner(cmd_name='decomposePar',
-                       case_dir=case_dir)
-    for info in sr.run():
-        self.report({'WARNING'}, info)
+    # replace processor dirs left by a previous decomposition
+    return FoamCmdRunner(cmd_name='decomposePar', case_dir=case_dir,
+                         cmd_flags=['-force'])
 
-    if sr.run_status:
+def finish_decompose_par(self, context, run_status):
+    scene = context.scene
+    if run_status:
         scene.case_solved = True
         self.report({'INFO'}, 'Run decomposePar: SUCCESS')
     else:
         scene.case_solved = False
         self.report({'INFO'}, 'Run decomposePar: FAILED')
 
-    return{'FINISHED'}
+def run_decompose_par(self, context):
+    return run_foam_cmd(self, context, start_decompose_par,
+                        finish_decompose_par)
 
-def solve_case(self, context):
+def start_solve_case(self, context):
     scene = context.scene
     obj = context.active_object
 
@@ -103,87 +117,198 @@ def solve_case(self, context):
 
     if case_dir is None or case_dir == '':
         self.report({'ERROR'}, 'Please select a case directory')
-        return {'FINISHED'}
+        return None
 
     if not scene.foam_started:
         self.report({'ERROR'}, 'Please start open foam')
-        return {'FINISHED'}
+        return None
 
     if not scene.blockmesh_executed:
         self.report({'ERROR'}, 'Please run blockMesh')
-        return {'FINISHED'}
+        return None
 
     shmd_file_path = os.path.join(case_dir, "system", "snappyHexMeshDict")
     if os.path.exists(shmd_file_path) and not scene.snappyhexmesh_executed:
         self.report({'ERROR'}, 'Please run snappyHexMesh')
-        return {'FINISHED'}
+        return None
 
     if scene.solver_name is None or scene.solver_name == '':
         self.report({'ERROR'}, 'Please select a solver')
-        return {'FINISHED'}
+        return None
 
     scene.case_solved = False
-
-    sr = None
+    residual_monitor.reset()
 
     if scene.solve_in_parallel:
-        np = str(multiprocessing.cpu_count())
-        cmd_flags = []
-        machines = bpy.path.abspath(scene.machines_file_path)
-        if os.path.exists(machines):
-            print("Found machines file: " + machines)
-            cmd_flags = ['--hostfile', machines]
-        cmd_flags = cmd_flags + ['-np', np, scene.solver_name, '-parallel']
-        sr = FoamCmdRunner(cmd_name='mpirun',
-                           case_dir=case_dir,
-                           cmd_flags=cmd_flags)
-    else:
-        sr = FoamCmdRunner(cmd_name=scene.solver_name,
-                           case_dir=case_dir)
-    for info in sr.run():
-        self.report({'WARNING'}, info)
-
-    if sr.run_status:
+        # one process per subdomain the case was decomposed into
+        n_subdomains = dict_subdomains(case_dir) or scene.number_of_subdomains
+        n_processors = len(processor_dirs(case_dir))
+        if n_processors != n_subdomains:
+            self.report({'ERROR'}, 'Case is decomposed into %d processor '
+                        'dirs, decomposeParDict has %d subdomains: please '
+                        'run decomposePar' % (n_processors, n_subdomains))
+            return None
+        if not check_launch(self, scene, n_subdomains):
+            return None
+        cmd_flags = mpirun_flags(scene, n_subdomains,
+                                 [scene.solver_name, '-parallel'])
+        return FoamCmdRunner(cmd_name='mpirun',
+                             case_dir=case_dir,
+                             cmd_flags=cmd_flags)
+    return FoamCmdRunner(cmd_name=scene.solver_name, case_dir=case_dir)
+
+def finish_solve_case(self, context, run_status):
+    scene = context.scene
+    if run_status:
         scene.case_solved = True
         self.report({'INFO'}, 'Case solving: SUCCESS')
     else:
         scene.case_solved = False
         self.report({'INFO'}, 'Case solving: FAILED')
 
-    return{'FINISHED'}
+def solve_case(self, context):
+    return run_foam_cmd(self, context, start_solve_case, finish_solve_case)
 
-def check_mesh(self, context):
+def reconstruct_times(scene, new_only):
+    """ The decomposed times of the scene's case to reconstruct. """
+    case_dir = bpy.path.abspath(scene.case_dir_path)
+    return select_times(case_dir, scene.reconstruct_times,
+                        scene.reconstruct_start_time,
+                        scene.reconstruct_end_time, new_only)
+
+def start_reconstruct_par(self, context, new_only=None):
+    """ new_only defaults to the scene's reconstruct_new_times. """
     scene = context.scene
-    obj = context.active_object
+    if new_only is None:
+        new_only = scene.reconstruct_new_times
 
     # -------------------------
     # Start the console operatorr
     # --------------------------
     bpy.ops.reynolds.of_console_op()
 
-    print("Start openfoam")
     case_dir = bpy.path.abspath(scene.case_dir_path)
 
     if case_dir is None or case_dir == '':
         self.report({'ERROR'}, 'Please select a case directory')
-        return {'FINISHED'}
+        return None
 
     if not scene.foam_started:
         self.report({'ERROR'}, 'Please start open foam')
+        return None
+
+    times = reconstruct_times(scene, new_only)
+    if not times:
+        self.report({'ERROR'}, 'No decomposed times to reconstruct')
+        return None
+
+    # reconstructPar is serial, so split the times across processes
+    jobs = scene.reconstruct_jobs or multiprocessing.cpu_count()
+    runners = [FoamCmdRunner(cmd_name='reconstructPar', case_dir=case_dir,
+                             cmd_flags=['-time', ','.join(group)])
+               for group in split_times(times, jobs)]
+    print('Reconstruct ' + str(len(times)) + ' times in ' +
+          str(len(runners)) + ' processes')
+    reconstruct_stats['times'] = len(times)
+    reconstruct_stats['group'] = FoamCmdGroup('reconstructPar', case_dir,
+                                              runners)
+    return reconstruct_stats['group']
+
+def finish_reconstruct_par(self, context, run_status):
+    group = reconstruct_stats['group']
+    if run_status:
+        self.report({'INFO'}, 'Reconstruct: SUCCESS')
+    else:
+        self.report({'ERROR'}, 'Reconstruct: FAILED')
+    if group.speedup() is not None:
+        self.report({'INFO'}, reconstruct_summary())
+
+def reconstruct_par(self, context):
+    return run_foam_cmd(self, context, start_reconstruct_par,
+                        finish_reconstruct_par)
+
+# the last reconstruction, for its timing summary
+reconstruct_stats = {'times': 0, 'group': None}
+
+def reconstruct_summary():
+    group = reconstruct_stats['group']
+    if group is None or group.speedup() is None:
+        return None
+    return ('%d times in %d processes: %.1f s wall, %.1f s total, '
+            'speedup %.1fx' % (reconstruct_stats['times'],
+                               len(group.runners), group.wall_time,
+                               sum(group.elapsed), group.speedup()))
+
+# ------------------------------------------------------------------------
+#    launch profiles
+# ------------------------------------------------------------------------
+
+def save_launch_profile(self, context):
+    scene = context.scene
+    case_dir = bpy.path.abspath(scene.case_dir_path)
+    name = scene.launch_profile_name.strip()
+    if not name:
+        self.report({'ERROR'}, 'Please enter a profile name')
         return {'FINISHED'}
+    save_profile(case_dir, name, scene_launch_profile(scene))
+    self.report({'INFO'}, 'Saved launch profile ' + name)
+    return {'FINISHED'}
 
-    mr = FoamCmdRunner(cmd_name='checkMesh', case_dir=case_dir)
+def load_launch_profile(self, context):
+    scene = context.scene
+    case_dir = bpy.path.abspath(scene.case_dir_path)
+    name = scene.launch_profile_name.strip()
+    profile = load_profiles(case_dir).get(name, None)
+    if profile is None:
+        self.report({'ERROR'}, 'No launch profile ' + name)
+        return {'FINISHED'}
+    scene.machines_file_path = profile['hostfile']
+    scene.launch_bind_to = profile['bind_to'] or 'default'
+    scene.launch_map_by = profile['map_by'] or 'default'
+    scene.launch_oversubscribe = profile['oversubscribe']
+    scene.launch_local = profile['local']
+    scene.launch_extra_flags = profile['extra_flags']
+    self.report({'INFO'}, 'Loaded launch profile ' + name)
+    return {'FINISHED'}
+
+def delete_launch_profile(self, context):
+    scene = context.scene
+    case_dir = bpy.path.abspath(scene.case_dir_path)
+    delete_profile(case_dir, scene.launch_profile_name.strip())
+    return {'FINISHED'}
+
+def start_check_mesh(self, context):
+    scene = context.scene
+    obj = context.active_object
+
+    # -------------------------
+    # Start the console operatorr
+    # --------------------------
+    bpy.ops.reynolds.of_console_op()
+
+    print("Start openfoam")
+    case_dir = bpy.path.abspath(scene.case_dir_path)
+
+    if case_dir is None or case_dir == '':
+        self.report({'ERROR'}, 'Please select a case directory')
+        return None
+
+    if not scene.foam_started:
+        self.report({'ERROR'}, 'Please start open foam')
+        return None
 
-    for info in mr.run():
-        self.report({'WARNING'}, info)
+    return FoamCmdRunner(cmd_name='checkMesh', case_dir=case_dir)
 
-    if mr.run_status:
+def finish_check_mesh(self, context, run_status):
+    scene = context.scene
+    if run_status:
         self.report({'INFO'}, 'CheckMesh : SUCCESS')
         scene.blockmesh_executed = True
     else:
         self.report({'ERROR'}, 'CheckMesh : FAILED')
 
-    return{'FINISHED'}
+def check_mesh(self, context):
+    return run_foam_cmd(self, context, start_check_mesh, finish_check_mesh)
 
 # ------------------------------------------------------------------------
 #    Panel
@@ -211,13 +336,66 @@ class SolverPanel(Panel):
         gui_renderer = ReynoldsGUIRenderer(scene, layout, 'solver_panel.yaml')
         gui_renderer.render()
 
+        profile = scene_launch_profile(scene)
+        hosts = profile_hosts(profile)
+        if hosts:
+            layout.label(text='%d hosts, %d slots' % (len(hosts),
+                                                      total_slots(hosts)))
+        case_dir = bpy.path.abspath(scene.case_dir_path)
+        profiles = sorted(load_profiles(case_dir)) if case_dir else []
+        if profiles:
+            layout.label(text='Profiles: ' + ', '.join(profiles))
+
+        summary = reconstruct_summary()
+        if summary:
+            layout.label(text=summary, icon='TIME')
+
+class ResidualsPanel(Panel):
+    bl_idname = "of_residuals_panel"
+    bl_label = "Residuals"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "TOOLS"
+    bl_category = "Tools"
+    bl_context = "objectmode"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        state = residual_monitor.snapshot()
+
+        if state['time'] is None:
+            layout.label(text='No solver output yet')
+            return
+
+        col = layout.column(align=True)
+        col.label(text='Time: %g (step %d)' % (state['time'], state['steps']))
+        if state['courant'] is not None:
+            col.label(text='Courant mean: %s max: %s' %
+                      tuple(format_value(v) for v in state['courant']))
+        if state['execution_time'] is not None:
+            col.label(text='Execution time: %g s' % state['execution_time'])
+
+        box = layout.box()
+        for field in sorted(state['residuals']):
+            series = state['residuals'][field]
+            time, initial, final, iterations = series[-1]
+            row = box.row()
+            row.label(text=field)
+            row.label(text=format_value(initial, '%.3e'))
+            row.label(text=format_value(final, '%.3e'))
+            row.label(text=str(iterations))
+            # the initial residual history on a log axis
+            box.label(text=sparkline([s[1] for s in series]))
+
 
 def register():
     register_classes(__name__)
     set_scene_attrs('solver_panel.yaml')
     create_custom_operators('solver_panel.yaml', __name__)
+    add_output_listener(residual_monitor.feed)
 
 def unregister():
+    remove_output_listener(residual_monitor.feed)
     unregister_classes(__name__)
 # ------------------------------------------------------------------------
 #    Panel
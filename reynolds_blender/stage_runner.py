@@ -0,0 +1,208 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import hashlib
+import json
+import os
+import shutil
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+from reynolds_blender.case_writer import file_digest, write_if_changed
+
+# ------------------------------------------------------------------------
+#    stage stamps
+# ------------------------------------------------------------------------
+
+# files larger than this, like big STL geometries, are fingerprinted by
+# size and mtime instead of being hashed on every run
+LARGE_FILE_SIZE = 16 * 1024 * 1024
+
+def _case_path(case_dir, path):
+    file_path = os.path.join(case_dir, path)
+    # OpenFoam writes compressed files with a .gz suffix
+    if not os.path.exists(file_path) and os.path.exists(file_path + '.gz'):
+        return file_path + '.gz'
+    return file_path
+
+def _fingerprint(case_dir, path):
+    file_path = _case_path(case_dir, path)
+    if not os.path.isfile(file_path):
+        return 'missing'
+    st = os.stat(file_path)
+    if st.st_size > LARGE_FILE_SIZE:
+        return '{}:{}'.format(st.st_size, st.st_mtime_ns)
+    return file_digest(file_path)
+
+def stage_key(stage, scene, case_dir, upstream_key):
+    """ Hash of the stage's input files, chained with the keys of the
+    stages it depends on. """
+    key = hashlib.sha1((upstream_key + stage['name']).encode('utf-8'))
+    for path in sorted(stage['inputs'](scene, case_dir)):
+        key.update(path.encode('utf-8'))
+        key.update(_fingerprint(case_dir, path).encode('utf-8'))
+    return key.hexdigest()
+
+def _stamps_path(case_dir):
+    return os.path.join(case_dir, '.reynolds', 'pipeline.json')
+
+def load_stamps(case_dir):
+    try:
+        with open(_stamps_path(case_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_stamps(case_dir, stamps):
+    write_if_changed(_stamps_path(case_dir),
+                     json.dumps(stamps, indent=2, sort_keys=True))
+
+def needs_generate(snapshot, stage, case_dir, rerun):
+    """ Whether the stage's case files must be generated again: they are
+    missing, their settings changed or a stage before it ran. Without a
+    snapshot they are always generated. """
+    generates = stage['generates']
+    if generates is None or rerun or snapshot is None:
+        return True
+    if any(not os.path.exists(os.path.join(case_dir, path))
+           for path in generates):
+        return True
+    return snapshot.is_stale(generates)
+
+# ------------------------------------------------------------------------
+# background mesh: snappyHexMesh -overwrite replaces constant/polyMesh,
+# so the blockMesh output is kept aside and put back before every
+# snappyHexMesh run
+# ------------------------------------------------------------------------
+
+POLYMESH_DIR = os.path.join('constant', 'polyMesh')
+BACKGROUND_MESH_DIR = os.path.join('.reynolds', 'background', 'polyMesh')
+
+# stamps entry naming the stage whose mesh constant/polyMesh holds
+MESH_STAMP = 'polyMesh'
+
+def save_background_mesh(case_dir):
+    background_dir = os.path.join(case_dir, BACKGROUND_MESH_DIR)
+    shutil.rmtree(background_dir, ignore_errors=True)
+    shutil.copytree(os.path.join(case_dir, POLYMESH_DIR), background_dir)
+
+def restore_background_mesh(case_dir):
+    """ Put the saved blockMesh output back in constant/polyMesh, False if
+    there is none. """
+    background_dir = os.path.join(case_dir, BACKGROUND_MESH_DIR)
+    if not os.path.isdir(background_dir):
+        return False
+    polymesh_dir = os.path.join(case_dir, POLYMESH_DIR)
+    shutil.rmtree(polymesh_dir, ignore_errors=True)
+    shutil.copytree(background_dir, polymesh_dir)
+    return True
+
+# ------------------------------------------------------------------------
+#    stage runner
+# ------------------------------------------------------------------------
+
+def run_stages(self, context, stages, case_dir, run_stage, force=False,
+               snapshot=None):
+    """ Run the enabled stages in order, skipping a stage when its inputs
+    and those of every stage before it are unchanged since its last
+    successful run. A stage's dicts are only generated again when the
+    settings they come from changed.
+
+    run_stage(self, context, stage) runs a stage and returns its run
+    status. A stage with 'mesh' set to 'save' writes the background mesh,
+    one with 'mesh' set to 'restore' refines it in place. Returns True if
+    every stage completed.
+    """
+    scene = context.scene
+    stamps = load_stamps(case_dir)
+    upstream_key = ''
+    rerun = force
+    enabled = [stage for stage in stages if stage['enabled'](scene)]
+    if snapshot is not None:
+        snapshot.take(scene)
+    for i, stage in enumerate(enabled):
+        name = stage['name']
+        mesh = stage.get('mesh', None)
+        if needs_generate(snapshot, stage, case_dir, rerun):
+            stage['generate'](self, context)
+            # generating may set scene attrs, like the decomposition plan
+            if snapshot is not None:
+                snapshot.take(scene)
+        else:
+            print('Settings unchanged, keeping dicts of ' + name)
+        key = stage_key(stage, scene, case_dir, upstream_key)
+        upstream_key = key
+        outputs_exist = all(os.path.exists(_case_path(case_dir, path))
+                            for path in stage['outputs'])
+        fresh = (not rerun and outputs_exist and
+                 stamps.get(name, None) == key)
+        # the stage's output is only current while no later stage
+        # overwrote it
+        if fresh and mesh == 'restore':
+            fresh = stamps.get(MESH_STAMP, None) == name
+        if fresh:
+            if (mesh == 'save' and stamps.get(MESH_STAMP, None) != name and
+                    not any(later.get('mesh', None) == 'restore'
+                            for later in enabled[i + 1:])):
+                # the refined mesh of a stage that is now disabled
+                restore_background_mesh(case_dir)
+                stamps[MESH_STAMP] = name
+                save_stamps(case_dir, stamps)
+                self.report({'INFO'}, name + ' : background mesh restored')
+                rerun = True
+            else:
+                self.report({'INFO'}, name + ' : UP TO DATE')
+            if stage['flag']:
+                setattr(scene, stage['flag'], True)
+            if snapshot is not None:
+                snapshot.generated(stage['generates'] or [])
+            continue
+
+        # a stage that runs changes the case for every stage after it
+        rerun = True
+        stamps.pop(name, None)
+        if mesh is not None:
+            stamps.pop(MESH_STAMP, None)
+        save_stamps(case_dir, stamps)
+        if mesh == 'restore':
+            restore_background_mesh(case_dir)
+        if not run_stage(self, context, stage):
+            self.report({'ERROR'}, 'Pipeline stopped at ' + name)
+            return False
+        if mesh == 'save':
+            save_background_mesh(case_dir)
+        if mesh is not None:
+            stamps[MESH_STAMP] = name
+        stamps[name] = key
+        save_stamps(case_dir, stamps)
+        if snapshot is not None:
+            snapshot.generated(stage['generates'] or [])
+    return True
@@ -0,0 +1,162 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+
+from reynolds_blender.stl_io import (STL_HEADER_SIZE, MultipleSolidsError,
+                                     NamedSolidError, convert_ascii_to_binary,
+                                     is_binary_stl)
+
+# ------------------------------------------------------------------------
+#    stage geometry files into a case without copying them when possible
+# ------------------------------------------------------------------------
+
+# linux ioctl that clones a file's extents on btrfs, xfs and friends
+FICLONE = 0x40049409
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# file path -> (size, mtime_ns, digest), so each file version of a
+# geometry is hashed once per session
+_content_digests = {}
+
+def content_digest(file_path):
+    st = os.stat(file_path)
+    cached = _content_digests.get(file_path, None)
+    if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    digest = digest.hexdigest()
+    _content_digests[file_path] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+def is_staged(src_file, dst_file):
+    """ True if dst_file already holds src_file: the same inode, or the
+    same size, mtime and content. """
+    if not os.path.exists(dst_file):
+        return False
+    if os.path.samefile(src_file, dst_file):
+        return True
+    src_st = os.stat(src_file)
+    dst_st = os.stat(dst_file)
+    if (src_st.st_size, src_st.st_mtime_ns) != (dst_st.st_size,
+                                                dst_st.st_mtime_ns):
+        return False
+    return content_digest(src_file) == content_digest(dst_file)
+
+# binary STLs converted from ascii record the digest of their source
+CONVERTED_HEADER = b'reynolds-blender converted '
+
+def _converted_header(src_file):
+    return CONVERTED_HEADER + content_digest(src_file).encode('ascii')
+
+def is_converted(src_file, dst_file):
+    if not os.path.exists(dst_file):
+        return False
+    with open(dst_file, 'rb') as f:
+        header = f.read(STL_HEADER_SIZE)
+    return header.rstrip() == _converted_header(src_file)
+
+def _reflink(src_file, dst_file):
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, 'reflink not supported')
+    with open(src_file, 'rb') as src, open(dst_file, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(src_file, dst_file)
+
+def _stage_to(src_file, temp_path):
+    try:
+        os.link(src_file, temp_path)
+        return 'linked'
+    except OSError:
+        pass
+    try:
+        _reflink(src_file, temp_path)
+        return 'reflinked'
+    except (OSError, IOError):
+        pass
+    # copy2 keeps the mtime, so the next run can skip the file
+    shutil.copy2(src_file, temp_path)
+    return 'copied'
+
+def _convert_to(src_file, temp_path):
+    # single, unnamed solid ascii STLs are staged as binary, which is
+    # several times smaller and faster for OpenFoam to read; named solids
+    # stay ascii, their names are the surface's region names
+    if not src_file.lower().endswith('.stl') or is_binary_stl(src_file):
+        return None
+    try:
+        convert_ascii_to_binary(src_file, temp_path,
+                                header=_converted_header(src_file))
+        return 'converted'
+    except (MultipleSolidsError, NamedSolidError):
+        return None
+
+def stage_file(src_file, dst_dir):
+    """ Make src_file available in dst_dir by ascii to binary STL
+    conversion of an unnamed solid, hard link, reflink or copy, in that
+    order of preference. Returns how the file was staged, or 'unchanged' if dst_dir already
+    had it. """
+    dst_file = os.path.join(dst_dir, os.path.basename(src_file))
+    if is_staged(src_file, dst_file) or is_converted(src_file, dst_file):
+        return 'unchanged'
+
+    # stage next to the destination and rename over it, so a stale file
+    # is never half replaced
+    fd, temp_path = tempfile.mkstemp(dir=dst_dir,
+                                     prefix='.' + os.path.basename(src_file))
+    os.close(fd)
+    os.remove(temp_path)
+    try:
+        how = _convert_to(src_file, temp_path)
+        if how is None:
+            how = _stage_to(src_file, temp_path)
+        os.replace(temp_path, dst_file)
+    except:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return how
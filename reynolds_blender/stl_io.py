@@ -0,0 +1,220 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import re
+import struct
+
+import numpy as np
+
+# ------------------------------------------------------------------------
+#    streaming STL reader and writer, no blender objects involved
+# ------------------------------------------------------------------------
+
+STL_HEADER_SIZE = 80
+
+STL_TRIANGLE_DTYPE = np.dtype([('normal', '<f4', (3,)),
+                               ('vertices', '<f4', (3, 3)),
+                               ('attr', '<u2')])
+
+# triangles handled per chunk, bounds the memory of a pass to ~100 MB
+CHUNK_TRIANGLES = 1024 * 1024
+
+ASCII_READ_SIZE = 64 * 1024 * 1024
+
+_vertex_re = re.compile(rb'vertex\s+(\S+)\s+(\S+)\s+(\S+)')
+_solid_re = re.compile(rb'^\s*solid\b', re.MULTILINE)
+_solid_name_re = re.compile(rb'\s*solid[ \t]*([^\r\n]*)')
+
+def binary_triangle_count(file_path):
+    """ Triangle count of a binary STL, None if the file is not one. """
+    size = os.path.getsize(file_path)
+    if size < STL_HEADER_SIZE + 4:
+        return None
+    with open(file_path, 'rb') as f:
+        f.seek(STL_HEADER_SIZE)
+        n_triangles = struct.unpack('<I', f.read(4))[0]
+    # ascii files start with 'solid' too, the size is the reliable test
+    if size != STL_HEADER_SIZE + 4 + n_triangles * STL_TRIANGLE_DTYPE.itemsize:
+        return None
+    return n_triangles
+
+def is_binary_stl(file_path):
+    return binary_triangle_count(file_path) is not None
+
+def read_binary_triangles(file_path):
+    """ Memory mapped (n, 3, 3) float32 view of a binary STL's vertices. """
+    n_triangles = binary_triangle_count(file_path)
+    if n_triangles == 0:
+        return np.empty((0, 3, 3), dtype=np.float32)
+    triangles = np.memmap(file_path, dtype=STL_TRIANGLE_DTYPE, mode='r',
+                          offset=STL_HEADER_SIZE + 4, shape=(n_triangles,))
+    return triangles['vertices']
+
+def _ascii_chunks(file_path, solids):
+    with open(file_path, 'rb') as f:
+        tail = b''
+        pending = np.empty((0, 3), dtype=np.float64)
+        while True:
+            data = f.read(ASCII_READ_SIZE)
+            if not data:
+                break
+            data = tail + data
+            cut = data.rfind(b'\n') + 1
+            data, tail = data[:cut], data[cut:]
+            solids[0] += len(_solid_re.findall(data))
+            found = _vertex_re.findall(data)
+            if not found:
+                continue
+            vertices = np.array(found, dtype=np.bytes_).astype(np.float64)
+            vertices = np.concatenate((pending, vertices))
+            n_complete = len(vertices) // 3 * 3
+            pending = vertices[n_complete:]
+            yield vertices[:n_complete].reshape(-1, 3, 3)
+        if tail:
+            solids[0] += len(_solid_re.findall(tail))
+            found = _vertex_re.findall(tail)
+            if found:
+                vertices = np.array(found, dtype=np.bytes_).astype(np.float64)
+                vertices = np.concatenate((pending, vertices))
+                yield vertices[:len(vertices) // 3 * 3].reshape(-1, 3, 3)
+
+def iter_triangles(file_path, solids=None):
+    """ Yield the triangles of a binary or ascii STL as (k, 3, 3) arrays
+    of at most CHUNK_TRIANGLES triangles. For ascii files the number of
+    solids seen so far is kept in solids[0]. """
+    if solids is None:
+        solids = [0]
+    if is_binary_stl(file_path):
+        solids[0] = 1
+        triangles = read_binary_triangles(file_path)
+        for start in range(0, len(triangles), CHUNK_TRIANGLES):
+            yield np.asarray(triangles[start:start + CHUNK_TRIANGLES],
+                             dtype=np.float64)
+        return
+    for chunk in _ascii_chunks(file_path, solids):
+        for start in range(0, len(chunk), CHUNK_TRIANGLES):
+            yield chunk[start:start + CHUNK_TRIANGLES]
+
+def _cross(triangles):
+    return np.cross(triangles[:, 1] - triangles[:, 0],
+                    triangles[:, 2] - triangles[:, 0])
+
+# file path -> (size, mtime_ns, stats)
+_stats_cache = {}
+
+def stl_stats(file_path):
+    """ Triangle count, bounding box (in the file's axes), surface area and
+    solid count of an STL file, computed in one streaming pass. """
+    st = os.stat(file_path)
+    cached = _stats_cache.get(file_path, None)
+    if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+
+    solids = [0]
+    n_triangles = 0
+    area = 0.0
+    lo = np.full(3, np.inf)
+    hi = np.full(3, -np.inf)
+    for chunk in iter_triangles(file_path, solids):
+        if len(chunk) == 0:
+            continue
+        n_triangles += len(chunk)
+        points = chunk.reshape(-1, 3)
+        lo = np.minimum(lo, points.min(axis=0))
+        hi = np.maximum(hi, points.max(axis=0))
+        area += 0.5 * float(np.linalg.norm(_cross(chunk), axis=1).sum())
+
+    stats = {'binary': is_binary_stl(file_path),
+             'solids': solids[0],
+             'triangles': n_triangles,
+             'min': lo.tolist() if n_triangles else [0.0, 0.0, 0.0],
+             'max': hi.tolist() if n_triangles else [0.0, 0.0, 0.0],
+             'area': area}
+    _stats_cache[file_path] = (st.st_size, st.st_mtime_ns, stats)
+    return stats
+
+def write_binary_stl(file_path, chunks, header=b''):
+    """ Stream (k, 3, 3) triangle chunks into a binary STL, computing the
+    facet normals. Returns the number of triangles written. """
+    header = header[:STL_HEADER_SIZE].ljust(STL_HEADER_SIZE, b' ')
+    n_triangles = 0
+    with open(file_path, 'wb') as f:
+        f.write(header)
+        f.write(struct.pack('<I', 0))
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            normals = _cross(chunk)
+            lengths = np.linalg.norm(normals, axis=1)
+            lengths[lengths == 0] = 1.0
+            triangles = np.zeros(len(chunk), dtype=STL_TRIANGLE_DTYPE)
+            triangles['normal'] = normals / lengths[:, None]
+            triangles['vertices'] = chunk
+            triangles.tofile(f)
+            n_triangles += len(chunk)
+        f.seek(STL_HEADER_SIZE)
+        f.write(struct.pack('<I', n_triangles))
+    return n_triangles
+
+def solid_name(file_path):
+    """ Name of the first solid of an ascii STL, '' if it has none. """
+    with open(file_path, 'rb') as f:
+        match = _solid_name_re.match(f.read(1024))
+    if match is None:
+        return ''
+    return match.group(1).strip().decode('ascii', 'replace')
+
+class MultipleSolidsError(ValueError):
+    pass
+
+class NamedSolidError(ValueError):
+    pass
+
+def convert_ascii_to_binary(src_file, dst_file, header=b''):
+    """ Convert a single, unnamed solid ascii STL to binary. Solid names
+    become the region names of the surface, which binary STL cannot hold:
+    for a named solid NamedSolidError is raised, for files with several
+    solids MultipleSolidsError is raised and dst_file is removed. """
+    if solid_name(src_file):
+        raise NamedSolidError(src_file + ' has a named solid')
+    solids = [0]
+
+    def single_solid_chunks():
+        for chunk in iter_triangles(src_file, solids):
+            if solids[0] > 1:
+                raise MultipleSolidsError(src_file + ' has several solids')
+            yield chunk
+
+    try:
+        return write_binary_stl(dst_file, single_solid_chunks(), header)
+    except MultipleSolidsError:
+        os.remove(dst_file)
+        raise
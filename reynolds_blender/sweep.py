@@ -0,0 +1,223 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# -----------
+# bpy imports
+# -----------
+import bpy
+from bpy.types import Panel
+
+# --------------
+# python imports
+# --------------
+import multiprocessing
+import os
+
+# ------------------------
+# reynolds blender imports
+# ------------------------
+
+from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
+from reynolds_blender.gui.register import register_classes, unregister_classes
+from reynolds_blender.gui.custom_operator import create_custom_operators
+from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.pipeline import STAGES
+from reynolds_blender.cmd_job import FoamCmdGroup
+from reynolds_blender.batch import (SweepError, load_sweep, sweep_variants,
+                                    sweep_stages, set_path, clone_case,
+                                    VariantRunner, write_summary)
+
+# ------------------------------------------------------------------------
+#    operators
+# ------------------------------------------------------------------------
+
+# the running or last sweep, for its summary
+sweep_stats = {'group': None, 'rows': [], 'summary_path': None}
+
+def sweep_dir(scene, case_dir):
+    if scene.sweep_dir_path:
+        return bpy.path.abspath(scene.sweep_dir_path)
+    return os.path.normpath(case_dir) + '_sweep'
+
+def _runner_commands(runner):
+    """ The plain command runners of a runner, sequences flattened. """
+    if hasattr(runner, 'runners'):
+        return [r for sub in runner.runners for r in _runner_commands(sub)]
+    return [runner]
+
+def _variant_runners(self, context, stages, variant_dir, values, saved):
+    """ Set the variant's values, generate its dicts in its case clone and
+    return the command runners of its stages, None if a stage refused to
+    start. """
+    scene = context.scene
+    for path, value in values.items():
+        old = set_path(scene, path, value)
+        saved.setdefault(path, old)
+    scene.case_dir_path = variant_dir
+    runners = []
+    for stage in stages:
+        stage['generate'](self, context)
+        runner = stage['start'](self, context)
+        if runner is None:
+            return None
+        runners += _runner_commands(runner)
+        # the next stage's start checks this stage ran
+        if stage['flag']:
+            setattr(scene, stage['flag'], True)
+    return runners
+
+def start_sweep(self, context):
+    scene = context.scene
+
+    # -------------------------
+    # Start the console operatorr
+    # --------------------------
+    bpy.ops.reynolds.of_console_op()
+
+    case_dir = bpy.path.abspath(scene.case_dir_path)
+    if case_dir is None or case_dir == '':
+        self.report({'ERROR'}, 'Please select a case directory')
+        return None
+
+    try:
+        sweep = load_sweep(bpy.path.abspath(scene.sweep_file_path))
+    except (IOError, OSError, SweepError) as e:
+        self.report({'ERROR'}, 'Sweep: ' + str(e))
+        return None
+
+    # variants run serially, many at a time, so the scene's settings are
+    # restored once every variant's case is generated
+    saved = {'case_dir_path': scene.case_dir_path,
+             'solve_in_parallel': scene.solve_in_parallel,
+             'snappy_parallel': scene.snappy_parallel}
+    for stage in STAGES:
+        if stage['flag']:
+            saved[stage['flag']] = getattr(scene, stage['flag'])
+    saved_values = {}
+    root_dir = sweep_dir(scene, case_dir)
+    variants = []
+    try:
+        scene.solve_in_parallel = False
+        scene.snappy_parallel = False
+        stages, keep_mesh = sweep_stages(
+            sweep, STAGES, lambda stage: stage['enabled'](scene))
+        for i, values in enumerate(sweep_variants(sweep)):
+            name = 'variant_%03d' % i
+            variant_dir = clone_case(case_dir, os.path.join(root_dir, name),
+                                     keep_mesh)
+            runners = _variant_runners(self, context, stages, variant_dir,
+                                       values, saved_values)
+            if runners is None:
+                self.report({'ERROR'}, 'Sweep: could not start ' + name)
+                return None
+            variants.append(VariantRunner(name, variant_dir, runners,
+                                          values))
+    except (OSError, SweepError) as e:
+        # OSError: the case could not be cloned
+        self.report({'ERROR'}, 'Sweep: ' + str(e))
+        return None
+    finally:
+        for path, value in saved_values.items():
+            set_path(scene, path, value)
+        for attr, value in saved.items():
+            setattr(scene, attr, value)
+
+    cores = scene.sweep_core_budget or multiprocessing.cpu_count()
+    print('Sweep of ' + str(len(variants)) + ' variants on ' + str(cores) +
+          ' cores in ' + root_dir)
+    group = FoamCmdGroup('sweep', root_dir, variants, max_concurrent=cores)
+    sweep_stats['group'] = group
+    sweep_stats['rows'] = []
+    return group
+
+def finish_sweep(self, context, run_status):
+    group = sweep_stats['group']
+    rows = [variant.summary(elapsed)
+            for variant, elapsed in zip(group.runners, group.elapsed)]
+    summary_path = os.path.join(group.case_dir, 'sweep_summary.csv')
+    write_summary(summary_path, rows)
+    sweep_stats['rows'] = rows
+    sweep_stats['summary_path'] = summary_path
+
+    done = len([row for row in rows if row['status'] == 'done'])
+    if run_status:
+        self.report({'INFO'}, 'Sweep: SUCCESS')
+    else:
+        self.report({'ERROR'}, 'Sweep: FAILED')
+    self.report({'INFO'}, 'Sweep: %d of %d variants done, summary in %s' %
+                (done, len(rows), summary_path))
+
+# ------------------------------------------------------------------------
+#    Panel
+# ------------------------------------------------------------------------
+
+class SweepPanel(Panel):
+    bl_idname = "of_sweep_panel"
+    bl_label = "Parameter Sweep"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "TOOLS"
+    bl_category = "Tools"
+    bl_context = "objectmode"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        # --------------------------------------
+        # Render Sweep Panel using YAML GUI Spec
+        # --------------------------------------
+
+        gui_renderer = ReynoldsGUIRenderer(scene, layout, 'sweep.yaml')
+        gui_renderer.render()
+
+        rows = sweep_stats['rows']
+        if not rows:
+            return
+        box = layout.box()
+        for row in rows:
+            line = box.row()
+            line.label(text=row['variant'])
+            line.label(text=row['status'])
+            line.label(text=row['time_s'] + ' s')
+            line.label(text=str(row['cells']))
+
+# ------------------------------------------------------------------------
+# register and unregister
+# ------------------------------------------------------------------------
+
+def register():
+    register_classes(__name__)
+    set_scene_attrs('sweep.yaml')
+    create_custom_operators('sweep.yaml', __name__)
+
+def unregister():
+    unregister_classes(__name__)
+    del_scene_attrs('sweep.yaml')
+
+if __name__ == "__main__":
+    register()
@@ -61,6 +61,9 @@ from reynolds_blender.gui.register import register_classes, unregister_classes
 from reynolds_blender.gui.attrs import set_scene_attrs, del_scene_attrs
 from reynolds_blender.gui.custom_operator import create_custom_operators
 from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
+from reynolds_blender.case_writer import write_case_dict
+from reynolds_blender.builders.solver_dicts import build_transport_properties
+from reynolds_blender.builders.snapshot import scene_settings
 
 # ----------------
 # reynolds imports
@@ -68,22 +71,6 @@ from reynolds_blender.gui.renderer import ReynoldsGUIRenderer
 from reynolds.dict.parser import ReynoldsFoamDict
 from reynolds.foam.cmd_runner import FoamCmdRunner
 
-# ------------------------------------------------------------------------
-#    operators
-# ------------------------------------------------------------------------
-
-def generate_laplacianFoam_transport(transport, scene):
-    if scene.tp_dt_scalar_elt1 != "":
-        transport['DT'][1] = scene.tp_dt_scalar_elt1
-    if scene.tp_dt_scalar_elt1 != 0:
-        transport['DT'][2] = scene.tp_dt_scalar_elt2
-
-def generate_icoFoam_transport(transport, scene):
-    if scene.tp_dt_scalar_elt1 != "":
-        transport['nu'][1] = scene.tp_dt_scalar_elt1
-    if scene.tp_dt_scalar_elt1 != 0:
-        transport['nu'][2] = scene.tp_dt_scalar_elt2
-
 # ------------------------------------------------------------------------
 #    Panel
 # ------------------------------------------------------------------------
@@ -100,19 +87,9 @@ class TransportPropertiesOperator(bpy.types.Operator):
         scene = context.scene
         print('Generate transport props for solver: ' + scene.solver_name)
         abs_case_dir_path = bpy.path.abspath(scene.case_dir_path)
-        transport = ReynoldsFoamDict('transportProperties.foam',
-                                     solver_name=scene.solver_name)
-        if scene.solver_name == 'laplacianFoam':
-            generate_laplacianFoam_transport(transport, scene)
-        elif scene.solver_name == 'icoFoam':
-            generate_icoFoam_transport(transport, scene)
-        constant_dir = os.path.join(abs_case_dir_path, "constant")
-        if not os.path.exists(constant_dir):
-            os.makedirs(constant_dir)
-        transport_file_path = os.path.join(constant_dir,
-                                           "transportProperties")
-        with open(transport_file_path, "w+") as f:
-            f.write(str(transport))
+        transport = build_transport_properties(scene_settings(scene))
+        write_case_dict(self, abs_case_dir_path, "constant",
+                        "transportProperties", transport)
         return {'FINISHED'}
 
     # Return True to force redraw
@@ -0,0 +1,229 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The sweep helpers need no blender, run these with:
+#
+#   python -m unittest tests.batch.test_batch
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.batch import (SweepError, load_sweep, sweep_variants,
+                                    sweep_stages, get_path, set_path,
+                                    clone_case, write_summary)
+
+class Scene(object):
+    def __init__(self):
+        self.cd_delta_time = 0.005
+        self.n_cells = [10, 10, 1]
+        self.geo_patches = {'inlet': {'U': {'value': 'uniform (0 0 0)'}}}
+
+STAGES = [{'name': 'blockMesh', 'mesh': 'save'},
+          {'name': 'snappyHexMesh', 'mesh': 'restore'},
+          {'name': 'solver'}]
+
+def _write(file_path, content=''):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w') as f:
+        f.write(content)
+
+class TestLoadSweep(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'sweep.yaml')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def load(self, content):
+        _write(self.file_path, content)
+        return load_sweep(self.file_path)
+
+    def test_load(self):
+        sweep = self.load('mode: zip\n'
+                          'stages: [solver]\n'
+                          'parameters:\n'
+                          '  cd_delta_time: [0.005, 0.0025]\n'
+                          '  n_cells.0: [10, 20]\n')
+        self.assertEqual(sweep['mode'], 'zip')
+        self.assertEqual(sweep['stages'], ['solver'])
+        self.assertEqual(sweep['parameters']['n_cells.0'], [10, 20])
+
+    def test_errors(self):
+        for content in ('', 'parameters: {}\n',
+                        'parameters:\n  a: 1\n',
+                        'mode: grid\nparameters:\n  a: [1]\n',
+                        'mode: zip\nparameters:\n  a: [1]\n  b: [1, 2]\n',
+                        'stages: solver\nparameters:\n  a: [1]\n'):
+            with self.assertRaises(SweepError):
+                self.load(content)
+
+class TestSweepVariants(unittest.TestCase):
+    def test_product(self):
+        sweep = {'mode': 'product',
+                 'parameters': {'b': [1, 2], 'a': ['x', 'y']}}
+        self.assertEqual(sweep_variants(sweep),
+                         [{'a': 'x', 'b': 1}, {'a': 'x', 'b': 2},
+                          {'a': 'y', 'b': 1}, {'a': 'y', 'b': 2}])
+
+    def test_zip(self):
+        sweep = {'mode': 'zip', 'parameters': {'b': [1, 2], 'a': ['x', 'y']}}
+        self.assertEqual(sweep_variants(sweep),
+                         [{'a': 'x', 'b': 1}, {'a': 'y', 'b': 2}])
+
+class TestSweepStages(unittest.TestCase):
+    def select(self, names, enabled=lambda stage: True):
+        stages, keep_mesh = sweep_stages({'stages': names}, STAGES, enabled)
+        return [stage['name'] for stage in stages], keep_mesh
+
+    def test_all(self):
+        self.assertEqual(self.select(None),
+                         (['blockMesh', 'snappyHexMesh', 'solver'], False))
+        self.assertEqual(
+            self.select(None, lambda stage: stage['name'] != 'snappyHexMesh'),
+            (['blockMesh', 'solver'], False))
+
+    def test_without_meshing_the_mesh_is_kept(self):
+        self.assertEqual(self.select(['solver']), (['solver'], True))
+
+    def test_refining_needs_the_background_mesh(self):
+        with self.assertRaises(SweepError):
+            self.select(['snappyHexMesh', 'solver'])
+        # unless it is disabled
+        self.assertEqual(
+            self.select(['snappyHexMesh', 'solver'],
+                        lambda stage: stage['name'] != 'snappyHexMesh'),
+            (['solver'], True))
+
+    def test_unknown_stage(self):
+        with self.assertRaises(SweepError):
+            self.select(['blockmesh'])
+
+class TestPaths(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene()
+
+    def test_get_path(self):
+        self.assertEqual(get_path(self.scene, 'cd_delta_time'), 0.005)
+        self.assertEqual(get_path(self.scene, 'n_cells.1'), 10)
+        self.assertEqual(get_path(self.scene, 'geo_patches.inlet.U.value'),
+                         'uniform (0 0 0)')
+
+    def test_set_path(self):
+        self.assertEqual(set_path(self.scene, 'cd_delta_time', 0.1), 0.005)
+        self.assertEqual(self.scene.cd_delta_time, 0.1)
+        self.assertEqual(set_path(self.scene, 'n_cells.0', 20), 10)
+        self.assertEqual(self.scene.n_cells, [20, 10, 1])
+        old = set_path(self.scene, 'geo_patches.inlet.U',
+                       {'value': 'uniform (1 0 0)'})
+        self.assertEqual(old, {'value': 'uniform (0 0 0)'})
+
+    def test_old_value_is_a_copy(self):
+        old = set_path(self.scene, 'n_cells', [5, 5, 5])
+        self.assertEqual(old, [10, 10, 1])
+        self.assertIsNot(old, self.scene.n_cells)
+
+    def test_missing_path(self):
+        for path in ('no_such_attr', 'n_cells.7', 'geo_patches.outlet.U',
+                     'cd_delta_time.value'):
+            with self.assertRaises(SweepError):
+                set_path(self.scene, path, 1)
+
+class TestCloneCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.case_dir = os.path.join(self.tmp_dir, 'case')
+        for path in ('system/controlDict', '0/U', '0.5/U', 'log.blockMesh',
+                     'processor0/0/U', '.reynolds/pipeline.json',
+                     'constant/polyMesh/blockMeshDict',
+                     'constant/polyMesh/owner',
+                     'constant/triSurface/sphere.stl'):
+            _write(os.path.join(self.case_dir, path))
+        self.clone_dir = os.path.join(self.tmp_dir, 'sweep', 'variant_000')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def cloned(self):
+        return sorted(os.path.relpath(os.path.join(root, name),
+                                      self.clone_dir)
+                      for root, dirs, files in os.walk(self.clone_dir)
+                      for name in files)
+
+    def test_clone(self):
+        self.assertEqual(clone_case(self.case_dir, self.clone_dir),
+                         self.clone_dir)
+        self.assertEqual(self.cloned(),
+                         ['0/U', 'constant/polyMesh/blockMeshDict',
+                          'constant/triSurface/sphere.stl',
+                          'system/controlDict'])
+        stl = 'constant/triSurface/sphere.stl'
+        self.assertTrue(os.path.samefile(os.path.join(self.case_dir, stl),
+                                         os.path.join(self.clone_dir, stl)))
+
+    def test_keep_mesh(self):
+        clone_case(self.case_dir, self.clone_dir, keep_mesh=True)
+        self.assertIn('constant/polyMesh/owner', self.cloned())
+
+    def test_replaces_earlier_clone(self):
+        _write(os.path.join(self.clone_dir, '1/U'))
+        clone_case(self.case_dir, self.clone_dir)
+        self.assertNotIn('1/U', self.cloned())
+
+    def test_missing_case(self):
+        with self.assertRaises(OSError):
+            clone_case(os.path.join(self.tmp_dir, 'nowhere'), self.clone_dir)
+
+class TestWriteSummary(unittest.TestCase):
+    def test_columns(self):
+        file_path = os.path.join(tempfile.mkdtemp(), 'sweep_summary.csv')
+        try:
+            columns = write_summary(file_path,
+                                    [{'variant': 'v0', 'status': 'done'},
+                                     {'variant': 'v1', 'status': 'failed',
+                                      'cells': 400}])
+            self.assertEqual(columns, ['variant', 'status', 'cells'])
+            with open(file_path) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(rows[0]['cells'], '')
+            self.assertEqual(rows[1]['cells'], '400')
+        finally:
+            shutil.rmtree(os.path.dirname(file_path))
+
+if __name__ == '__main__':
+    unittest.main()
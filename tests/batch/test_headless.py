@@ -0,0 +1,127 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The case descriptions need no blender, run these with:
+#
+#   python -m unittest tests.batch.test_headless
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.batch import SweepError
+from reynolds_blender.headless import (HeadlessError, HeadlessOperator,
+                                       load_case_description, apply_settings,
+                                       main)
+
+class Scene(object):
+    def __init__(self):
+        self.solver_name = 'icoFoam'
+        self.n_cells = [10, 10, 1]
+
+class TestCaseDescription(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, content):
+        file_path = os.path.join(self.tmp_dir, name)
+        with open(file_path, 'w') as f:
+            f.write(content)
+        return file_path
+
+    def test_yaml(self):
+        description = load_case_description(self.write(
+            'cavity.yaml',
+            'blend: cavity.blend\n'
+            'case_dir: runs/cavity\n'
+            'settings:\n'
+            '  cd_delta_time: 0.005\n'
+            '  block_cells_pg.n_cells: [20, 20, 1]\n'))
+        self.assertEqual(description['name'], 'cavity')
+        # relative paths are relative to the description
+        self.assertEqual(description['blend'],
+                         os.path.join(self.tmp_dir, 'cavity.blend'))
+        self.assertEqual(description['case_dir'],
+                         os.path.join(self.tmp_dir, 'runs/cavity'))
+        self.assertEqual(description['settings']['block_cells_pg.n_cells'],
+                         [20, 20, 1])
+
+    def test_json(self):
+        case_dir = os.path.join(self.tmp_dir, 'elsewhere')
+        description = load_case_description(self.write(
+            'case.json', json.dumps({'name': 'first', 'case_dir': case_dir,
+                                     'force': True})))
+        self.assertEqual(description['name'], 'first')
+        self.assertEqual(description['case_dir'], case_dir)
+        self.assertNotIn('blend', description)
+
+    def test_no_case_dir(self):
+        for content in ('blend: cavity.blend\n', '- case_dir: cavity\n', ''):
+            with self.assertRaises(HeadlessError):
+                load_case_description(self.write('broken.yaml', content))
+
+    def test_apply_settings(self):
+        scene = Scene()
+        apply_settings(scene, {'solver_name': 'simpleFoam', 'n_cells.2': 4})
+        self.assertEqual(scene.solver_name, 'simpleFoam')
+        self.assertEqual(scene.n_cells, [10, 10, 4])
+        apply_settings(scene, None)
+        with self.assertRaises(SweepError):
+            apply_settings(scene, {'no_such_attr': 1})
+
+    def test_operator(self):
+        operator = HeadlessOperator('cavity')
+        operator.report({'INFO'}, 'blockMesh : SUCCESS')
+        operator.report({'ERROR'}, 'Pipeline stopped at solver')
+        self.assertEqual(operator.errors(), ['Pipeline stopped at solver'])
+
+    def test_main_summary(self):
+        summary_path = os.path.join(self.tmp_dir, 'summary.json')
+        missing = os.path.join(self.tmp_dir, 'missing.yaml')
+        self.assertEqual(main([missing, '--summary', summary_path]), 1)
+        with open(summary_path) as f:
+            results = json.load(f)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['case'], missing)
+        self.assertFalse(results[0]['success'])
+        self.assertTrue(results[0]['error'])
+
+if __name__ == '__main__':
+    unittest.main()
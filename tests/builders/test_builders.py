@@ -0,0 +1,128 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The builders need no blender, run these with reynolds installed:
+#
+#   python -m unittest tests.builders.test_builders
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.builders.case import render_case_dicts, write_case_files
+from reynolds_blender.builders.mesh_dicts import (build_blockmeshdict,
+                                                  build_snappyhexmeshdict)
+from reynolds_blender.builders.settings import Settings, default_settings
+from reynolds_blender.builders.solver_dicts import build_controldict
+
+class TestBuilders(unittest.TestCase):
+    def setUp(self):
+        self.settings = default_settings()
+        self.settings.solver_name = 'icoFoam'
+        self.settings.block_cells_pg = Settings(n_cells=(20, 20, 1),
+                                                n_grading=(1, 1, 1),
+                                                convert_to_meters=0.1)
+        self.settings.regions = {
+            'movingWall': ['movingWall', 'wall', ['Top'], {}],
+            'fixedWalls': ['fixedWalls', 'wall', ['Left', 'Right'], {}]}
+        self.extent = ([0.0, 0.0, 0.0], [1.0, 1.0, 0.1])
+        self.case_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.case_dir)
+
+    def test_controldict(self):
+        self.settings.cd_end_time = 0.5
+        control_dict = build_controldict(self.settings)
+        self.assertEqual(control_dict['application'], 'icoFoam')
+        self.assertEqual(control_dict['endTime'], 0.5)
+
+    def test_blockmeshdict(self):
+        block_mesh_dict = build_blockmeshdict(self.settings, self.extent)
+        self.assertEqual(block_mesh_dict['vertices'][6], [1.0, 1.0, 0.1])
+        self.assertEqual(block_mesh_dict['blocks'][2], [20, 20, 1])
+        boundary = block_mesh_dict['boundary']
+        i = boundary.index('movingWall')
+        self.assertEqual(boundary[i + 1]['faces'], [[3, 7, 6, 2]])
+
+    def test_snappyhexmeshdict(self):
+        self.settings.geometries = {
+            'flange': {'file_path': '/geometry/flange.stl',
+                       'type': 'triSurfaceMesh', 'has_features': False,
+                       'refinement_type': 'Surface',
+                       'refinementSurface': {'min': 2, 'max': 4}}}
+        snappy_dict = build_snappyhexmeshdict(self.settings)
+        self.assertEqual(snappy_dict['geometry']['flange.stl']['name'],
+                         'flange')
+        controls = snappy_dict['castellatedMeshControls']
+        self.assertEqual(controls['refinementSurfaces']['flange']['level'],
+                         [2, 4])
+
+    def test_snappyhexmeshdict_features(self):
+        # every geometry with features keeps its feature file, not only the
+        # last one
+        self.settings.geometries = dict(
+            ('part%d' % i, {'file_path': '/geometry/part%d.stl' % i,
+                            'type': 'triSurfaceMesh',
+                            'has_features': i != 1,
+                            'feature_level': i,
+                            'refinement_type': 'None'})
+            for i in range(4))
+        snappy_dict = build_snappyhexmeshdict(self.settings)
+        features = snappy_dict['castellatedMeshControls']['features']
+        self.assertEqual(sorted((f['file'], f['level']) for f in features),
+                         [('"part0.eMesh"', 0), ('"part2.eMesh"', 2),
+                          ('"part3.eMesh"', 3)])
+        self.assertEqual(len(snappy_dict['geometry']), 4)
+
+    def test_render_pickles(self):
+        settings = pickle.loads(pickle.dumps(self.settings))
+        self.assertEqual(settings, self.settings)
+        case_files = render_case_dicts(settings, self.extent)
+        self.assertIn(os.path.join('system', 'blockMeshDict'), case_files)
+        self.assertNotIn(os.path.join('system', 'snappyHexMeshDict'),
+                         case_files)
+        self.assertEqual(pickle.loads(pickle.dumps(case_files)), case_files)
+
+    def test_write_case_files(self):
+        case_files = render_case_dicts(self.settings, self.extent)
+        written = write_case_files(self.case_dir, case_files)
+        self.assertEqual(written, sorted(case_files))
+        self.assertEqual(write_case_files(self.case_dir, case_files), [])
+
+if __name__ == '__main__':
+    unittest.main()
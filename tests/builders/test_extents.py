@@ -0,0 +1,144 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The extent service needs no blender, run these with:
+#
+#   python -m unittest tests.builders.test_extents
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.extents import (world_extent, world_size, foam_extent,
+                                      foam_points, stl_extent,
+                                      clear_extent_cache)
+
+IDENTITY = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
+
+class Vertices(object):
+    def __init__(self, coords):
+        self.coords = coords
+
+    def __len__(self):
+        return len(self.coords)
+
+    def foreach_get(self, name, out):
+        out[:] = np.ravel(self.coords)
+
+class Mesh(object):
+    def __init__(self, coords):
+        self.vertices = Vertices(coords)
+
+class Object(dict):
+    """ Stands in for a blender mesh object. """
+
+    def __init__(self, coords, matrix=IDENTITY, **props):
+        dict.__init__(self, **props)
+        self.type = 'MESH'
+        self.data = Mesh(coords)
+        self.matrix_world = matrix
+        lo, hi = np.min(coords, axis=0), np.max(coords, axis=0)
+        self.bound_box = [(x, y, z) for x in (lo[0], hi[0])
+                          for y in (lo[1], hi[1]) for z in (lo[2], hi[2])]
+
+    def as_pointer(self):
+        return id(self)
+
+# a unit cube around the origin
+CUBE = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+
+class TestExtents(unittest.TestCase):
+    def setUp(self):
+        clear_extent_cache()
+
+    def test_moved_and_scaled(self):
+        obj = Object(CUBE, [[2, 0, 0, 1], [0, 1, 0, 0], [0, 0, 3, 0],
+                            [0, 0, 0, 1]])
+        lo, hi = world_extent(obj)
+        self.assertEqual(lo.tolist(), [-1.0, -1.0, -3.0])
+        self.assertEqual(hi.tolist(), [3.0, 1.0, 3.0])
+        self.assertEqual(world_size(obj).tolist(), [4.0, 2.0, 6.0])
+        # openfoam's y axis is blender's z axis
+        self.assertEqual(foam_extent(obj),
+                         ([-1.0, -3.0, -1.0], [3.0, 3.0, 1.0]))
+
+    def test_rotated_uses_the_vertices(self):
+        # a quarter turn about z of a flat square is still tight
+        c, s = 0.0, 1.0
+        obj = Object([(0, 0, 0), (2, 0, 0), (2, 1, 0), (0, 1, 0)],
+                     [[c, -s, 0, 0], [s, c, 0, 0], [0, 0, 1, 0],
+                      [0, 0, 0, 1]])
+        lo, hi = world_extent(obj)
+        self.assertEqual(lo.tolist(), [-1.0, 0.0, 0.0])
+        self.assertEqual(hi.tolist(), [0.0, 2.0, 0.0])
+
+    def test_cached_until_moved(self):
+        obj = Object(CUBE)
+        first = world_extent(obj)
+        self.assertIs(world_extent(obj), first)
+        obj.matrix_world = [[1, 0, 0, 5]] + IDENTITY[1:]
+        self.assertEqual(world_extent(obj)[0].tolist(), [4.0, -1.0, -1.0])
+
+    def test_foam_points(self):
+        self.assertEqual(foam_points([[1, 2, 3]]).tolist(), [[1, 3, 2]])
+
+class TestStlExtent(unittest.TestCase):
+    def setUp(self):
+        clear_extent_cache()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.stl_path = os.path.join(self.tmp_dir, 'tri.stl')
+        with open(self.stl_path, 'w') as f:
+            f.write('solid\n facet normal 0 0 1\n  outer loop\n'
+                    '   vertex 1 2 3\n   vertex 4 5 6\n   vertex 1 5 3\n'
+                    '  endloop\n endfacet\nendsolid\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_stl_extent(self):
+        # import_stl maps the file's (x, y, z) to (-x, z, y)
+        lo, hi = stl_extent(self.stl_path)
+        self.assertEqual(lo.tolist(), [-4.0, 3.0, 2.0])
+        self.assertEqual(hi.tolist(), [-1.0, 6.0, 5.0])
+
+    def test_imported_object_uses_its_file(self):
+        obj = Object(CUBE, stl_file_path=self.stl_path)
+        self.assertEqual(world_extent(obj)[0].tolist(), [-4.0, 3.0, 2.0])
+
+if __name__ == '__main__':
+    unittest.main()
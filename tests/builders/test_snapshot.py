@@ -0,0 +1,151 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The snapshot needs no blender, run these with:
+#
+#   python -m unittest tests.builders.test_snapshot
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.builders.snapshot import (SceneSnapshot, scene_snapshot,
+                                                reset_snapshots,
+                                                mark_dirty_update)
+
+class Scene(object):
+    """ Stands in for a blender scene, counting attribute reads. """
+
+    def __init__(self, **values):
+        self.__dict__['values'] = values
+        self.__dict__['reads'] = []
+
+    def __getattr__(self, name):
+        if name not in self.values:
+            raise AttributeError(name)
+        self.reads.append(name)
+        return self.values[name]
+
+    def __setattr__(self, name, value):
+        self.values[name] = value
+
+class TestSceneSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene(cd_end_time=0.5, cd_write_control='timeStep',
+                           max_non_ortho=65, location_in_mesh=(1.0, 2.0, 3.0),
+                           geometries={}, panel_expanded=False)
+        self.snapshot = SceneSnapshot()
+        self.snapshot.add_spec('controlDict.yaml',
+                               {'cd_end_time': {'type': 'Float'},
+                                'cd_write_control': {'type': 'Enum'}})
+        self.snapshot.add_spec('mesh_quality.yaml',
+                               {'max_non_ortho': {'type': 'Int'}})
+        self.snapshot.add_spec('feature_extraction.yaml',
+                               {'location_in_mesh': {'type': 'FloatVector'}})
+        self.snapshot.add_spec('common_attrs.yaml',
+                               {'geometries': {'type': 'PyDict'}})
+        self.snapshot.add_spec('geometry.yaml',
+                               {'panel_expanded': {'type': 'Bool'}})
+
+    def take_clean(self):
+        settings = self.snapshot.take(self.scene)
+        self.snapshot.generated(list(self.snapshot.stale))
+        del self.scene.reads[:]
+        return settings
+
+    def test_first_take_reads_all(self):
+        settings = self.snapshot.take(self.scene)
+        self.assertEqual(settings.cd_end_time, 0.5)
+        self.assertEqual(settings.location_in_mesh, (1.0, 2.0, 3.0))
+        self.assertIn('system/controlDict', self.snapshot.stale)
+
+    def test_reads_only_dirty(self):
+        self.take_clean()
+        self.scene.cd_end_time = 2.0
+        self.snapshot.mark_dirty('cd_end_time')
+        settings = self.snapshot.take(self.scene)
+        self.assertEqual(settings.cd_end_time, 2.0)
+        # python dicts have no update callback, they are compared
+        self.assertEqual(sorted(self.scene.reads),
+                         ['cd_end_time', 'geometries'])
+        self.assertEqual(self.snapshot.changed, set(['cd_end_time']))
+        self.assertEqual(self.snapshot.stale, set(['system/controlDict']))
+
+    def test_unchanged_value_is_not_stale(self):
+        self.take_clean()
+        self.snapshot.mark_dirty('max_non_ortho')
+        self.snapshot.take(self.scene)
+        self.assertEqual(self.snapshot.changed, set())
+        self.assertFalse(self.snapshot.stale)
+
+    def test_panel_state_is_not_stale(self):
+        self.take_clean()
+        self.scene.panel_expanded = True
+        self.snapshot.mark_dirty('panel_expanded')
+        settings = self.snapshot.take(self.scene)
+        self.assertTrue(settings.panel_expanded)
+        self.assertFalse(self.snapshot.stale)
+
+    def test_py_dict_change_is_stale(self):
+        self.take_clean()
+        self.scene.geometries['flange'] = {'type': 'triSurfaceMesh'}
+        self.snapshot.take(self.scene)
+        self.assertTrue(self.snapshot.is_stale(['system/snappyHexMeshDict']))
+        self.assertTrue(self.snapshot.is_stale(
+            ['system/surfaceFeatureExtractDict']))
+        self.assertFalse(self.snapshot.is_stale(['system/controlDict']))
+
+class TestSceneSnapshots(unittest.TestCase):
+    def tearDown(self):
+        reset_snapshots()
+
+    def test_snapshot_per_scene(self):
+        scene, other = Scene(cd_end_time=0.5), Scene(cd_end_time=0.5)
+        self.assertIs(scene_snapshot(scene), scene_snapshot(scene))
+        self.assertIsNot(scene_snapshot(scene), scene_snapshot(other))
+        mark_dirty_update('cd_end_time')(scene, None)
+        self.assertIn('cd_end_time', scene_snapshot(scene).dirty)
+        self.assertNotIn('cd_end_time', scene_snapshot(other).dirty)
+
+    def test_reset_reads_again(self):
+        scene = Scene(cd_end_time=0.5)
+        snapshot = scene_snapshot(scene)
+        snapshot.take(scene)
+        snapshot.generated(list(snapshot.stale))
+        reset_snapshots()
+        self.assertIsNot(scene_snapshot(scene), snapshot)
+        self.assertIsNone(scene_snapshot(scene).settings)
+        self.assertTrue(scene_snapshot(scene).is_stale(['system/controlDict']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The proxy decimation needs no blender, run these with:
+#
+#   python -m unittest tests.io.test_decimate
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import unittest
+
+import numpy as np
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.decimate import (cluster_triangles, decimate_to_budget,
+                                       box_triangles, fan_triangulate)
+
+def grid_triangles(n):
+    """ (2 n^2, 3, 3) triangles of an n by n grid on the unit square. """
+    triangles = []
+    for i in range(n):
+        for j in range(n):
+            a, b = (i / n, j / n, 0), ((i + 1) / n, j / n, 0)
+            c, d = ((i + 1) / n, (j + 1) / n, 0), (i / n, (j + 1) / n, 0)
+            triangles += [(a, b, c), (a, c, d)]
+    return np.array(triangles, dtype=np.float64)
+
+LO, HI = (0.0, 0.0, 0.0), (1.0, 1.0, 0.0)
+
+class TestDecimate(unittest.TestCase):
+    def test_weld(self):
+        triangles = grid_triangles(4)
+        # split into chunks, which share vertices along the cut
+        vertices, faces = cluster_triangles([triangles[:10], triangles[10:]],
+                                            LO, HI, 1 << 20)
+        self.assertEqual(len(vertices), 25)
+        self.assertEqual(len(faces), 32)
+
+    def test_duplicates_and_collapsed_triangles(self):
+        triangles = grid_triangles(1)
+        degenerate = np.array([[(0, 0, 0), (0, 0, 0), (1, 1, 0)]],
+                              dtype=np.float64)
+        vertices, faces = cluster_triangles(
+            [triangles, triangles[::-1], degenerate], LO, HI, 1 << 20)
+        self.assertEqual(len(faces), 2)
+
+    def test_budget(self):
+        triangles = grid_triangles(32)
+        vertices, faces = decimate_to_budget(lambda: [triangles], LO, HI,
+                                             len(triangles), 200)
+        self.assertLessEqual(len(faces), 200)
+        self.assertGreater(len(faces), 0)
+        # the vertices stay on the surface
+        self.assertTrue((vertices[:, 2] == 0).all())
+        self.assertTrue(((vertices >= 0) & (vertices <= 1)).all())
+
+    def test_under_budget_is_only_welded(self):
+        triangles = grid_triangles(4)
+        vertices, faces = decimate_to_budget(lambda: [triangles], LO, HI,
+                                             len(triangles), 1000)
+        self.assertEqual((len(vertices), len(faces)), (25, 32))
+
+    def test_empty(self):
+        vertices, faces = cluster_triangles([np.empty((0, 3, 3))], LO, HI, 8)
+        self.assertEqual((vertices.shape, faces.shape), ((0, 3), (0, 3)))
+
+    def test_box(self):
+        vertices, faces = box_triangles((0, 0, 0), (1, 2, 3))
+        self.assertEqual((len(vertices), len(faces)), (8, 12))
+        # outward facing: the normals point away from the centre
+        corners = vertices[faces]
+        normals = np.cross(corners[:, 1] - corners[:, 0],
+                           corners[:, 2] - corners[:, 0])
+        outward = corners.mean(axis=1) - vertices.mean(axis=0)
+        self.assertTrue(((normals * outward).sum(axis=1) > 0).all())
+
+    def test_fan_triangulate(self):
+        self.assertEqual(fan_triangulate([0, 1, 2, 3, 4, 5, 6],
+                                         [4, 3]).tolist(),
+                         [[0, 1, 2], [0, 2, 3], [4, 5, 6]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The OBJ reader needs no blender, run these with:
+#
+#   python -m unittest tests.io.test_obj_io
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import shutil
+import tempfile
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender import obj_io
+from reynolds_blender.obj_io import read_obj, obj_to_blender
+
+# two objects, each a quad with an edge, indexed relative to their own
+# vertices
+RELATIVE = b'''o first
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+f -4 -3 -2 -1
+l -4 -2
+o second
+v 0 0 1
+v 1 0 1
+v 1 1 1
+v 0 1 1
+f -4/-4/-1 -3/-3/-1 -2/-2/-1 -1/-1/-1
+l -1 -2
+'''
+
+ABSOLUTE = b'''v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+v 0 0 1
+v 1 0 1
+v 1 1 1
+v 0 1 1
+f 1 2 3 4
+l 1 3
+f 5/1 6/2 7/3 8/4
+l 8 7
+'''
+
+class TestReadObj(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.read_size = obj_io.READ_SIZE
+
+    def tearDown(self):
+        obj_io.READ_SIZE = self.read_size
+        shutil.rmtree(self.tmp_dir)
+
+    def read(self, content):
+        file_path = os.path.join(self.tmp_dir, 'mesh.obj')
+        with open(file_path, 'wb') as f:
+            f.write(content)
+        return read_obj(file_path)
+
+    def check(self, vertices, loops, sizes, edges):
+        self.assertEqual(vertices.shape, (8, 3))
+        self.assertEqual(vertices[6].tolist(), [1.0, 1.0, 1.0])
+        self.assertEqual(loops.tolist(), [0, 1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(sizes.tolist(), [4, 4])
+        self.assertEqual(edges.tolist(), [[0, 2], [7, 6]])
+
+    def test_absolute_indices(self):
+        self.check(*self.read(ABSOLUTE))
+
+    def test_relative_indices_of_two_objects(self):
+        self.check(*self.read(RELATIVE))
+
+    def test_relative_indices_across_blocks(self):
+        # blocks end at the first line end past READ_SIZE bytes
+        for read_size in (1, 20, 60, 100):
+            obj_io.READ_SIZE = read_size
+            self.check(*self.read(RELATIVE))
+
+    def test_empty_file(self):
+        vertices, loops, sizes, edges = self.read(b'')
+        self.assertEqual(vertices.shape, (0, 3))
+        self.assertEqual((len(loops), len(sizes)), (0, 0))
+        self.assertEqual(edges.shape, (0, 2))
+
+    def test_obj_to_blender(self):
+        self.assertEqual(obj_to_blender([(1.0, 2.0, 3.0)]).tolist(),
+                         [[1.0, -3.0, 2.0]])
+
+if __name__ == '__main__':
+    unittest.main()
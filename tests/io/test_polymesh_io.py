@@ -0,0 +1,224 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The polyMesh reader needs no blender, run these with:
+#
+#   python -m unittest tests.io.test_polymesh_io
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.polymesh_io import (read_points, read_faces,
+                                          read_labels, read_boundary,
+                                          read_mesh_size, read_cell_zones,
+                                          patch_faces, zone_faces,
+                                          ArrayCache, array_bytes)
+
+def _header(cls, name, note='', fmt='ascii'):
+    return ('FoamFile\n{\n    version 2.0;\n    format %s;\n'
+            '    arch "LSB;label=32;scalar=64";\n    class %s;\n'
+            '    note "%s";\n    object %s;\n}\n' % (fmt, cls, note, name))
+
+# a single hex cell, its six faces split over two patches
+POINTS = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+          (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]
+FACES = [(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+         (2, 3, 7, 6), (0, 4, 7, 3), (1, 2, 6, 5)]
+BOUNDARY = '''2
+(
+    bottom
+    {
+        type wall;
+        nFaces 1;
+        startFace 0;
+    }
+    sides
+    {
+        type patch;
+        nFaces 5;
+        startFace 1;
+    }
+)
+'''
+
+def write_mesh(polymesh_dir, compress=False):
+    os.makedirs(polymesh_dir)
+    files = {
+        'points': (_header('vectorField', 'points') + '8\n(\n' +
+                   '\n'.join('(%d %d %d)' % p for p in POINTS) + '\n)\n'),
+        'faces': (_header('faceList', 'faces') + '6\n(\n' +
+                  '\n'.join('4(%d %d %d %d)' % f for f in FACES) + '\n)\n'),
+        'owner': (_header('labelList', 'owner',
+                          'nPoints:8  nCells:1  nFaces:6  nInternalFaces:0') +
+                  '6\n(\n0\n0\n0\n0\n0\n0\n)\n'),
+        'neighbour': _header('labelList', 'neighbour') + '0\n(\n)\n',
+        'boundary': _header('polyBoundaryMesh', 'boundary') + BOUNDARY,
+    }
+    for name, content in files.items():
+        if compress:
+            with gzip.open(os.path.join(polymesh_dir, name + '.gz'),
+                           'wb') as f:
+                f.write(content.encode('ascii'))
+        else:
+            with open(os.path.join(polymesh_dir, name), 'w') as f:
+                f.write(content)
+
+class TestReadPolyMesh(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.polymesh_dir = os.path.join(self.tmp_dir, 'polyMesh')
+        write_mesh(self.polymesh_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_points(self):
+        points = read_points(self.polymesh_dir)
+        self.assertEqual(points.shape, (8, 3))
+        self.assertEqual(points[6].tolist(), [1.0, 1.0, 1.0])
+
+    def test_faces(self):
+        loops, offsets = read_faces(self.polymesh_dir)
+        self.assertEqual(offsets.tolist(), [0, 4, 8, 12, 16, 20, 24])
+        self.assertEqual(loops[4:8].tolist(), list(FACES[1]))
+
+    def test_boundary_and_size(self):
+        patches = read_boundary(self.polymesh_dir)
+        self.assertEqual([(p['name'], p['type'], p['nFaces'], p['startFace'])
+                          for p in patches],
+                         [('bottom', 'wall', 1, 0), ('sides', 'patch', 5, 1)])
+        self.assertEqual(read_mesh_size(self.polymesh_dir),
+                         {'nPoints': 8, 'nCells': 1, 'nFaces': 6,
+                          'nInternalFaces': 0})
+
+    def test_no_cell_zones(self):
+        self.assertEqual(read_cell_zones(self.polymesh_dir), [])
+
+    def test_patch_faces(self):
+        points = read_points(self.polymesh_dir)
+        faces = read_faces(self.polymesh_dir)
+        vertices, loops, sizes = patch_faces(points, faces, 0, 1)
+        self.assertEqual(len(vertices), 4)
+        self.assertEqual(sizes.tolist(), [4])
+        self.assertTrue((vertices[:, 2] == 0).all())
+        self.assertEqual(sorted(loops.tolist()), [0, 1, 2, 3])
+
+    def test_zone_faces(self):
+        owner = read_labels(self.polymesh_dir, 'owner')
+        neighbour = read_labels(self.polymesh_dir, 'neighbour')
+        faces = zone_faces(owner, neighbour, np.array([0]), 1)
+        self.assertEqual(faces.tolist(), [0, 1, 2, 3, 4, 5])
+
+    def test_gzipped(self):
+        gz_dir = os.path.join(self.tmp_dir, 'gz', 'polyMesh')
+        write_mesh(gz_dir, compress=True)
+        self.assertEqual(read_points(gz_dir).tolist(),
+                         read_points(self.polymesh_dir).tolist())
+        self.assertEqual(len(read_boundary(gz_dir)), 2)
+
+    def test_binary_points_are_copied_into_the_cache(self):
+        values = np.array(POINTS, dtype='<f8')
+        with open(os.path.join(self.polymesh_dir, 'points'), 'wb') as f:
+            f.write(_header('vectorField', 'points',
+                            fmt='binary').encode('ascii'))
+            f.write(b'8\n(')
+            f.write(values.tobytes())
+            f.write(b')\n')
+        cache = ArrayCache(1 << 20)
+        points, = cache.get('points',
+                            lambda: (read_points(self.polymesh_dir),))
+        self.assertEqual(points.tolist(), values.tolist())
+        # the cached copy does not keep the mapped file
+        self.assertIsNone(points.base)
+
+class TestArrayCache(unittest.TestCase):
+    def arrays(self, n):
+        return (np.zeros(n, dtype=np.uint8),)
+
+    def test_hit_and_miss(self):
+        cache = ArrayCache(100)
+        loads = []
+        load = lambda: loads.append(1) or self.arrays(10)
+        first = cache.get('a', load)
+        self.assertIs(cache.get('a', load), first)
+        self.assertEqual((cache.hits, cache.misses, len(loads)), (1, 1, 1))
+        self.assertEqual(cache.size, 10)
+
+    def test_missing_name(self):
+        cache = ArrayCache(100)
+        self.assertIsNone(cache.get(('patch', 'nowhere'), lambda: None))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+        # a later load of that key is not answered from the cache
+        self.assertEqual(len(cache.get(('patch', 'nowhere'),
+                                       lambda: self.arrays(4))[0]), 4)
+
+    def test_budget_evicts_least_recently_used(self):
+        cache = ArrayCache(100)
+        cache.get('a', lambda: self.arrays(40))
+        cache.get('b', lambda: self.arrays(40))
+        cache.get('a', lambda: self.arrays(40))
+        cache.get('c', lambda: self.arrays(40))
+        self.assertEqual(sorted(cache._entries), ['a', 'c'])
+        self.assertEqual(cache.size, 80)
+
+    def test_entry_over_budget_is_not_kept(self):
+        cache = ArrayCache(100)
+        cache.get('a', lambda: self.arrays(40))
+        big = cache.get('big', lambda: self.arrays(200))
+        self.assertEqual(len(big[0]), 200)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_retain_and_clear(self):
+        cache = ArrayCache(100)
+        cache.get(('old', 'a'), lambda: self.arrays(10))
+        cache.get(('new', 'a'), lambda: self.arrays(20))
+        cache.retain(lambda key: key[0] == 'new')
+        self.assertEqual((len(cache), cache.size), (1, 20))
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+    def test_array_bytes(self):
+        self.assertEqual(array_bytes(None), 0)
+        self.assertEqual(array_bytes(self.arrays(3) + self.arrays(5)), 8)
+
+if __name__ == '__main__':
+    unittest.main()
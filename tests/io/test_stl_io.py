@@ -0,0 +1,159 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The STL reader and the geometry staging need no blender, run these with:
+#
+#   python -m unittest tests.io.test_stl_io
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.stl_io import (MultipleSolidsError, NamedSolidError,
+                                     convert_ascii_to_binary, is_binary_stl,
+                                     read_binary_triangles, solid_name,
+                                     stl_stats, write_binary_stl)
+from reynolds_blender.staging import stage_file
+
+# two triangles of the unit square in z = 0
+TRIANGLES = [[(0, 0, 0), (1, 0, 0), (1, 1, 0)],
+             [(0, 0, 0), (1, 1, 0), (0, 1, 0)]]
+
+def ascii_solid(name, triangles=TRIANGLES):
+    facets = ''.join('  facet normal 0 0 1\n    outer loop\n' +
+                     ''.join('      vertex %g %g %g\n' % v for v in triangle) +
+                     '    endloop\n  endfacet\n' for triangle in triangles)
+    return 'solid %s\n%sendsolid %s\n' % (name, facets, name)
+
+class StlTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, content):
+        file_path = os.path.join(self.tmp_dir, name)
+        with open(file_path, 'w') as f:
+            f.write(content)
+        return file_path
+
+class TestStlIo(StlTestCase):
+    def test_ascii_stats(self):
+        file_path = self.write('square.stl', ascii_solid(''))
+        stats = stl_stats(file_path)
+        self.assertFalse(stats['binary'])
+        self.assertEqual((stats['solids'], stats['triangles']), (1, 2))
+        self.assertEqual(stats['min'], [0.0, 0.0, 0.0])
+        self.assertEqual(stats['max'], [1.0, 1.0, 0.0])
+        self.assertAlmostEqual(stats['area'], 1.0)
+
+    def test_binary(self):
+        file_path = os.path.join(self.tmp_dir, 'square.stl')
+        self.assertEqual(write_binary_stl(file_path,
+                                          [np.array(TRIANGLES, dtype=float)]),
+                         2)
+        self.assertTrue(is_binary_stl(file_path))
+        self.assertEqual(read_binary_triangles(file_path).tolist(),
+                         np.array(TRIANGLES, dtype=np.float32).tolist())
+        stats = stl_stats(file_path)
+        self.assertEqual((stats['binary'], stats['triangles']), (True, 2))
+
+    def test_solid_name(self):
+        self.assertEqual(solid_name(self.write('a.stl', ascii_solid(''))), '')
+        self.assertEqual(solid_name(self.write('b.stl',
+                                               ascii_solid('inlet'))),
+                         'inlet')
+
+    def test_convert_unnamed_solid(self):
+        src_file = self.write('square.stl', ascii_solid(''))
+        dst_file = os.path.join(self.tmp_dir, 'binary.stl')
+        self.assertEqual(convert_ascii_to_binary(src_file, dst_file), 2)
+        self.assertTrue(is_binary_stl(dst_file))
+        self.assertAlmostEqual(stl_stats(dst_file)['area'], 1.0)
+
+    def test_named_solid_is_not_converted(self):
+        src_file = self.write('square.stl', ascii_solid('inlet'))
+        dst_file = os.path.join(self.tmp_dir, 'binary.stl')
+        with self.assertRaises(NamedSolidError):
+            convert_ascii_to_binary(src_file, dst_file)
+        self.assertFalse(os.path.exists(dst_file))
+
+    def test_multiple_solids_are_not_converted(self):
+        src_file = self.write('square.stl', ascii_solid('') + ascii_solid(''))
+        dst_file = os.path.join(self.tmp_dir, 'binary.stl')
+        with self.assertRaises(MultipleSolidsError):
+            convert_ascii_to_binary(src_file, dst_file)
+        self.assertFalse(os.path.exists(dst_file))
+        self.assertEqual(stl_stats(src_file)['solids'], 2)
+
+class TestStageFile(StlTestCase):
+    def setUp(self):
+        StlTestCase.setUp(self)
+        self.dst_dir = os.path.join(self.tmp_dir, 'triSurface')
+        os.makedirs(self.dst_dir)
+
+    def test_unnamed_solid_is_converted(self):
+        src_file = self.write('square.stl', ascii_solid(''))
+        self.assertEqual(stage_file(src_file, self.dst_dir), 'converted')
+        self.assertTrue(is_binary_stl(os.path.join(self.dst_dir,
+                                                   'square.stl')))
+        self.assertEqual(stage_file(src_file, self.dst_dir), 'unchanged')
+
+    def test_named_solid_keeps_its_name(self):
+        src_file = self.write('inlet.stl', ascii_solid('inlet'))
+        self.assertEqual(stage_file(src_file, self.dst_dir), 'linked')
+        dst_file = os.path.join(self.dst_dir, 'inlet.stl')
+        self.assertEqual(solid_name(dst_file), 'inlet')
+        self.assertEqual(stage_file(src_file, self.dst_dir), 'unchanged')
+
+    def test_multiple_solids_are_linked(self):
+        src_file = self.write('walls.stl',
+                              ascii_solid('') + ascii_solid('side'))
+        self.assertEqual(stage_file(src_file, self.dst_dir), 'linked')
+
+    def test_other_files_are_linked(self):
+        src_file = self.write('walls.obj', 'v 0 0 0\n')
+        self.assertEqual(stage_file(src_file, self.dst_dir), 'linked')
+        with open(src_file, 'a') as f:
+            f.write('v 1 0 0\n')
+        # a hard link sees the change
+        self.assertEqual(stage_file(src_file, self.dst_dir), 'unchanged')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The command jobs need no blender, run these with:
+#
+#   python -m unittest tests.jobs.test_cmd_job
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.cmd_job import (FoamCmdJob, FoamCmdSequence,
+                                      FoamCmdGroup, output_processes,
+                                      report_finished)
+
+class ProcessRunner(object):
+    """ Runs a python script the way FoamCmdRunner runs a command. """
+
+    def __init__(self, script, cmd_name='python', case_dir=None):
+        self.cmd_name = cmd_name
+        self.case_dir = case_dir
+        self.cmd_flags = []
+        self.script = script
+        self.run_status = False
+        self.process = None
+
+    def run(self):
+        with subprocess.Popen([sys.executable, '-c', self.script],
+                              stdout=subprocess.PIPE,
+                              universal_newlines=True) as p:
+            self.process = p
+            for info in p.stdout:
+                yield info
+        self.run_status = p.returncode == 0
+
+# prints a line, then runs for a minute without output
+SILENT = 'import time; print("started", flush=True); time.sleep(60)'
+ECHO = 'print("one"); print("two")'
+
+def wait_for(condition, timeout=10):
+    end = time.time() + timeout
+    while not condition():
+        if time.time() > end:
+            return False
+        time.sleep(0.01)
+    return True
+
+class Operator(object):
+    def __init__(self):
+        self.reports = []
+
+    def report(self, level, info):
+        self.reports.append((level.pop(), info))
+
+class TestFoamCmdJob(unittest.TestCase):
+    def test_run(self):
+        runner = ProcessRunner(ECHO)
+        job = FoamCmdJob(runner)
+        job.start()
+        self.assertTrue(wait_for(lambda: job.finished))
+        self.assertTrue(job.run_status)
+        self.assertEqual(job.sink.line_count, 2)
+
+    def test_cancel_silent_command(self):
+        runner = ProcessRunner(SILENT)
+        job = FoamCmdJob(runner)
+        job.start()
+        self.assertTrue(wait_for(lambda: job.sink.line_count == 1))
+        start = time.time()
+        job.cancel()
+        # the command writes nothing more, cancelling terminates it
+        self.assertTrue(wait_for(lambda: job.finished))
+        self.assertLess(time.time() - start, 10)
+        self.assertTrue(job.cancelled)
+        self.assertFalse(job.run_status)
+        self.assertIsNotNone(runner.process.poll())
+
+    def test_cancel_and_close_log(self):
+        # what an operator does when blender cancels it
+        case_dir = tempfile.mkdtemp()
+        try:
+            job = FoamCmdJob(ProcessRunner(SILENT, case_dir=case_dir))
+            job.start()
+            self.assertTrue(wait_for(lambda: job.sink.line_count == 1))
+            job.cancel()
+            self.assertTrue(job.wait(10))
+            operator = Operator()
+            report_finished(operator, job.sink, job.run_status,
+                            cancelled=True)
+            with open(job.sink.log_path) as f:
+                self.assertEqual(f.read(), 'started\n')
+            self.assertEqual(operator.reports[-1][0], 'INFO')
+            self.assertIn('1 lines written to', operator.reports[-1][1])
+        finally:
+            shutil.rmtree(case_dir)
+
+    def test_cancel_sequence(self):
+        runners = [ProcessRunner(SILENT), ProcessRunner(ECHO)]
+        job = FoamCmdJob(FoamCmdSequence('seq', None, runners))
+        job.start()
+        self.assertTrue(wait_for(lambda: runners[0].process is not None))
+        self.assertTrue(wait_for(lambda: job.sink.line_count == 2))
+        self.assertEqual(len(output_processes(job._output)), 1)
+        job.cancel()
+        self.assertTrue(wait_for(lambda: job.finished))
+        self.assertIsNotNone(runners[0].process.poll())
+        # the sequence stopped before the next command
+        self.assertIsNone(runners[1].process)
+
+class TestFoamCmdGroup(unittest.TestCase):
+    def test_run(self):
+        group = FoamCmdGroup('group', None,
+                             [ProcessRunner(ECHO), ProcessRunner(ECHO)])
+        lines = sorted(line.strip() for line in group.run())
+        self.assertEqual(lines, ['[0] one', '[0] two', '[1] one', '[1] two'])
+        self.assertTrue(group.run_status)
+        self.assertIsNotNone(group.speedup())
+
+    def test_cancel(self):
+        runners = [ProcessRunner(SILENT) for _ in range(3)]
+        group = FoamCmdGroup('group', None, runners, max_concurrent=2)
+        job = FoamCmdJob(group)
+        job.start()
+        self.assertTrue(wait_for(lambda: job.sink.line_count == 2))
+        job.cancel()
+        self.assertTrue(wait_for(lambda: job.finished))
+        self.assertTrue(job.cancelled)
+        self.assertFalse(group.run_status)
+        started = [runner for runner in runners if runner.process]
+        self.assertEqual(len(started), 2)
+        for runner in started:
+            self.assertIsNotNone(runner.process.poll())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The output sink needs no blender, run these with:
+#
+#   python -m unittest tests.jobs.test_log_sink
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.log_sink import OutputSink, log_name, STAGE_PREFIX
+
+class Runner(object):
+    def __init__(self, cmd_name, cmd_flags=None, case_dir=None):
+        self.cmd_name = cmd_name
+        self.cmd_flags = cmd_flags
+        self.case_dir = case_dir
+
+class TestLogName(unittest.TestCase):
+    def test_log_name(self):
+        self.assertEqual(log_name(Runner('blockMesh')), 'blockMesh')
+        self.assertEqual(log_name(Runner('mpirun',
+                                         ['-np', '4', 'icoFoam', '-parallel'])),
+                         'icoFoam')
+        self.assertEqual(log_name(Runner('mpirun', ['-np'])), 'mpirun')
+        self.assertEqual(log_name(object()), 'cmd')
+
+class TestOutputSink(unittest.TestCase):
+    def setUp(self):
+        self.case_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.case_dir)
+
+    def read_log(self, sink):
+        with open(sink.log_path) as f:
+            return f.read()
+
+    def test_log_file(self):
+        sink = OutputSink.for_runner(Runner('icoFoam',
+                                            case_dir=self.case_dir))
+        sink.write('Time = 1\n')
+        sink.write('Time = 2\n')
+        sink.close()
+        self.assertEqual(sink.log_path,
+                         os.path.join(self.case_dir, 'log.icoFoam'))
+        self.assertEqual(self.read_log(sink), 'Time = 1\nTime = 2\n')
+        self.assertEqual(sink.line_count, 2)
+        # a line written after close is kept in the tail only
+        sink.write('Time = 3\n')
+        sink.close()
+        self.assertEqual(sink.tail(1), ['Time = 3'])
+
+    def test_without_case_dir(self):
+        sink = OutputSink(None, 'blockMesh')
+        sink.write('Mesh OK.\n')
+        sink.close()
+        self.assertIsNone(sink.log_path)
+        self.assertEqual(sink.tail(), ['Mesh OK.'])
+
+    def test_tail(self):
+        sink = OutputSink(None, 'cmd', tail_lines=2)
+        for i in range(5):
+            sink.write('line %d\n' % i)
+        self.assertEqual(sink.tail(), ['line 3', 'line 4'])
+        self.assertEqual(sink.tail(1), ['line 4'])
+
+    def test_reports(self):
+        sink = OutputSink(None, 'cmd', progress_interval=3600)
+        sink.write('Time = 1\n')
+        sink.write(STAGE_PREFIX + '[1/2] decomposePar\n')
+        sink.write('--> FOAM Warning : something\n')
+        sink.write('--> FOAM FATAL ERROR: no mesh\n')
+        self.assertEqual(sink.take_reports(),
+                         [('INFO', STAGE_PREFIX + '[1/2] decomposePar'),
+                          ('WARNING', '--> FOAM Warning : something'),
+                          ('ERROR', '--> FOAM FATAL ERROR: no mesh')])
+        self.assertEqual(sink.take_reports(), [])
+
+    def test_progress(self):
+        sink = OutputSink(None, 'cmd', progress_interval=0)
+        sink.write('Time = 1\n')
+        self.assertEqual(sink.take_reports(), [('INFO', 'cmd [1]: Time = 1')])
+
+    def test_report_limit(self):
+        sink = OutputSink(None, 'cmd', max_reports=2)
+        for i in range(5):
+            sink.write('Warning %d\n' % i)
+        reports = sink.take_reports()
+        self.assertEqual(len(reports), 3)
+        self.assertEqual(reports[2],
+                         ('WARNING', 'cmd: 3 more messages in the output'))
+        self.assertEqual(sink.skipped, 3)
+
+    def test_close_while_writing(self):
+        sink = OutputSink(self.case_dir, 'icoFoam')
+        errors = []
+
+        def write():
+            try:
+                for i in range(20000):
+                    sink.write('line %d\n' % i)
+            except Exception as e:
+                errors.append(e)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        sink.close()
+        writer.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(sink.line_count, 20000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The residual monitor needs no blender, run these with:
+#
+#   python -m unittest tests.jobs.test_residuals
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.residuals import (ResidualMonitor, format_value,
+                                        sparkline)
+
+LOG = '''Time = 0.005
+
+Courant Number mean: 0 max: 0
+smoothSolver:  Solving for Ux, Initial residual = 1, Final residual = 8.90511e-06, No Iterations 19
+DICPCG:  Solving for p, Initial residual = 1, Final residual = 0.0492854, No Iterations 12
+DICPCG:  Solving for p, Initial residual = 0.523588, Final residual = 3.85385e-07, No Iterations 35
+ExecutionTime = 0.01 s  ClockTime = 0 s
+
+Time = 0.01
+
+Courant Number mean: 0.0976825 max: 0.585607
+smoothSolver:  Solving for Ux, Initial residual = 0.160686, Final residual = 6.83031e-06, No Iterations 19
+[1] smoothSolver:  Solving for Uy, Initial residual = 1, Final residual = 1, No Iterations 1
+DICPCG:  Solving for p, Initial residual = 0.428925, Final residual = 0.0103739, No Iterations 22
+ExecutionTime = 0.02 s  ClockTime = 1 s
+'''
+
+class TestResidualMonitor(unittest.TestCase):
+    def feed(self, monitor, text):
+        for line in text.splitlines(True):
+            monitor.feed(line)
+
+    def test_feed(self):
+        monitor = ResidualMonitor()
+        self.feed(monitor, LOG)
+        state = monitor.snapshot()
+        self.assertEqual(state['time'], 0.01)
+        self.assertEqual(state['steps'], 2)
+        self.assertEqual(state['courant'], (0.0976825, 0.585607))
+        self.assertEqual(state['execution_time'], 0.02)
+        self.assertEqual(state['clock_time'], 1.0)
+        self.assertEqual(state['times'], [0.005, 0.01])
+        # the first p solve of a step is the one kept
+        self.assertEqual(state['residuals']['p'],
+                         [(0.005, 1.0, 0.0492854, 12),
+                          (0.01, 0.428925, 0.0103739, 22)])
+        # prefixed lines of concurrent commands are skipped
+        self.assertNotIn('Uy', state['residuals'])
+
+    def test_history(self):
+        monitor = ResidualMonitor(history=1)
+        self.feed(monitor, LOG)
+        self.assertEqual(monitor.snapshot()['residuals']['Ux'],
+                         [(0.01, 0.160686, 6.83031e-06, 19)])
+
+    def test_unparsed_values(self):
+        monitor = ResidualMonitor()
+        self.feed(monitor, 'Time = 1\n'
+                  'Courant Number mean: nan? max: 0.5\n'
+                  'Solving for p, Initial residual = x, '
+                  'Final residual = 0.1, No Iterations 2\n')
+        state = monitor.snapshot()
+        self.assertEqual(state['courant'], (None, 0.5))
+        self.assertEqual(state['residuals']['p'], [(1.0, None, 0.1, 2)])
+
+    def test_reset(self):
+        monitor = ResidualMonitor()
+        self.feed(monitor, LOG)
+        monitor.reset()
+        state = monitor.snapshot()
+        self.assertIsNone(state['time'])
+        self.assertEqual(state['residuals'], {})
+
+class TestPanelText(unittest.TestCase):
+    def test_format_value(self):
+        self.assertEqual(format_value(0.5), '0.5')
+        self.assertEqual(format_value(0.000123, '%.3e'), '1.230e-04')
+        self.assertEqual(format_value(None, '%.3e'), '-')
+
+    def test_sparkline(self):
+        self.assertEqual(sparkline([]), '')
+        self.assertEqual(sparkline([None, 0]), '')
+        self.assertEqual(sparkline([1, 0.1, 0.01]), '@= ')
+        self.assertEqual(len(sparkline([1.0] * 40, width=24)), 24)
+
+if __name__ == '__main__':
+    unittest.main()
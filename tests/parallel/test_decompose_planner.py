@@ -0,0 +1,146 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The decomposition planner needs no blender, run these with:
+#
+#   python -m unittest tests.parallel.test_decompose_planner
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import shutil
+import tempfile
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.decompose_planner import (plan_subdomains,
+                                                split_subdomains,
+                                                plan_decomposition,
+                                                mesh_cell_count, mesh_extent,
+                                                dict_subdomains,
+                                                processor_dirs)
+
+def _write(case_dir, path, content):
+    file_path = os.path.join(case_dir, path)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w') as f:
+        f.write(content)
+
+def _header(cls, name, note=''):
+    return ('FoamFile\n{\n    format ascii;\n    class %s;\n'
+            '    note "%s";\n    object %s;\n}\n' % (cls, note, name))
+
+class TestPlan(unittest.TestCase):
+    def test_plan_subdomains(self):
+        self.assertEqual(plan_subdomains(100000, 20000, 8), 5)
+        self.assertEqual(plan_subdomains(100001, 20000, 8), 6)
+        self.assertEqual(plan_subdomains(10000000, 20000, 8), 8)
+        self.assertEqual(plan_subdomains(100, 20000, 8), 1)
+        # without a mesh every core gets a subdomain
+        self.assertEqual(plan_subdomains(None, 20000, 4), 4)
+        self.assertEqual(plan_subdomains(None, 20000, 0), 1)
+
+    def test_split_cube(self):
+        self.assertEqual(split_subdomains(8, [1.0, 1.0, 1.0]), (2, 2, 2))
+        self.assertEqual(split_subdomains(1, [1.0, 1.0, 1.0]), (1, 1, 1))
+
+    def test_split_long_domain(self):
+        self.assertEqual(split_subdomains(4, [10.0, 1.0, 1.0]), (4, 1, 1))
+
+    def test_split_flat_domain(self):
+        # a 2D case is never split across its single cell of depth
+        self.assertEqual(split_subdomains(4, [1.0, 1.0, 0.1 * 1e-6]),
+                         (2, 2, 1))
+        self.assertEqual(split_subdomains(8, [2.0, 1.0, 0.0]), (4, 2, 1))
+
+    def test_split_prime(self):
+        self.assertEqual(split_subdomains(7, [1.0, 1.0, 0.0]), (7, 1, 1))
+
+class TestCaseMesh(unittest.TestCase):
+    def setUp(self):
+        self.case_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.case_dir)
+
+    def write_mesh(self, note=''):
+        _write(self.case_dir, 'constant/polyMesh/owner',
+               _header('labelList', 'owner', note) +
+               '4\n(\n0\n0\n1\n2\n)\n')
+        _write(self.case_dir, 'constant/polyMesh/points',
+               _header('vectorField', 'points') +
+               '2\n(\n(0 0 0)\n(4 2 0.1)\n)\n')
+
+    def test_no_mesh(self):
+        self.assertIsNone(mesh_cell_count(self.case_dir))
+        self.assertIsNone(mesh_extent(self.case_dir))
+
+    def test_cells_from_owner_note(self):
+        self.write_mesh('nPoints:2  nCells:40  nFaces:4  nInternalFaces:0')
+        self.assertEqual(mesh_cell_count(self.case_dir), 40)
+
+    def test_cells_from_owner_list(self):
+        self.write_mesh()
+        self.assertEqual(mesh_cell_count(self.case_dir), 3)
+
+    def test_cells_from_check_mesh_log(self):
+        _write(self.case_dir, 'log.checkMesh',
+               'Mesh stats\n    cells:            400\n'
+               'Mesh stats\n    cells:            1600\n')
+        self.assertEqual(mesh_cell_count(self.case_dir), 1600)
+
+    def test_plan_decomposition(self):
+        self.write_mesh('nCells:80000')
+        self.assertEqual(mesh_extent(self.case_dir),
+                         ([0.0, 0.0, 0.0], [4.0, 2.0, 0.1]))
+        self.assertEqual(plan_decomposition(self.case_dir, 20000, 8),
+                         {'cells': 80000, 'subdomains': 4, 'n': (4, 1, 1)})
+
+    def test_plan_decomposition_without_mesh(self):
+        plan = plan_decomposition(self.case_dir, 20000, 4,
+                                  extent=([0, 0, 0], [1, 1, 0]))
+        self.assertEqual(plan, {'cells': None, 'subdomains': 4,
+                                'n': (2, 2, 1)})
+
+    def test_decomposed_case(self):
+        self.assertIsNone(dict_subdomains(self.case_dir))
+        _write(self.case_dir, 'system/decomposeParDict',
+               'numberOfSubdomains 4;\nmethod simple;\n')
+        self.assertEqual(dict_subdomains(self.case_dir), 4)
+        for name in ('processor0', 'processor1', 'processors'):
+            os.makedirs(os.path.join(self.case_dir, name))
+        self.assertEqual(sorted(os.path.basename(d) for d in
+                                processor_dirs(self.case_dir)),
+                         ['processor0', 'processor1'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The launch profiles need no blender, run these with:
+#
+#   python -m unittest tests.parallel.test_launch_profiles
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import shutil
+import tempfile
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.launch_profiles import (parse_hostfile_text,
+                                              parse_hostfile, total_slots,
+                                              max_total_slots,
+                                              default_profile, launch_problem,
+                                              launch_flags, load_profiles,
+                                              save_profile, delete_profile)
+
+HOSTFILE = '''# cluster
+node1 slots=4 max_slots=8
+node2 slots=2   # comment
+node1 slots=2 max_slots=2
+node3
+'''
+
+class TestHostfile(unittest.TestCase):
+    def test_open_mpi(self):
+        hosts = parse_hostfile_text(HOSTFILE)
+        self.assertEqual(hosts,
+                         [{'host': 'node1', 'slots': 6, 'max_slots': 10},
+                          {'host': 'node2', 'slots': 2, 'max_slots': None},
+                          {'host': 'node3', 'slots': 1, 'max_slots': None}])
+        self.assertEqual(total_slots(hosts), 9)
+        self.assertIsNone(max_total_slots(hosts))
+        self.assertEqual(max_total_slots(hosts[:1]), 10)
+
+    def test_mpich(self):
+        self.assertEqual(parse_hostfile_text('node1:4\nnode2\n'),
+                         [{'host': 'node1', 'slots': 4, 'max_slots': None},
+                          {'host': 'node2', 'slots': 1, 'max_slots': None}])
+
+class ProfileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.case_dir = tempfile.mkdtemp()
+        self.hostfile = os.path.join(self.case_dir, 'machines')
+        with open(self.hostfile, 'w') as f:
+            f.write('node1 slots=4 max_slots=4\nnode2 slots=4 max_slots=4\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.case_dir)
+
+    def profile(self, **values):
+        return dict(default_profile(), **values)
+
+class TestLaunch(ProfileTestCase):
+    def test_parse_hostfile(self):
+        self.assertEqual(total_slots(parse_hostfile(self.hostfile)), 8)
+        with open(self.hostfile, 'a') as f:
+            f.write('node3 slots=8\n')
+        self.assertEqual(total_slots(parse_hostfile(self.hostfile)), 16)
+
+    def test_launch_problem(self):
+        profile = self.profile(hostfile=self.hostfile)
+        self.assertIsNone(launch_problem(profile, 8))
+        self.assertIn('8 slots (8 max slots)', launch_problem(profile, 9))
+        profile['oversubscribe'] = True
+        self.assertIsNone(launch_problem(profile, 9))
+        self.assertIsNone(launch_problem(self.profile(), 64))
+
+    def test_launch_flags(self):
+        profile = self.profile(hostfile=self.hostfile, bind_to='core',
+                               map_by='socket', extra_flags='-x FOO')
+        self.assertEqual(launch_flags(profile, 8, ['icoFoam', '-parallel'],
+                                      self.case_dir),
+                         ['--hostfile', self.hostfile, '--map-by', 'socket',
+                          '--bind-to', 'core', '-x', 'FOO', '-np', '8',
+                          'icoFoam', '-parallel'])
+
+    def test_local_stand_in(self):
+        profile = self.profile(hostfile=self.hostfile, bind_to='core',
+                               local=True)
+        flags = launch_flags(profile, 4, ['icoFoam'], self.case_dir)
+        local_hostfile = os.path.join(self.case_dir, '.reynolds',
+                                      'hostfile.local')
+        self.assertEqual(flags, ['--hostfile', local_hostfile,
+                                 '--oversubscribe', '-np', '4', 'icoFoam'])
+        with open(local_hostfile) as f:
+            self.assertEqual(f.read(), 'localhost slots=8\n')
+
+class TestSavedProfiles(ProfileTestCase):
+    def test_save_load_delete(self):
+        self.assertEqual(load_profiles(self.case_dir), {})
+        save_profile(self.case_dir, 'cluster', {'hostfile': self.hostfile})
+        save_profile(self.case_dir, 'laptop', {'local': True})
+        profiles = load_profiles(self.case_dir)
+        self.assertEqual(sorted(profiles), ['cluster', 'laptop'])
+        self.assertEqual(profiles['cluster'],
+                         self.profile(hostfile=self.hostfile))
+        delete_profile(self.case_dir, 'cluster')
+        self.assertEqual(sorted(load_profiles(self.case_dir)), ['laptop'])
+
+    def test_loaded_profiles_are_copies(self):
+        save_profile(self.case_dir, 'laptop', {'local': True})
+        load_profiles(self.case_dir)['laptop']['local'] = False
+        self.assertTrue(load_profiles(self.case_dir)['laptop']['local'])
+
+    def test_broken_file(self):
+        os.makedirs(os.path.join(self.case_dir, '.reynolds'))
+        with open(os.path.join(self.case_dir, '.reynolds',
+                               'launch_profiles.json'), 'w') as f:
+            f.write('{')
+        self.assertEqual(load_profiles(self.case_dir), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The reconstruct time selection needs no blender, run these with:
+#
+#   python -m unittest tests.parallel.test_reconstruct
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import shutil
+import tempfile
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.reconstruct import time_dirs, select_times, split_times
+
+class TestSelectTimes(unittest.TestCase):
+    def setUp(self):
+        self.case_dir = tempfile.mkdtemp()
+        for name in ('0', '0.5', '1', '1.5', '2', '10', 'constant'):
+            os.makedirs(os.path.join(self.case_dir, 'processor0', name))
+        # a file is no time dir
+        open(os.path.join(self.case_dir, 'processor0', '3'), 'w').close()
+        os.makedirs(os.path.join(self.case_dir, '1'))
+
+    def tearDown(self):
+        shutil.rmtree(self.case_dir)
+
+    def test_time_dirs(self):
+        self.assertEqual(time_dirs(self.case_dir),
+                         ['0', '0.5', '1', '1.5', '2', '10'])
+        self.assertEqual(time_dirs(self.case_dir, 'processor1'), [])
+
+    def test_modes(self):
+        self.assertEqual(select_times(self.case_dir, 'Latest'), ['10'])
+        self.assertEqual(select_times(self.case_dir, 'Range', 0.5, 1.5),
+                         ['0.5', '1', '1.5'])
+        self.assertEqual(len(select_times(self.case_dir, 'All')), 6)
+
+    def test_new_only(self):
+        self.assertEqual(select_times(self.case_dir, 'Range', 0.5, 1.5,
+                                      new_only=True),
+                         ['0.5', '1.5'])
+
+class TestSplitTimes(unittest.TestCase):
+    def test_split(self):
+        times = ['1', '2', '3', '4', '5']
+        self.assertEqual(split_times(times, 2), [['1', '2', '3'], ['4', '5']])
+        self.assertEqual(split_times(times, 1), [times])
+        self.assertEqual(split_times(times, 9),
+                         [['1'], ['2'], ['3'], ['4'], ['5']])
+        self.assertEqual(split_times(times, 0), [times])
+        self.assertEqual(split_times([], 4), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The case writer needs no blender, run these with:
+#
+#   python -m unittest tests.pipeline.test_case_writer
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import shutil
+import tempfile
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.case_writer import (file_digest, write_if_changed,
+                                          write_case_dict)
+
+class Operator(object):
+    def __init__(self):
+        self.reports = []
+
+    def report(self, level, info):
+        self.reports.append(info)
+
+class TestCaseWriter(unittest.TestCase):
+    def setUp(self):
+        self.case_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.case_dir, 'system', 'controlDict')
+
+    def tearDown(self):
+        shutil.rmtree(self.case_dir)
+
+    def test_write_if_changed(self):
+        self.assertIsNone(file_digest(self.file_path))
+        self.assertTrue(write_if_changed(self.file_path, 'endTime 0.5;\n'))
+        mtime = os.stat(self.file_path).st_mtime_ns
+        self.assertFalse(write_if_changed(self.file_path, 'endTime 0.5;\n'))
+        self.assertEqual(os.stat(self.file_path).st_mtime_ns, mtime)
+        self.assertTrue(write_if_changed(self.file_path, 'endTime 1;\n'))
+        with open(self.file_path) as f:
+            self.assertEqual(f.read(), 'endTime 1;\n')
+        # no temporary files are left behind
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)),
+                         ['controlDict'])
+
+    def test_edited_file_is_written_again(self):
+        write_if_changed(self.file_path, 'endTime 0.5;\n')
+        with open(self.file_path, 'w') as f:
+            f.write('endTime 2;\n')
+        self.assertTrue(write_if_changed(self.file_path, 'endTime 0.5;\n'))
+
+    def test_write_case_dict(self):
+        operator = Operator()
+        self.assertTrue(write_case_dict(operator, self.case_dir, 'system',
+                                        'controlDict', 'endTime 0.5;\n'))
+        self.assertFalse(write_case_dict(operator, self.case_dir, 'system',
+                                         'controlDict', 'endTime 0.5;\n'))
+        self.assertEqual(operator.reports,
+                         ['Updated ' + os.path.join('system',
+                                                    'controlDict')])
+
+if __name__ == '__main__':
+    unittest.main()
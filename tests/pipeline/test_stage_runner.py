@@ -0,0 +1,173 @@
+#------------------------------------------------------------------------------
+# Reynolds-Blender | The Blender add-on for Reynolds, an OpenFoam toolbox.
+#------------------------------------------------------------------------------
+# Copyright|
+#------------------------------------------------------------------------------
+#     Deepak Surti       (dmsurti@gmail.com)
+#     Prabhu R           (IIT Bombay, prabhu@aero.iitb.ac.in)
+#     Shivasubramanian G (IIT Bombay, sgopalak@iitb.ac.in)
+#------------------------------------------------------------------------------
+# License
+#
+#     This file is part of reynolds-blender.
+#
+#     reynolds-blender is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     reynolds-blender is distributed in the hope that it will be useful, but
+#     WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+#     Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with reynolds-blender.  If not, see <http://www.gnu.org/licenses/>.
+#------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# The stage runner needs no blender, run these with:
+#
+#   python -m unittest tests.pipeline.test_stage_runner
+# ----------------------------------------------------------------------------
+
+# --------------
+# python imports
+# --------------
+import os
+import shutil
+import tempfile
+import unittest
+
+# ------------------------
+# reynolds_blender imports
+# ------------------------
+from reynolds_blender.stage_runner import run_stages, BACKGROUND_MESH_DIR
+
+class Operator(object):
+    def __init__(self):
+        self.reports = []
+
+    def report(self, level, info):
+        self.reports.append(info)
+
+class Context(object):
+    def __init__(self, **scene):
+        self.scene = type('Scene', (object,), scene)()
+
+def _write(case_dir, path, content):
+    file_path = os.path.join(case_dir, path)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w') as f:
+        f.write(content)
+
+def _read(case_dir, path):
+    with open(os.path.join(case_dir, path)) as f:
+        return f.read()
+
+OWNER = 'constant/polyMesh/owner'
+
+class TestMeshStages(unittest.TestCase):
+    """ blockMesh writes the background mesh, snappyHexMesh -overwrite
+    replaces it with the refined one. """
+
+    def setUp(self):
+        self.case_dir = tempfile.mkdtemp()
+        self.ran = []
+        # the owner file snappyHexMesh started from on each run
+        self.snapped_from = []
+        _write(self.case_dir, 'system/blockMeshDict', 'cells 10')
+        _write(self.case_dir, 'system/snappyHexMeshDict', 'level 1')
+        self.geometries = True
+        self.stages = [
+            {'name': 'blockMesh',
+             'generate': lambda self, context: None,
+             'inputs': lambda scene, case_dir: ['system/blockMeshDict'],
+             'generates': None,
+             'outputs': [OWNER, os.path.join(BACKGROUND_MESH_DIR, 'owner')],
+             'enabled': lambda scene: True,
+             'mesh': 'save',
+             'flag': None},
+            {'name': 'snappyHexMesh',
+             'generate': lambda self, context: None,
+             'inputs': lambda scene, case_dir: ['system/snappyHexMeshDict'],
+             'generates': None,
+             'outputs': [OWNER],
+             'enabled': lambda scene: self.geometries,
+             'mesh': 'restore',
+             'flag': None},
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.case_dir)
+
+    def run_stage(self, operator, context, stage):
+        name = stage['name']
+        self.ran.append(name)
+        if name == 'blockMesh':
+            _write(self.case_dir, OWNER,
+                   'block ' + _read(self.case_dir, 'system/blockMeshDict'))
+        else:
+            self.snapped_from.append(_read(self.case_dir, OWNER))
+            _write(self.case_dir, OWNER, 'snapped')
+        return True
+
+    def run_pipeline(self):
+        self.ran = []
+        return run_stages(Operator(), Context(), self.stages, self.case_dir,
+                          self.run_stage)
+
+    def test_first_run(self):
+        self.assertTrue(self.run_pipeline())
+        self.assertEqual(self.ran, ['blockMesh', 'snappyHexMesh'])
+        self.assertEqual(self.snapped_from, ['block cells 10'])
+        self.assertEqual(_read(self.case_dir, OWNER), 'snapped')
+
+    def test_unchanged_rerun(self):
+        self.run_pipeline()
+        self.assertTrue(self.run_pipeline())
+        self.assertEqual(self.ran, [])
+
+    def test_snappy_settings_changed(self):
+        self.run_pipeline()
+        _write(self.case_dir, 'system/snappyHexMeshDict', 'level 2')
+        self.assertTrue(self.run_pipeline())
+        # blockMesh is up to date, snappyHexMesh starts from its mesh
+        # again rather than from the mesh it refined before
+        self.assertEqual(self.ran, ['snappyHexMesh'])
+        self.assertEqual(self.snapped_from,
+                         ['block cells 10', 'block cells 10'])
+        self.assertEqual(_read(self.case_dir, OWNER), 'snapped')
+
+    def test_block_settings_changed(self):
+        self.run_pipeline()
+        _write(self.case_dir, 'system/blockMeshDict', 'cells 20')
+        self.run_pipeline()
+        self.assertEqual(self.ran, ['blockMesh', 'snappyHexMesh'])
+        self.assertEqual(self.snapped_from[-1], 'block cells 20')
+
+    def test_snappy_disabled(self):
+        self.run_pipeline()
+        self.geometries = False
+        self.assertTrue(self.run_pipeline())
+        # the refined mesh is replaced by the background mesh
+        self.assertEqual(self.ran, [])
+        self.assertEqual(_read(self.case_dir, OWNER), 'block cells 10')
+        self.geometries = True
+        self.run_pipeline()
+        self.assertEqual(self.ran, ['snappyHexMesh'])
+        self.assertEqual(self.snapped_from[-1], 'block cells 10')
+
+    def test_failed_stage_reruns(self):
+        run_stage = self.run_stage
+        self.run_stage = lambda operator, context, stage: (
+            run_stage(operator, context, stage) and
+            stage['name'] != 'snappyHexMesh')
+        self.assertFalse(self.run_pipeline())
+        self.run_stage = run_stage
+        self.assertTrue(self.run_pipeline())
+        self.assertEqual(self.ran, ['snappyHexMesh'])
+        self.assertEqual(self.snapped_from[-1], 'block cells 10')
+
+if __name__ == '__main__':
+    unittest.main()